@@ -0,0 +1,1201 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import database
+from config import (BCRYPT_ROUNDS, COLORS, FPS, STARTUP_BUDGET_MS, BENCHMARK_REGRESSION_THRESHOLD, WINDOW_HEIGHT)
+
+
+def _per_call_us(func: Callable, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+_results: Dict[str, Dict[str, Dict[str, dict]]] = {}
+_current = {'benchmark': None, 'section': None}
+
+
+def _section(title: str):
+    print(title)
+    _current['section'] = title
+
+
+def _metric(name: str, value: float, unit: str, fmt: str = '10.1f', better: Optional[str] = 'lower'):
+    print(f"  {name:<40} {value:>{fmt}} {unit}".rstrip())
+    section = _results.setdefault(_current['benchmark'], {}).setdefault(_current['section'], {})
+    section[name] = {'value': value, 'unit': unit, 'better': better}
+
+
+def _report(title: str, results: Dict[str, float]):
+    _section(title)
+    for name, value in results.items():
+        _metric(name, value, 'µs/call')
+
+
+@contextmanager
+def _isolated_paths(directory: str):
+    import encryption
+    import session
+    from event_log import event_log
+    
+    token_path, key_path, key = session.SESSION_TOKEN_PATH, encryption.SESSION_KEY_PATH, encryption._session_key
+    events_directory, data_dir = event_log.directory, os.environ.get('HANGMAN_DATA_DIR')
+    session.SESSION_TOKEN_PATH = os.path.join(directory, 'session.token')
+    encryption.SESSION_KEY_PATH = os.path.join(directory, 'session.key')
+    encryption._session_key = None
+    event_log.set_directory(os.path.join(directory, 'events'))
+    os.environ['HANGMAN_DATA_DIR'] = directory
+    try:
+        yield
+    finally:
+        session.SESSION_TOKEN_PATH, encryption.SESSION_KEY_PATH, encryption._session_key = token_path, key_path, key
+        event_log.set_directory(events_directory)
+        if data_dir is None:
+            os.environ.pop('HANGMAN_DATA_DIR', None)
+        else:
+            os.environ['HANGMAN_DATA_DIR'] = data_dir
+
+
+def bench_database(iterations: int = 2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        database.set_database_path(path)
+        database.create_user('bench', 'bench')
+        
+        def connect_per_call_read(_):
+            with sqlite3.connect(path) as conn:
+                conn.execute("SELECT games_played, games_won FROM users WHERE username = ?", ('bench',)).fetchone()
+        
+        def connect_per_call_write(_):
+            with sqlite3.connect(path) as conn:
+                conn.execute(
+                    "UPDATE users SET games_played = games_played + 1, games_won = games_won + ? WHERE username = ?",
+                    (0, 'bench')
+                )
+                conn.commit()
+        
+        def connect_per_call_save(_):
+            connect_per_call_write(_)
+            with sqlite3.connect(path) as conn:
+                conn.execute(
+                    "INSERT INTO game_history (player1, player2, word, winner, game_mode) VALUES (?, ?, ?, ?, ?)",
+                    ('bench', None, 'ATOM', None, 'classic')
+                )
+                conn.commit()
+            connect_per_call_write(_)
+        
+        def pooled_save(_):
+            database.save_game_result('bench', None, 'ATOM', None, 'classic')
+        
+        before = {
+            'get_user_stats': _per_call_us(connect_per_call_read, iterations),
+            'save_result (3 statements)': _per_call_us(connect_per_call_save, iterations // 4),
+        }
+        after = {
+            'get_user_stats': _per_call_us(lambda _: database.get_user_stats('bench'), iterations),
+            'save_result (3 statements)': _per_call_us(pooled_save, iterations // 4),
+        }
+        database.close_connections()
+    
+    _report("database: connect-per-call", before)
+    _report("database: pooled connection", after)
+
+
+def bench_words(iterations: int = 2000, dictionary_size: int = 200_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        database.set_database_path(path)
+        with database.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO words (word, category, hint) VALUES (?, ?, ?)",
+                ((f"SŁOWO{i}", 'Benchmark', None) for i in range(dictionary_size))
+            )
+        
+        def fetch_all_and_choose(_):
+            with sqlite3.connect(path) as conn:
+                rows = conn.execute("SELECT word, hint FROM words WHERE category = ?", ('Benchmark',)).fetchall()
+                random.choice(rows)
+        
+        database.preload_words('Benchmark').result()
+        results = {
+            'fetchall + random.choice': _per_call_us(fetch_all_and_choose, max(1, iterations // 100)),
+            'word store': _per_call_us(lambda _: database.get_random_word('Benchmark', 'bench'), iterations),
+        }
+        database.close_connections()
+    
+    _report(f"get_random_word ({dictionary_size} słów)", results)
+
+
+def bench_import(iterations: int = 2000, dictionary_size: int = 2_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_database_path(os.path.join(tmp, 'bench.db'))
+        source = os.path.join(tmp, 'words.txt')
+        with open(source, 'w', encoding='utf-8') as file:
+            for i in range(dictionary_size):
+                file.write(f"słowo{i % (dictionary_size * 9 // 10)}\n")
+        
+        start = time.perf_counter()
+        imported = database.import_word_file(source, category='Benchmark')
+        elapsed = time.perf_counter() - start
+        database.close_connections()
+    
+    _section(f"import_word_file ({dictionary_size} wierszy)")
+    _metric('zaimportowane słowa', imported, '', '10', None)
+    _metric('czas', elapsed, 's', '10.2f')
+    _metric('przepustowość', dictionary_size / elapsed, 'wierszy/s', '10,.0f', 'higher')
+
+
+def bench_render(iterations: int = 2000):
+    from main import HangmanGameApp
+    from storage import SQLiteStorage
+    from components import text_cache
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, 'bench.db'))
+        app = HangmanGameApp(storage=storage)
+        app.current_user = 'bench'
+        app.set_screen("game", players=1)
+        game_screen = app.screens["game"]
+        for letter in "AEIO":
+            game_screen._guess_letter(letter)
+        
+        def frame(_):
+            app.screen.fill(COLORS['BACKGROUND'])
+            game_screen.draw(app.screen)
+        
+        maxsize = text_cache.maxsize
+        text_cache.maxsize = 0
+        uncached = _per_call_us(frame, iterations)
+        text_cache.maxsize = maxsize
+        text_cache.clear()
+        cached = _per_call_us(frame, iterations)
+        hit_rate = text_cache.hits / max(1, text_cache.hits + text_cache.misses) * 100
+        storage.close()
+    
+    _report("GameScreen.draw", {'bez cache tekstu': uncached, 'z cache tekstu': cached})
+    _metric('trafienia cache', hit_rate, '%', better='higher')
+
+
+def _frame_times_us(func: Callable, iterations: int) -> Dict[str, float]:
+    times = []
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        func(i)
+        times.append((time.perf_counter_ns() - start) / 1000)
+    times.sort()
+    return {'średnio': sum(times) / len(times), 'p50': times[len(times) // 2],
+            'p99': times[min(len(times) - 1, int(len(times) * 0.99))]}
+
+
+def bench_screens(iterations: int = 2000):
+    from main import HangmanGameApp
+    from storage import MemoryStorage
+    
+    storage = MemoryStorage((word, 'Benchmark', None) for word in _random_words(10_000))
+    app = HangmanGameApp(dirty_rendering=False, storage=storage)
+    setups = {
+        'LoginScreen': lambda: app.set_screen("login"),
+        'MenuScreen': lambda: app.set_screen("menu"),
+        'GameScreen': lambda: app.set_screen("game", players=1),
+    }
+    
+    for name, setup in setups.items():
+        app.current_user = None if name == 'LoginScreen' else 'bench'
+        setup()
+        screen = app.screens[app.current_screen]
+        if name == 'GameScreen':
+            for letter in "AEIO":
+                screen._guess_letter(letter)
+        
+        def frame(_):
+            app.screen.fill(COLORS['BACKGROUND'])
+            screen.draw(app.screen)
+        
+        frame(0)
+        times = _frame_times_us(frame, iterations)
+        _report(f"{name}.draw (pełna klatka)", times)
+        _metric('budżet klatki', 1_000_000 / FPS, 'µs/call', '10.1f', None)
+
+
+def bench_dirty(iterations: int = 2000):
+    from main import HangmanGameApp
+    from storage import SQLiteStorage
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, 'bench.db'))
+        app = HangmanGameApp(storage=storage)
+        app.current_user = 'bench'
+        app.set_screen("game", players=1)
+        game_screen = app.screens["game"]
+        inside, outside = game_screen.menu_btn.rect.center, (0, app.screen.get_height() - 1)
+        
+        def idle_frame(_):
+            app.render_frame()
+        
+        def hover_frame(i):
+            game_screen.menu_btn.update(inside if i % 2 else outside)
+            app.render_frame()
+        
+        results = {}
+        for dirty_rendering in (False, True):
+            app.dirty_rendering = dirty_rendering
+            label = 'dirty rects' if dirty_rendering else 'pełne przerysowanie'
+            results[f'{label}, bez zmian'] = _per_call_us(idle_frame, iterations)
+            results[f'{label}, hover przycisku'] = _per_call_us(hover_frame, iterations)
+        storage.close()
+    
+    _report("HangmanGameApp.render_frame (GameScreen)", results)
+
+
+def bench_scaling(iterations: int = 2000):
+    import pygame
+    from main import HangmanGameApp
+    from components import display_format
+    from config import FONTS
+    from storage import MemoryStorage
+    
+    storage = MemoryStorage((word, 'Benchmark', None) for word in _random_words(10_000))
+    displays = {'1000x700 (natywnie)': None, '1920x1080': (1920, 1080), '3840x2160': (3840, 2160)}
+    
+    for label, size in displays.items():
+        app = HangmanGameApp(dirty_rendering=False, storage=storage, display_size=size)
+        app.current_user = 'bench'
+        app.set_screen("game", players=1)
+        game_screen = app.screens["game"]
+        for letter in "AEIO":
+            game_screen._guess_letter(letter)
+        inside, outside = game_screen.menu_btn.rect.center, (0, WINDOW_HEIGHT - 1)
+        
+        def full_frame(_):
+            game_screen.dirty.invalidate()
+            app.render_frame()
+        
+        def hover_frame(i):
+            game_screen.menu_btn.update(inside if i % 2 else outside)
+            app.render_frame()
+        
+        frames = max(1, iterations // 10)
+        results = {}
+        for smooth_scaling in ((True, False) if size else (True,)):
+            app.smooth_scaling = smooth_scaling
+            suffix = '' if not size else ', smoothscale' if smooth_scaling else ', scale'
+            app.dirty_rendering = False
+            results[f'pełna klatka{suffix}'] = _per_call_us(full_frame, frames)
+            app.dirty_rendering = True
+            results[f'hover przycisku{suffix}'] = _per_call_us(hover_frame, frames)
+        _report(f"HangmanGameApp.render_frame, ekran {label}", results)
+        _metric('budżet klatki', 1_000_000 / FPS, 'µs/call', '10.1f', None)
+    
+    canvas = app.screen
+    raw = FONTS['LARGE'].render("Gra w Wisielca", True, COLORS['TEXT'])
+    converted = display_format(raw, alpha=True)
+    _report("Surface.blit tekstu", {
+        'bez convert_alpha()': _per_call_us(lambda _: canvas.blit(raw, (100, 100)), iterations * 10),
+        'po convert_alpha()': _per_call_us(lambda _: canvas.blit(converted, (100, 100)), iterations * 10),
+    })
+
+
+def bench_dispatch(iterations: int = 2000, widgets: int = 500):
+    import pygame
+    from components import Button, EventDispatcher
+    
+    pygame.init()
+    width, height = 800, 600
+    columns = 25
+    rows = -(-widgets // columns)
+    cell_w, cell_h = width // columns, height // rows
+    buttons = [Button(i % columns * cell_w, i // columns * cell_h, cell_w - 4, cell_h - 4, "", lambda: None)
+               for i in range(widgets)]
+    rng = random.Random(0)
+    events = []
+    for i in range(iterations):
+        pos = (rng.randrange(width), rng.randrange(height))
+        if i % 4:
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=pos))
+        else:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+    
+    def broadcast(i):
+        event = events[i]
+        for button in buttons:
+            button.handle_event(event)
+        mouse_pos = event.pos
+        for button in buttons:
+            button.update(mouse_pos)
+    
+    dispatcher = EventDispatcher()
+    dispatcher.add(*buttons)
+    
+    def indexed(i):
+        dispatcher.dispatch(events[i])
+    
+    results = {}
+    for label, func in (('rozgłaszanie do wszystkich', broadcast), ('EventDispatcher', indexed)):
+        for button in buttons:
+            button.set_hovered(False)
+        results[label] = _per_call_us(func, iterations)
+        for button in buttons:
+            button.dirty_rects.clear()
+    
+    _report(f"Obsługa zdarzenia myszy ({widgets} widżetów)", results)
+
+
+def bench_idle(iterations: int = 2000, duration: float = 3.0):
+    from main import HangmanGameApp
+    from storage import SQLiteStorage
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, 'bench.db'))
+        app = HangmanGameApp(storage=storage)
+        app.current_user = 'bench'
+        
+        _section(f"HangmanGameApp.step na ekranie menu ({duration:.0f} s)")
+        for adaptive in (False, True):
+            app.adaptive_frame_rate = adaptive
+            app.set_screen("menu")
+            app.stats.reset()
+            while time.perf_counter() - app.stats.started < duration:
+                app.step()
+            label = 'adaptacyjna pętla' if adaptive else f'stałe {FPS} FPS'
+            _metric(f'{label}, CPU', app.stats.cpu_usage(), '%')
+            _metric(f'{label}, iteracje', app.stats.iterations, '', '10', None)
+            _metric(f'{label}, klatki', app.stats.frames, '', '10', None)
+        storage.close()
+
+
+def bench_auth(iterations: int = 2000):
+    from main import HangmanGameApp
+    from storage import SQLiteStorage
+    from encryption import hash_password, verify_password
+    
+    rounds = max(1, iterations // 500)
+    hashed = hash_password('bench')
+    _report(f"bcrypt (koszt {BCRYPT_ROUNDS})", {
+        'hash_password': _per_call_us(lambda _: hash_password('bench'), rounds),
+        'verify_password': _per_call_us(lambda _: verify_password('bench', hashed), rounds),
+    })
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, 'bench.db'))
+        storage.create_user('bench', 'bench')
+        app = HangmanGameApp(dirty_rendering=False, storage=storage)
+        login = app.screens["login"]
+        login.username_field.text = 'bench'
+        login.password_field.text = 'bench'
+        
+        frame_times = []
+        start = time.perf_counter()
+        login._handle_action()
+        while app.current_screen == "login":
+            frame_start = time.perf_counter()
+            login.update(0)
+            app.render_frame()
+            frame_times.append((time.perf_counter() - frame_start) * 1000)
+        elapsed = (time.perf_counter() - start) * 1000
+        storage.close()
+    
+    frame_times.sort()
+    _section("LoginScreen podczas logowania w tle")
+    _metric('czas logowania', elapsed, 'ms')
+    _metric('klatki w trakcie', len(frame_times), '', '10', 'higher')
+    _metric('mediana klatki', frame_times[len(frame_times) // 2], 'ms', '10.2f')
+    _metric('najdłuższa klatka', frame_times[-1], 'ms', '10.2f')
+
+
+def bench_sessions(iterations: int = 2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_database_path(os.path.join(tmp, 'bench.db'))
+        database.create_user('bench', 'bench')
+        token = database.create_session('bench')
+        
+        password_logins = max(1, iterations // 500)
+        start = time.perf_counter()
+        for _ in range(password_logins):
+            database.authenticate_user('bench', 'bench')
+        password_rate = password_logins / (time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        for _ in range(iterations):
+            database.authenticate_session(token)
+        token_rate = iterations / (time.perf_counter() - start)
+        database.close_connections()
+    
+    _section("logowania na sekundę")
+    _metric('authenticate_user (bcrypt)', password_rate, '/s', '10,.1f', 'higher')
+    _metric('authenticate_session (HMAC)', token_rate, '/s', '10,.1f', 'higher')
+
+
+def bench_simulator(iterations: int = 2000, games: int = 200_000):
+    import simulator
+    
+    words = [(f"SŁOWO{i}", f"Kategoria{i % 10}") for i in range(10_000)]
+    _section(f"simulator.simulate ({games} gier)")
+    for processes in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        simulator.simulate(words, games, 'frequency', processes, seed=1)
+        rate = games / (time.perf_counter() - start)
+        _metric(f'{processes} procesów', rate, 'gier/s', '10,.0f', 'higher')
+
+
+def bench_engine(iterations: int = 2000):
+    from hangman_engine import ALPHABET, HangmanEngine
+    
+    phrase = "NIE CHWAL DNIA PRZED ZACHODEM SŁOŃCA BO KTO RANO WSTAJE TEMU PAN BÓG DAJE A GDZIE KUCHAREK SZEŚĆ TAM NIE MA CO JEŚĆ"
+    game = HangmanEngine(phrase, None, 'bench')
+    for letter in "AEIO":
+        game.guess_letter(letter)
+    
+    def full_game(_):
+        engine = HangmanEngine(phrase, None, 'bench')
+        engine.max_mistakes = len(ALPHABET)
+        for letter in ALPHABET:
+            engine.guess_letter(letter)
+            engine.get_display_word()
+            if engine.game_over:
+                break
+    
+    _report(f"HangmanEngine (fraza {len(phrase)} znaków)", {
+        'get_display_word': _per_call_us(lambda _: game.get_display_word(), iterations * 100),
+        'is_word_guessed': _per_call_us(lambda _: game.is_word_guessed(), iterations * 100),
+        'pełna gra (35 liter)': _per_call_us(full_game, iterations),
+    })
+
+
+def bench_game(iterations: int = 2000):
+    from event_log import event_log
+    from hangman_engine import ALPHABET
+    from hangman_game import HangmanGame
+    from storage import MemoryStorage
+    
+    storage = MemoryStorage((word, 'Benchmark', None) for word in _random_words(10_000))
+    enabled, directory = event_log.enabled, event_log.directory
+    with tempfile.TemporaryDirectory() as tmp:
+        event_log.set_directory(tmp)
+        results = {}
+        for logging_on in (False, True):
+            event_log.enabled = logging_on
+            guesses = 0
+            guess_ns = 0
+            start = time.perf_counter()
+            for _ in range(iterations):
+                game = HangmanGame('bench', None, 'classic', 'Benchmark', None, storage)
+                game.max_mistakes = len(ALPHABET)
+                for letter in ALPHABET:
+                    guess_start = time.perf_counter_ns()
+                    game.guess_letter(letter)
+                    guess_ns += time.perf_counter_ns() - guess_start
+                    guesses += 1
+                    game.get_display_word()
+                    if game.game_over:
+                        break
+            elapsed = time.perf_counter() - start
+            label = 'z dziennikiem' if logging_on else 'bez dziennika'
+            results[f'guess_letter, {label}'] = guess_ns / guesses / 1000
+            results[f'nowa gra i pełna rozgrywka, {label}'] = elapsed / iterations * 1_000_000
+        event_log.enabled = enabled
+        event_log.set_directory(directory)
+        results['get_display_word'] = _per_call_us(lambda _: game.get_display_word(), iterations * 100)
+    
+    _report("HangmanGame (MemoryStorage)", results)
+
+
+def bench_timers(iterations: int = 2000, sessions: int = 100_000):
+    from timers import TimerScheduler
+    
+    now = [0.0]
+    scheduler = TimerScheduler(lambda: now[0])
+    rng = random.Random(0)
+    fired = []
+    
+    start = time.perf_counter()
+    timers = [scheduler.schedule(rng.uniform(1, 120), fired.append, i) for i in range(sessions)]
+    scheduled = (time.perf_counter() - start) / sessions * 1_000_000
+    
+    start = time.perf_counter()
+    for timer in timers[::4]:
+        timer.pause()
+    for timer in timers[::4]:
+        timer.resume()
+    paused = (time.perf_counter() - start) / (len(timers[::4]) * 2) * 1_000_000
+    
+    start = time.perf_counter()
+    for timer in timers[1::2]:
+        timer.cancel()
+    cancelled = (time.perf_counter() - start) / len(timers[1::2]) * 1_000_000
+    
+    start = time.perf_counter()
+    ticks = 0
+    while len(scheduler):
+        now[0] = scheduler.next_deadline()
+        scheduler.run_due()
+        ticks += 1
+    drained = (time.perf_counter() - start) / max(1, len(fired)) * 1_000_000
+    
+    _report(f"TimerScheduler ({sessions} gier na czas)", {
+        'schedule': scheduled,
+        'pause + resume': paused,
+        'cancel': cancelled,
+        'run_due (na wyzwolony termin)': drained,
+    })
+    _metric('wyzwolone terminy', len(fired), '', '10', None)
+
+
+def bench_writes(iterations: int = 2000, clients: int = 8):
+    import threading
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_database_path(os.path.join(tmp, 'bench.db'))
+        for client in range(clients):
+            database.create_user(f'bench{client}', 'bench')
+        
+        def synchronous(i):
+            player = f'bench{i % clients}'
+            database.save_game_result(player, None, 'ATOM', player, 'classic')
+        
+        def write_behind(i):
+            player = f'bench{i % clients}'
+            database.record_game_result(player, None, 'ATOM', player, 'classic')
+        
+        sync_us = _per_call_us(synchronous, iterations)
+        
+        latencies = []
+        
+        def client(offset):
+            for i in range(offset, iterations, clients):
+                start = time.perf_counter()
+                write_behind(i)
+                latencies.append((time.perf_counter() - start) * 1_000_000)
+        
+        start = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(offset,)) for offset in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        peak_depth = database.get_write_queue_stats()['depth']
+        database.flush_writes()
+        total_ms = (time.perf_counter() - start) * 1000
+        stats = database.get_write_queue_stats()
+        database.close_connections()
+    
+    latencies.sort()
+    _report("zapis wyniku gry", {
+        'synchroniczny save_result': sync_us,
+        f'kolejka write-behind ({clients} klientów), p50': latencies[len(latencies) // 2],
+        f'kolejka write-behind ({clients} klientów), p99': latencies[int(len(latencies) * 0.99)],
+    })
+    _metric('głębokość kolejki po wstawieniu', peak_depth, '', '10', None)
+    _metric('partie', stats['batches'], '', '10', None)
+    _metric('zapisane wyniki', stats['written'], '', '10', None)
+    _metric('max czas zapisu partii', stats['max_flush_ms'], 'ms', '10.2f')
+    _metric('czas do pełnego zapisu', total_ms, 'ms', '10.2f')
+
+
+def bench_export(iterations: int = 2000, history_size: int = 200_000):
+    import resource
+    from export import export_history
+    from storage import SQLiteStorage
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, 'bench.db'))
+        with storage.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO game_history (player1, player2, word, winner, game_mode) VALUES (?, ?, ?, ?, ?)",
+                ((f'gracz{i % 100}', None, 'ATOM', f'gracz{i % 100}' if i % 3 else None, 'classic')
+                 for i in range(history_size))
+            )
+        
+        _section(f"export_history ({history_size} gier)")
+        for fmt in ('csv', 'jsonl.gz'):
+            start = time.perf_counter()
+            rows = export_history(os.path.join(tmp, f'export.{fmt}'), None, fmt, storage=storage)
+            elapsed = time.perf_counter() - start
+            _metric(fmt, rows / elapsed, 'wierszy/s', '10,.0f', 'higher')
+        max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        _metric('maksymalne RSS procesu', max_rss_mb, 'MB')
+        storage.close()
+
+
+def bench_history(iterations: int = 2000, history_size: int = 1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_database_path(os.path.join(tmp, 'bench.db'))
+        for player in range(100):
+            database.create_user(f'gracz{player}', 'bench')
+        with database.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO game_history (player1, player2, word, winner, game_mode) VALUES (?, ?, ?, ?, ?)",
+                ((f'gracz{i % 100}', f'gracz{i % 7}' if i % 2 else None, 'ATOM', f'gracz{i % 100}' if i % 3 else None,
+                  'classic' if i % 4 else 'timed') for i in range(history_size))
+            )
+        database.rebuild_leaderboard()
+        
+        problems = database.check_query_plans()
+        last_page = database.get_user_history('gracz1')
+        results = {
+            'get_user_history (pierwsza strona)': _per_call_us(lambda _: database.get_user_history('gracz1'), iterations),
+            'get_user_history (następna strona)': _per_call_us(
+                lambda _: database.get_user_history('gracz1', last_page[-1][0]), iterations
+            ),
+            'get_leaderboard (wygrane)': _per_call_us(lambda _: database.get_leaderboard(), iterations),
+            'get_leaderboard (procent, timed)': _per_call_us(
+                lambda _: database.get_leaderboard('timed', 'win_rate'), iterations
+            ),
+        }
+        database.close_connections()
+    
+    _report(f"historia i ranking ({history_size} gier)", results)
+    for problem in problems:
+        print(f"  PLAN ZAPYTANIA: {problem}")
+    if problems:
+        raise SystemExit(1)
+
+
+def bench_queries(iterations: int = 2000, dictionary_size: int = 1_000_000, history_size: int = 10_000_000,
+                  players: int = 1000):
+    from encryption import hash_password
+    
+    slow = max(1, iterations // 500)
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_database_path(os.path.join(tmp, 'bench.db'))
+        start = time.perf_counter()
+        password_hash = hash_password('bench')
+        categories = [f'Kategoria{i}' for i in range(20)]
+        with database.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+                ((f'gracz{i}', password_hash) for i in range(players))
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO words (word, category, hint) VALUES (?, ?, ?)",
+                ((word, categories[i % len(categories)], None) for i, word in enumerate(_random_words(dictionary_size)))
+            )
+            conn.executemany(
+                "INSERT INTO game_history (player1, player2, word, winner, game_mode) VALUES (?, ?, ?, ?, ?)",
+                ((f'gracz{i % players}', f'gracz{i % 7}' if i % 2 else None, 'ATOM',
+                  f'gracz{i % players}' if i % 3 else None, 'classic' if i % 4 else 'timed')
+                 for i in range(history_size))
+            )
+        generated = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        database.recompute_difficulty()
+        difficulty = time.perf_counter() - start
+        start = time.perf_counter()
+        database.rebuild_leaderboard()
+        leaderboard = time.perf_counter() - start
+        start = time.perf_counter()
+        database.preload_words(categories[0]).result()
+        preload = time.perf_counter() - start
+        
+        token = database.create_session('gracz1')
+        last_page = database.get_user_history('gracz1')
+        new_words = iter(list(_random_words(slow * 10_000, seed=1)))
+        
+        def save(i):
+            database.save_game_result(f'gracz{i % players}', None, 'ATOM', None, 'classic')
+        
+        def record(i):
+            database.record_game_result(f'gracz{i % players}', None, 'ATOM', None, 'classic')
+            database.flush_writes()
+        
+        results = {
+            'get_categories': _per_call_us(lambda _: database.get_categories(), slow),
+            'get_random_word': _per_call_us(lambda _: database.get_random_word(categories[0], 'gracz1'), iterations),
+            'get_random_word (poziom)': _per_call_us(
+                lambda _: database.get_random_word(categories[0], 'gracz1', 'hard'), iterations
+            ),
+            'get_words (kategoria)': _per_call_us(lambda _: database.get_words(categories[0]), slow),
+            'import_words (10 000 słów)': _per_call_us(
+                lambda _: database.import_words((next(new_words), 'Nowe', None) for _ in range(10_000)), slow
+            ),
+            'authenticate_user': _per_call_us(lambda _: database.authenticate_user('gracz1', 'bench'), slow),
+            'create_session': _per_call_us(lambda _: database.create_session('gracz1'), iterations),
+            'authenticate_session': _per_call_us(lambda _: database.authenticate_session(token), iterations),
+            'cleanup_expired_sessions': _per_call_us(lambda _: database.cleanup_expired_sessions(), iterations),
+            'get_user_stats': _per_call_us(lambda i: database.get_user_stats(f'gracz{i % players}'), iterations),
+            'save_game_result': _per_call_us(save, iterations),
+            'record_game_result + flush_writes': _per_call_us(record, iterations),
+            'count_game_history (gracz)': _per_call_us(lambda _: database.count_game_history('gracz1'), slow),
+            'count_game_history (wszystkie)': _per_call_us(lambda _: database.count_game_history(), slow),
+            'iter_game_history (pierwsza partia)': _per_call_us(
+                lambda _: next(database.iter_game_history('gracz1')), slow
+            ),
+            'get_user_history (pierwsza strona)': _per_call_us(lambda _: database.get_user_history('gracz1'), iterations),
+            'get_user_history (następna strona)': _per_call_us(
+                lambda _: database.get_user_history('gracz1', last_page[-1][0]), iterations
+            ),
+            'get_leaderboard (wygrane)': _per_call_us(lambda _: database.get_leaderboard(), iterations),
+            'get_leaderboard (procent, timed)': _per_call_us(
+                lambda _: database.get_leaderboard('timed', 'win_rate'), iterations
+            ),
+        }
+        database.close_connections()
+    
+    _section(f"przygotowanie bazy ({dictionary_size} słów, {history_size} gier, {players} graczy)")
+    _metric('generowanie danych', generated, 's', '10.2f', None)
+    _metric('recompute_difficulty', difficulty, 's', '10.2f')
+    _metric('rebuild_leaderboard', leaderboard, 's', '10.2f')
+    _metric('preload_words (kategoria)', preload, 's', '10.2f')
+    _report("funkcje database.py", results)
+
+
+_STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+from main import HangmanGameApp
+imported = time.perf_counter()
+app = HangmanGameApp()
+app.render_frame()
+first_frame = time.perf_counter()
+app.screens['game']._warm_up.result()
+ready = time.perf_counter()
+print((imported - start) * 1000, (first_frame - start) * 1000, (ready - start) * 1000)
+"""
+
+
+def bench_startup(iterations: int = 2000, runs: int = 5, top: int = 10):
+    root = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=root, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        imports = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import main'],
+            cwd=tmp, env=env, capture_output=True, text=True, check=True
+        ).stderr
+        timings = []
+        for _ in range(runs):
+            for name in os.listdir(tmp):
+                os.remove(os.path.join(tmp, name))
+            output = subprocess.run(
+                [sys.executable, '-c', _STARTUP_SCRIPT],
+                cwd=tmp, env=env, capture_output=True, text=True, check=True
+            ).stdout
+            timings.append([float(value) for value in output.splitlines()[-1].split()])
+    
+    modules = []
+    for line in imports.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((int(cumulative), name.strip()))
+    
+    import_ms, first_frame_ms, ready_ms = (sorted(column)[len(column) // 2] for column in zip(*timings))
+    _section(f"uruchomienie (mediana z {runs} zimnych startów, pusta baza)")
+    _metric('import main', import_ms, 'ms')
+    _metric('pierwsza klatka', first_frame_ms, 'ms')
+    _metric('budżet pierwszej klatki', STARTUP_BUDGET_MS, 'ms', '10', None)
+    _metric('baza i słowa gotowe w tle', ready_ms, 'ms')
+    _section("najwolniejsze importy (łącznie)")
+    for cumulative, name in sorted(modules, reverse=True)[:top]:
+        _metric(name, cumulative / 1000, 'ms', better=None)
+    if first_frame_ms > STARTUP_BUDGET_MS:
+        raise SystemExit(1)
+
+
+class _DictGameState:
+
+    def __init__(self, word: str, hint: str, player1: str, player2: str = None, game_mode: str = "classic",
+                 category: str = None):
+        from hangman_engine import ALPHABET
+        
+        self.player1 = player1
+        self.player2 = player2
+        self.current_player = player1
+        self.game_mode = game_mode
+        self.category = category
+        self.word = word.upper()
+        self.hint = hint
+        self.guessed_letters = set()
+        self.letter_positions = {}
+        self.display = []
+        self.remaining = 0
+        for i, char in enumerate(self.word):
+            if char in ALPHABET:
+                self.letter_positions.setdefault(char, []).append(i)
+                self.display.append('_')
+                self.remaining += 1
+            else:
+                self.display.append(char)
+        self.display_word = ''.join(self.display)
+        self.mistakes = 0
+        self.max_mistakes = 6
+        self.game_over = False
+        self.winner = None
+        self.start_time = time.time()
+        self.hint_used = False
+        self.time_limit = None
+    
+    def guess_letter(self, letter: str):
+        self.guessed_letters.add(letter)
+        positions = self.letter_positions.get(letter)
+        if positions:
+            for i in positions:
+                self.display[i] = letter
+            self.display_word = ''.join(self.display)
+            self.remaining -= len(positions)
+        else:
+            self.mistakes += 1
+
+
+def _bytes_per_game(factory: Callable, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del games
+    return (after - before) / count
+
+
+def bench_memory(iterations: int = 2000, games: int = 20_000, words: int = 2000):
+    from hangman_engine import HangmanEngine
+    
+    vocabulary = [(f"SŁOWO NUMER {i}", f"Podpowiedź {i}") for i in range(words)]
+    players = [f"gracz{i}" for i in range(games // 10)]
+    
+    def build(cls):
+        def factory(i):
+            word, hint = vocabulary[i % words]
+            game = cls(word, hint, ''.join(players[i % len(players)]), ''.join(players[(i + 1) % len(players)]),
+                       'classic', 'Benchmark')
+            for letter in "AEOŁ":
+                game.guess_letter(letter)
+            return game
+        return factory
+    
+    before = _bytes_per_game(build(_DictGameState), games)
+    after = _bytes_per_game(build(HangmanEngine), games)
+    
+    game = build(HangmanEngine)(0)
+    snapshot = game.snapshot()
+    _section(f"pamięć na trwającą grę ({games} gier, {words} słów)")
+    _metric('__dict__ + set + lista', before, 'B', '10.0f')
+    _metric('__slots__ + maska bitowa', after, 'B', '10.0f')
+    _report("zapis stanu gry", {
+        'snapshot': _per_call_us(lambda _: game.snapshot(), iterations * 10),
+        'restore': _per_call_us(lambda _: HangmanEngine.restore(snapshot), iterations * 10),
+    })
+    _metric('rozmiar zapisu', len(snapshot), 'B', '10')
+
+
+def bench_profiler(iterations: int = 2000):
+    from main import HangmanGameApp
+    from storage import SQLiteStorage
+    from profiler import profiler, profiled
+    
+    def noop():
+        return None
+    
+    wrapped = profiled(noop)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, 'bench.db'))
+        app = HangmanGameApp(dirty_rendering=False, storage=storage)
+        app.current_user = 'bench'
+        app.set_screen("game", players=1)
+        
+        results = {'pusta funkcja': _per_call_us(lambda _: noop(), iterations * 100)}
+        for enabled in (False, True):
+            profiler.enabled = enabled
+            label = 'włączony' if enabled else 'wyłączony'
+            results[f'@profiled, {label}'] = _per_call_us(lambda _: wrapped(), iterations * 100)
+            results[f'pełna klatka GameScreen, {label}'] = _per_call_us(lambda _: app.render_frame(), iterations)
+        profiler.enabled = False
+        profiler.reset()
+        storage.close()
+    
+    _report("narzut profilera", results)
+
+
+def _random_words(count: int, seed: int = 0):
+    from hangman_engine import ALPHABET
+    
+    rng = random.Random(seed)
+    weights = [rng.random() ** 3 for _ in ALPHABET]
+    return (''.join(rng.choices(ALPHABET, weights, k=rng.randint(3, 14))) for _ in range(count))
+
+
+def bench_difficulty(iterations: int = 2000, dictionary_size: int = 1_000_000):
+    from config import DIFFICULTY_LEVELS
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_database_path(os.path.join(tmp, 'bench.db'))
+        with database.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO words (word, category, hint) VALUES (?, ?, ?)",
+                ((word, 'Benchmark', None) for word in _random_words(dictionary_size))
+            )
+        
+        start = time.perf_counter()
+        updated = database.recompute_difficulty()
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        database.recompute_difficulty()
+        repeated = time.perf_counter() - start
+        
+        results = {}
+        for level in (None,) + tuple(DIFFICULTY_LEVELS):
+            database.preload_words('Benchmark', level).result()
+            results[f"get_random_word({level or 'dowolny'})"] = _per_call_us(
+                lambda _: database.get_random_word('Benchmark', 'bench', level), iterations
+            )
+        database.close_connections()
+    
+    _section(f"recompute_difficulty ({updated} słów)")
+    _metric('pierwsze przeliczenie', elapsed, 's', '10.2f')
+    _metric('ponowne przeliczenie', repeated, 's', '10.2f')
+    _report("losowanie słowa według poziomu", results)
+
+
+def bench_solver(iterations: int = 2000, dictionary_size: int = 1_000_000):
+    from hangman_engine import LETTER_BITS, HangmanEngine
+    from solver import WordIndex
+    
+    words = list(_random_words(dictionary_size))
+    start = time.perf_counter()
+    index = WordIndex(words)
+    built = time.perf_counter() - start
+    
+    rng = random.Random(1)
+    games = []
+    for word in rng.sample(words, 20):
+        game = HangmanEngine(word, None, 'bench')
+        game.max_mistakes = 100
+        states = []
+        while not game.game_over:
+            states.append((game.display_word, game.guessed_mask))
+            game.guess_letter(index.suggest(game.display_word, game.guessed_mask))
+        games.append(states)
+    stages = {'początek gry': [states[0] for states in games],
+              'połowa gry': [states[len(states) // 2] for states in games],
+              'ostatni ruch': [states[-1] for states in games]}
+    
+    def naive_suggest(pattern, guessed_mask):
+        guessed = {letter for letter, bit in LETTER_BITS.items() if guessed_mask & bit}
+        counts = {}
+        for word in words:
+            if len(word) != len(pattern) or any(p != c if p != '_' else c in guessed for p, c in zip(pattern, word)):
+                continue
+            for letter in set(word) - guessed:
+                counts[letter] = counts.get(letter, 0) + 1
+        return max(counts, key=counts.get) if counts else None
+    
+    results = {}
+    for name, states in stages.items():
+        results[f"WordIndex.suggest, {name}"] = _per_call_us(
+            lambda i: index.suggest(*states[i % len(states)]), iterations
+        )
+    results["pełne skanowanie słownika, początek gry"] = _per_call_us(
+        lambda i: naive_suggest(*stages['początek gry'][i % len(games)]), 3
+    )
+    
+    _section(f"WordIndex ({index.size} słów)")
+    _metric('budowa indeksu', built, 's', '10.2f')
+    _report("wybór litery przez komputer", results)
+
+
+def bench_events(iterations: int = 2000, event_count: int = 20_000_000, segment_events: int = 2_000_000):
+    import numpy as np
+    import event_log
+    from hangman_engine import HangmanEngine
+    
+    words = list(dict.fromkeys(_random_words(5000)))
+    with tempfile.TemporaryDirectory() as tmp:
+        log = event_log.EventLog(os.path.join(tmp, 'append'))
+        game = HangmanEngine(words[0], None, 'bench')
+        recorder = log.recorder(game)
+        append = _per_call_us(lambda i: recorder.guess(game, 'A', i & 1), iterations * 10)
+        log.close()
+        
+        directory = os.path.join(tmp, 'events')
+        os.makedirs(directory)
+        rng = np.random.default_rng(0)
+        hashes = np.array([event_log.word_hash(word) for word in words], dtype=np.uint32)
+        with open(event_log.games_path(directory, 1), 'wb') as file:
+            for game_id, word in enumerate(words):
+                snapshot = HangmanEngine(word, None, 'bench').snapshot()
+                file.write(event_log.GAME_HEADER.pack(game_id, hashes[game_id], len(snapshot)) + snapshot)
+        
+        start = time.perf_counter()
+        for number, first in enumerate(range(0, event_count, segment_events), 1):
+            count = min(segment_events, event_count - first)
+            events = np.zeros(count, dtype=event_log._event_dtype())
+            events['game_id'] = np.arange(first, first + count) // 12
+            events['word_hash'] = hashes[events['game_id'] % len(hashes)]
+            events['turn'] = np.arange(first, first + count) % 12 + 1
+            events['letter'] = rng.integers(0, 35, count)
+            events['flags'] = rng.integers(0, 2, count)
+            events['think_ms'] = rng.integers(200, 5000, count)
+            events.tofile(event_log.events_path(directory, number))
+        generated = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        totals = event_log.summary(directory)
+        scanned = time.perf_counter() - start
+        start = time.perf_counter()
+        event_log.hardest_letters(directory, 10)
+        ranked = time.perf_counter() - start
+    
+    _report("dziennik ruchów, zapis", {'GameRecorder.guess': append})
+    _section(f"dziennik ruchów, analiza ({totals['events']:,} zdarzeń, {event_count * event_log.EVENT.size >> 20} MiB)")
+    _metric('generowanie segmentów', generated, 's', '10.2f')
+    _metric('summary', event_count / scanned / 1e6, 'mln zdarzeń/s', '10,.1f', 'higher')
+    _metric('hardest_letters', event_count / ranked / 1e6, 'mln zdarzeń/s', '10,.1f', 'higher')
+
+
+def bench_storage(iterations: int = 2000, dictionary_size: int = 50_000, players: int = 8):
+    from storage import MemoryStorage, SQLiteStorage
+    
+    words = [(word, 'Benchmark', None) for word in _random_words(dictionary_size)]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, storage in (('SQLite', SQLiteStorage(os.path.join(tmp, 'bench.db'))), ('pamięć', MemoryStorage())):
+            storage.add_words(words)
+            for player in range(players):
+                storage.create_user(f'bench{player}', 'bench')
+            token = storage.create_session('bench0')
+            storage.preload_words('Benchmark').result()
+            
+            def record(i):
+                player = f'bench{i % players}'
+                storage.record_game_result(player, None, 'ATOM', player if i & 1 else None, 'classic')
+            
+            start = time.perf_counter()
+            for i in range(iterations):
+                record(i)
+            storage.flush()
+            recorded = (time.perf_counter() - start) / iterations * 1_000_000
+            
+            results[name] = {
+                'get_random_word': _per_call_us(lambda _: storage.get_random_word('Benchmark', 'bench0'), iterations),
+                'record_game_result + flush': recorded,
+                'get_user_history': _per_call_us(lambda _: storage.get_user_history('bench0'), iterations),
+                'get_leaderboard': _per_call_us(lambda _: storage.get_leaderboard(min_games=1), iterations),
+                'authenticate_session': _per_call_us(lambda _: storage.authenticate_session(token), iterations),
+            }
+            storage.close()
+    
+    for name, timings in results.items():
+        _report(f"magazyn danych: {name}", timings)
+
+
+BENCHMARKS = {
+    'database': bench_database,
+    'words': bench_words,
+    'import': bench_import,
+    'render': bench_render,
+    'screens': bench_screens,
+    'dirty': bench_dirty,
+    'dispatch': bench_dispatch,
+    'scaling': bench_scaling,
+    'idle': bench_idle,
+    'auth': bench_auth,
+    'sessions': bench_sessions,
+    'simulator': bench_simulator,
+    'engine': bench_engine,
+    'game': bench_game,
+    'timers': bench_timers,
+    'writes': bench_writes,
+    'export': bench_export,
+    'history': bench_history,
+    'queries': bench_queries,
+    'startup': bench_startup,
+    'memory': bench_memory,
+    'profiler': bench_profiler,
+    'difficulty': bench_difficulty,
+    'solver': bench_solver,
+    'events': bench_events,
+    'storage': bench_storage,
+}
+
+
+def compare(results: dict, baseline: dict, threshold: float = BENCHMARK_REGRESSION_THRESHOLD) -> List[str]:
+    regressions = []
+    for benchmark, sections in results.items():
+        for section, metrics in sections.items():
+            for name, metric in metrics.items():
+                base = baseline.get(benchmark, {}).get(section, {}).get(name)
+                if base is None or metric['better'] is None or not base['value']:
+                    continue
+                change = metric['value'] / base['value'] - 1
+                worse = change > threshold if metric['better'] == 'lower' else change < -threshold
+                better = change < -threshold if metric['better'] == 'lower' else change > threshold
+                if worse or better:
+                    line = (f"{benchmark} / {section} / {name}: {base['value']:,.2f} -> {metric['value']:,.2f} "
+                            f"{metric['unit']} ({change:+.1%})")
+                    print(f"  {'REGRESJA' if worse else 'poprawa':<10} {line}")
+                    if worse:
+                        regressions.append(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarki gry w wisielca")
+    parser.add_argument('names', nargs='*', help=f"benchmarki do uruchomienia: {', '.join(BENCHMARKS)}")
+    parser.add_argument('-n', '--iterations', type=int, default=2000)
+    parser.add_argument('--json', help="zapisz wyniki do pliku JSON (np. jako punkt odniesienia)")
+    parser.add_argument('--compare', help="porównaj wyniki z zapisanym plikiem JSON i zgłoś regresje")
+    parser.add_argument('--threshold', type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+                        help="względna zmiana uznawana za regresję (domyślnie %(default)s)")
+    args = parser.parse_args()
+    
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"nieznany benchmark: {', '.join(unknown)}")
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+    names = args.names or (list(baseline['results']) if baseline else list(BENCHMARKS))
+    
+    failed = []
+    with tempfile.TemporaryDirectory() as tmp, _isolated_paths(tmp):
+        for name in names:
+            _current['benchmark'] = name
+            try:
+                BENCHMARKS[name](args.iterations)
+            except SystemExit:
+                failed.append(name)
+    
+    if args.json:
+        document = {
+            'meta': {
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+                'iterations': args.iterations,
+            },
+            'results': _results,
+        }
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(document, file, ensure_ascii=False, indent=2)
+    
+    regressions = []
+    if baseline:
+        print(f"porównanie z {args.compare} (próg {args.threshold:.1%})")
+        regressions = compare(_results, baseline['results'], args.threshold)
+        print(f"  regresje: {len(regressions)}")
+    for name in failed:
+        print(f"benchmark {name} zakończył się błędem", file=sys.stderr)
+    if regressions or failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
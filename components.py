@@ -1,10 +1,89 @@
 import pygame
-from typing import Callable, Optional
-from config import COLORS, FONTS
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from config import COLORS, FONTS, TEXT_CACHE_SIZE, PROFILE_OVERLAY_ROWS
+from hangman_engine import ALPHABET
+from profiler import profiled
 
 
-class Button:
+def display_format(surface: pygame.Surface, alpha: bool = False) -> pygame.Surface:
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+class TextCache:
+
+    def __init__(self, maxsize: int = TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+    
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color: tuple) -> pygame.Surface:
+        key = (font, text, antialias, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = display_format(font.render(text, antialias, color), alpha=True)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surface
+    
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+text_cache = TextCache()
+
+
+class DirtyRegions:
+
+    def __init__(self, *components):
+        self.components = list(components)
+        self.rects = []
+        self.full = True
+    
+    def invalidate(self):
+        self.full = True
+    
+    def add(self, rect):
+        self.rects.append(pygame.Rect(rect))
     
+    def pop(self, screen_rect: pygame.Rect) -> List[pygame.Rect]:
+        for component in self.components:
+            if component.dirty_rects:
+                self.rects.extend(component.dirty_rects)
+                component.dirty_rects.clear()
+        
+        if self.full:
+            rects = [screen_rect.copy()]
+        else:
+            rects = []
+            for rect in self.rects:
+                rect = rect.clip(screen_rect)
+                if not rect:
+                    continue
+                index = rect.collidelist(rects)
+                while index != -1:
+                    rect.union_ip(rects.pop(index))
+                    index = rect.collidelist(rects)
+                rects.append(rect)
+        
+        self.full = False
+        self.rects.clear()
+        return rects
+
+
+class Button:
+
     def __init__(self, x: int, y: int, width: int, height: int, text: str, 
                  onclick: Callable = None, color: tuple = None):
         self.rect = pygame.Rect(x, y, width, height)
@@ -13,6 +92,7 @@ class Button:
         self.color = color or COLORS['PRIMARY']
         self.hover_color = tuple(min(255, c + 30) for c in self.color)
         self.is_hovered = False
+        self.dirty_rects = []
     
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -20,113 +100,303 @@ class Button:
                 self.onclick()
     
     def update(self, mouse_pos):
-        self.is_hovered = self.rect.collidepoint(mouse_pos)
+        self.set_hovered(self.rect.collidepoint(mouse_pos))
+    
+    def set_hovered(self, is_hovered: bool):
+        if is_hovered != self.is_hovered:
+            self.is_hovered = is_hovered
+            self.dirty_rects.append(self.bounds())
     
+    def bounds(self) -> pygame.Rect:
+        text_surface = text_cache.render(FONTS['LARGE'], self.text, True, COLORS['TEXT'])
+        return self.rect.union(text_surface.get_rect(center=self.rect.center))
+    
+    @profiled
     def draw(self, screen):
         color = self.hover_color if self.is_hovered else self.color
         pygame.draw.rect(screen, color, self.rect)
         pygame.draw.rect(screen, COLORS['TEXT'], self.rect, 2)
         
-        text_surface = FONTS['LARGE'].render(self.text, True, COLORS['TEXT'])
+        text_surface = text_cache.render(FONTS['LARGE'], self.text, True, COLORS['TEXT'])
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
 
 class InputField:
-    
+
     def __init__(self, x: int, y: int, width: int, height: int, placeholder: str = ""):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = ""
         self.placeholder = placeholder
         self.active = False
+        self.dirty_rects = []
     
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
-            self.active = self.rect.collidepoint(event.pos)
+            self.set_active(self.rect.collidepoint(event.pos))
         elif event.type == pygame.KEYDOWN and self.active:
+            self.dirty_rects.append(self.bounds())
             if event.key == pygame.K_BACKSPACE:
                 self.text = self.text[:-1]
             else:
                 self.text += event.unicode
+            self.dirty_rects.append(self.bounds())
+    
+    def set_active(self, active: bool):
+        if active != self.active:
+            self.active = active
+            self.dirty_rects.append(self.bounds())
+    
+    def _text_surface(self) -> pygame.Surface:
+        display_text = self.text or self.placeholder
+        text_color = COLORS['TEXT'] if self.text else COLORS['GRAY']
+        return text_cache.render(FONTS['LARGE'], display_text, True, text_color)
+    
+    def bounds(self) -> pygame.Rect:
+        text_rect = self._text_surface().get_rect(topleft=(self.rect.x + 5, self.rect.y + 5))
+        return self.rect.union(text_rect)
     
+    @profiled
     def draw(self, screen):
         color = COLORS['PRIMARY'] if self.active else COLORS['SECONDARY']
         pygame.draw.rect(screen, color, self.rect)
         pygame.draw.rect(screen, COLORS['TEXT'], self.rect, 2)
         
-        display_text = self.text or self.placeholder
-        text_color = COLORS['TEXT'] if self.text else COLORS['GRAY']
-        text_surface = FONTS['LARGE'].render(display_text, True, text_color)
-        screen.blit(text_surface, (self.rect.x + 5, self.rect.y + 5))
+        screen.blit(self._text_surface(), (self.rect.x + 5, self.rect.y + 5))
+
+
+class SpatialIndex:
+
+    def __init__(self, cell_size: int = 64):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[tuple]] = {}
+    
+    def _cells(self, rect: pygame.Rect):
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cx, cy
+    
+    def insert(self, rect: pygame.Rect, item, when: Callable[[], bool] = None):
+        entry = (pygame.Rect(rect), item, when)
+        for cell in self._cells(entry[0]):
+            self.cells.setdefault(cell, []).append(entry)
+    
+    def remove(self, item):
+        for cell, entries in list(self.cells.items()):
+            entries[:] = [entry for entry in entries if entry[1] is not item]
+            if not entries:
+                del self.cells[cell]
+    
+    def hit(self, pos):
+        for rect, item, when in reversed(self.cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size), ())):
+            if rect.collidepoint(pos) and (when is None or when()):
+                return item
+        return None
+    
+    def clear(self):
+        self.cells.clear()
+
+
+class EventDispatcher:
+
+    def __init__(self, cell_size: int = 64):
+        self.index = SpatialIndex(cell_size)
+        self.handlers: Dict[int, List[Callable]] = {}
+        self.hovered = None
+        self.focused = None
+    
+    def add(self, *widgets, when: Callable[[], bool] = None):
+        for widget in widgets:
+            self.index.insert(widget.rect, widget, when)
+    
+    def remove(self, widget):
+        self.index.remove(widget)
+        if self.hovered is widget:
+            self.hovered = None
+        if self.focused is widget:
+            self.focused = None
+    
+    def subscribe(self, event_type: int, handler: Callable):
+        self.handlers.setdefault(event_type, []).append(handler)
+    
+    def hover(self, pos):
+        widget = self.index.hit(pos)
+        if widget is not self.hovered:
+            if hasattr(self.hovered, 'set_hovered'):
+                self.hovered.set_hovered(False)
+            if hasattr(widget, 'set_hovered'):
+                widget.set_hovered(True)
+            self.hovered = widget
+    
+    def _focus(self, widget):
+        if not hasattr(widget, 'set_active'):
+            widget = None
+        if widget is not self.focused:
+            if self.focused is not None:
+                self.focused.set_active(False)
+            if widget is not None:
+                widget.set_active(True)
+            self.focused = widget
+    
+    @profiled
+    def dispatch(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            self.hover(event.pos)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            widget = self.index.hit(event.pos)
+            self._focus(widget)
+            if widget is not None and not hasattr(widget, 'set_active'):
+                widget.handle_event(event)
+            self.hover(event.pos)
+        elif event.type == pygame.KEYDOWN and self.focused is not None:
+            self.focused.handle_event(event)
+        
+        for handler in self.handlers.get(event.type, ()):
+            handler(event)
 
 
 class HangmanDrawing:
+
+    MARGIN = 5
     
     def __init__(self, x: int, y: int):
         self.x = x
         self.y = y
+        self.rect = pygame.Rect(x - self.MARGIN, y - self.MARGIN, 100 + 2 * self.MARGIN, 200 + 2 * self.MARGIN)
+        self.stages = None
     
-    def draw(self, screen, mistakes: int):
-        parts = [
-            lambda: pygame.draw.line(screen, COLORS['TEXT'], (self.x, self.y + 200), (self.x + 100, self.y + 200), 5),
-            lambda: pygame.draw.line(screen, COLORS['TEXT'], (self.x + 20, self.y + 200), (self.x + 20, self.y), 5),
-            lambda: pygame.draw.line(screen, COLORS['TEXT'], (self.x + 20, self.y), (self.x + 80, self.y), 5),
-            lambda: pygame.draw.line(screen, COLORS['TEXT'], (self.x + 80, self.y), (self.x + 80, self.y + 30), 5),
-            lambda: pygame.draw.circle(screen, COLORS['TEXT'], (self.x + 80, self.y + 45), 15, 3),
-            lambda: pygame.draw.line(screen, COLORS['TEXT'], (self.x + 80, self.y + 60), (self.x + 80, self.y + 140), 5),
-            lambda: pygame.draw.line(screen, COLORS['TEXT'], (self.x + 80, self.y + 100), (self.x + 60, self.y + 80), 3),
-            lambda: pygame.draw.line(screen, COLORS['TEXT'], (self.x + 80, self.y + 100), (self.x + 100, self.y + 80), 3),
-            lambda: pygame.draw.line(screen, COLORS['TEXT'], (self.x + 80, self.y + 140), (self.x + 60, self.y + 170), 3),
-            lambda: pygame.draw.line(screen, COLORS['TEXT'], (self.x + 80, self.y + 140), (self.x + 100, self.y + 170), 3)
+    def _parts(self, surface, x: int, y: int):
+        return [
+            lambda: pygame.draw.line(surface, COLORS['TEXT'], (x, y + 200), (x + 100, y + 200), 5),
+            lambda: pygame.draw.line(surface, COLORS['TEXT'], (x + 20, y + 200), (x + 20, y), 5),
+            lambda: pygame.draw.line(surface, COLORS['TEXT'], (x + 20, y), (x + 80, y), 5),
+            lambda: pygame.draw.line(surface, COLORS['TEXT'], (x + 80, y), (x + 80, y + 30), 5),
+            lambda: pygame.draw.circle(surface, COLORS['TEXT'], (x + 80, y + 45), 15, 3),
+            lambda: pygame.draw.line(surface, COLORS['TEXT'], (x + 80, y + 60), (x + 80, y + 140), 5),
+            lambda: pygame.draw.line(surface, COLORS['TEXT'], (x + 80, y + 100), (x + 60, y + 80), 3),
+            lambda: pygame.draw.line(surface, COLORS['TEXT'], (x + 80, y + 100), (x + 100, y + 80), 3),
+            lambda: pygame.draw.line(surface, COLORS['TEXT'], (x + 80, y + 140), (x + 60, y + 170), 3),
+            lambda: pygame.draw.line(surface, COLORS['TEXT'], (x + 80, y + 140), (x + 100, y + 170), 3)
         ]
-        
-        for i in range(min(mistakes, len(parts))):
-            parts[i]()
+    
+    def _render_stages(self):
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.stages = [display_format(surface.copy(), alpha=True)]
+        for part in self._parts(surface, self.MARGIN, self.MARGIN):
+            part()
+            self.stages.append(display_format(surface.copy(), alpha=True))
+    
+    @profiled
+    def draw(self, screen, mistakes: int):
+        if self.stages is None:
+            self._render_stages()
+        stage = self.stages[max(0, min(mistakes, len(self.stages) - 1))]
+        screen.blit(stage, self.rect)
 
 
 class AlphabetGrid:
+    COLUMNS = 8
     
-    def __init__(self, x: int, y: int):
+    def __init__(self, x: int, y: int, on_select: Callable[[str], None] = None):
         self.x = x
         self.y = y
-        self.alphabet = "AĄBCĆDEĘFGHIJKLŁMNŃOÓPQRSŚTUVWXYZŹŻ"
+        self.alphabet = ALPHABET
         self.button_size = 40
         self.button_spacing = 45
         self.buttons = []
         self.selected_letters = set()
+        self.faces = {}
+        self.dirty_rects = []
+        self.on_select = on_select
         
         for i, letter in enumerate(self.alphabet):
-            row = i // 8
-            col = i % 8
+            row = i // self.COLUMNS
+            col = i % self.COLUMNS
             button_x = self.x + col * self.button_spacing
             button_y = self.y + row * self.button_spacing
             self.buttons.append({
                 'letter': letter,
                 'rect': pygame.Rect(button_x, button_y, self.button_size, self.button_size)
             })
+        self.rect = self.buttons[0]['rect'].unionall([button['rect'] for button in self.buttons])
+    
+    def letter_at(self, pos) -> Optional[str]:
+        col, dx = divmod(pos[0] - self.x, self.button_spacing)
+        row, dy = divmod(pos[1] - self.y, self.button_spacing)
+        if not (0 <= col < self.COLUMNS and row >= 0 and dx < self.button_size and dy < self.button_size):
+            return None
+        index = row * self.COLUMNS + col
+        return self.alphabet[index] if index < len(self.alphabet) else None
     
-    def handle_event(self, event, callback):
+    def handle_event(self, event, callback: Callable[[str], None] = None):
         if event.type == pygame.MOUSEBUTTONDOWN:
-            for button in self.buttons:
-                if button['rect'].collidepoint(event.pos):
-                    letter = button['letter']
-                    if letter not in self.selected_letters:
-                        self.selected_letters.add(letter)
-                        callback(letter)
+            letter = self.letter_at(event.pos)
+            if letter is not None and letter not in self.selected_letters:
+                self.select(letter)
+                (callback or self.on_select)(letter)
     
+    def select(self, letter: str):
+        if letter not in self.selected_letters:
+            self.selected_letters.add(letter)
+            self.dirty_rects.append(self.buttons[self.alphabet.index(letter)]['rect'])
+    
+    def _render_face(self, letter: str, selected: bool) -> pygame.Surface:
+        face = pygame.Surface((self.button_size, self.button_size))
+        face.fill(COLORS['GRAY'] if selected else COLORS['PRIMARY'])
+        pygame.draw.rect(face, COLORS['TEXT'], face.get_rect(), 1)
+        
+        text_surface = text_cache.render(FONTS['DEFAULT'], letter, True, COLORS['TEXT'])
+        text_rect = text_surface.get_rect(center=face.get_rect().center)
+        face.blit(text_surface, text_rect)
+        return display_format(face)
+    
+    @profiled
     def draw(self, screen):
+        if not self.faces:
+            for letter in self.alphabet:
+                self.faces[letter, False] = self._render_face(letter, False)
+                self.faces[letter, True] = self._render_face(letter, True)
+        
         for button in self.buttons:
             letter = button['letter']
-            rect = button['rect']
-            
-            if letter in self.selected_letters:
-                color = COLORS['GRAY']
-            else:
-                color = COLORS['PRIMARY']
-            
-            pygame.draw.rect(screen, color, rect)
-            pygame.draw.rect(screen, COLORS['TEXT'], rect, 1)
-            
-            text_surface = FONTS['DEFAULT'].render(letter, True, COLORS['TEXT'])
-            text_rect = text_surface.get_rect(center=rect.center)
-            screen.blit(text_surface, text_rect) 
\ No newline at end of file
+            screen.blit(self.faces[letter, letter in self.selected_letters], button['rect'])
+
+
+class ProfilerOverlay:
+    COLUMNS = (('n', 290), ('p50', 360), ('p95', 430), ('p99', 500))
+    LINE_HEIGHT = 18
+    
+    def __init__(self, x: int, bottom: int, rows: int = PROFILE_OVERLAY_ROWS):
+        self.x = x
+        self.bottom = bottom
+        self.rows = rows
+        self.visible = False
+        self.status = ""
+        self.surface = None
+        self.rect = pygame.Rect(x, bottom, 0, 0)
+    
+    def refresh(self, summary):
+        font = FONTS['SMALL']
+        lines = [("sekcja (ms)", *(label for label, _ in self.COLUMNS))]
+        for name, count, p50, p95, p99 in summary[:self.rows]:
+            lines.append((name, str(count), f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}"))
+        if self.status:
+            lines.append((self.status,))
+        
+        width = self.COLUMNS[-1][1] + 10
+        surface = pygame.Surface((width, len(lines) * self.LINE_HEIGHT + 10), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 190))
+        for row, line in enumerate(lines):
+            y = 5 + row * self.LINE_HEIGHT
+            surface.blit(font.render(line[0], True, (255, 255, 255)), (5, y))
+            for value, (_, right) in zip(line[1:], self.COLUMNS):
+                text = font.render(value, True, (255, 255, 255))
+                surface.blit(text, text.get_rect(topright=(right, y)))
+        
+        self.surface = display_format(surface, alpha=True)
+        self.rect = surface.get_rect(bottomleft=(self.x, self.bottom))
+    
+    def draw(self, screen):
+        if self.visible and self.surface:
+            screen.blit(self.surface, self.rect)
\ No newline at end of file
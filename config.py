@@ -1,7 +1,10 @@
-import pygame
+import os
 
 WINDOW_WIDTH = 1000
 WINDOW_HEIGHT = 700
+DISPLAY_SIZE = None
+RESIZABLE_WINDOW = True
+SMOOTH_SCALING = True
 FPS = 60
 
 WHITE = (255, 255, 255)
@@ -21,17 +24,44 @@ COLORS = {
     'GRAY': GRAY
 }
 
-pygame.init()
-DEFAULT_FONT = pygame.font.Font(None, 24)
-TITLE_FONT = pygame.font.Font(None, 48)
-LARGE_FONT = pygame.font.Font(None, 32)
-
-FONTS = {
-    'DEFAULT': DEFAULT_FONT,
-    'TITLE': TITLE_FONT,
-    'LARGE': LARGE_FONT
+FONT_SIZES = {
+    'DEFAULT': 24,
+    'TITLE': 48,
+    'LARGE': 32,
+    'SMALL': 18
 }
 
+class _LazyFonts(dict):
+    def __missing__(self, name):
+        import pygame
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = self[name] = pygame.font.Font(None, FONT_SIZES[name])
+        return font
+
+FONTS = _LazyFonts()
+
+def __getattr__(name):
+    if name in ('DEFAULT_FONT', 'TITLE_FONT', 'LARGE_FONT'):
+        return FONTS[name[:-len('_FONT')]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+TEXT_CACHE_SIZE = 512
+DIRTY_RECT_RENDERING = True
+ADAPTIVE_FRAME_RATE = True
+IDLE_TIMEOUT_MS = 1000
+STARTUP_BUDGET_MS = 500
+BENCHMARK_REGRESSION_THRESHOLD = 0.10
+
+PROFILING = False
+PROFILE_WINDOW = 1000
+PROFILE_TRACE_EVENTS = 200_000
+PROFILE_TRACE_PATH = 'hangman_trace.json'
+PROFILE_OVERLAY_KEY = 'f3'
+PROFILE_DUMP_KEY = 'f4'
+PROFILE_OVERLAY_REFRESH_MS = 250
+PROFILE_OVERLAY_ROWS = 12
+
 MAX_MISTAKES = 6
 GAME_MODES = {
     'CLASSIC': 'Klasyczny',
@@ -39,4 +69,59 @@ GAME_MODES = {
 }
 TIMED_MODE_DURATION = 120
 
-DATABASE_PATH = 'hangman_game.db'
\ No newline at end of file
+BCRYPT_ROUNDS = 12
+AUTH_WORKERS = 2
+SESSION_TTL = 7 * 24 * 3600
+DATA_DIR = os.environ.get('HANGMAN_DATA_DIR') or os.path.join(os.path.expanduser('~'), '.hangman')
+SESSION_KEY_PATH = os.path.join(DATA_DIR, 'session.key')
+SESSION_TOKEN_PATH = os.path.join(DATA_DIR, 'session.token')
+REMEMBER_ME_DEFAULT = False
+
+DATABASE_PATH = 'hangman_game.db'
+DB_BUSY_TIMEOUT = 5.0
+DB_RETRY_ATTEMPTS = 5
+DB_RETRY_DELAY = 0.05
+DB_STATEMENT_CACHE = 256
+WRITE_BATCH_SIZE = 500
+WRITE_FLUSH_INTERVAL = 0.5
+WRITE_FLUSH_TIMEOUT = 30.0
+EXPORT_CHUNK_SIZE = 5000
+EXPORT_FORMAT = 'csv'
+EXPORT_POLL_MS = 200
+HISTORY_PAGE_SIZE = 10
+LEADERBOARD_MIN_GAMES = 5
+WORD_REPEAT_WINDOW = 5
+WORD_RECENT_USERS = 10_000
+IMPORT_BATCH_SIZE = 50000
+
+EVENT_LOG_ENABLED = True
+EVENT_LOG_DIR = 'hangman_events'
+EVENT_LOG_SEGMENT_SIZE = 64 * 1024 * 1024
+
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 5555
+SERVER_BACKLOG = 1024
+SERVER_MAX_LINE = 4096
+SERVER_WRITE_HIGH_WATER = 64 * 1024
+SERVER_CONNECT_TIMEOUT = 3.0
+SERVER_CHECKPOINT_INTERVAL = 5.0
+
+DIFFICULTY_LEVELS = {
+    'easy': (0.0, 1 / 3),
+    'medium': (1 / 3, 2 / 3),
+    'hard': (2 / 3, 1.0)
+}
+DIFFICULTY_NAMES = {
+    'easy': 'Łatwy',
+    'medium': 'Średni',
+    'hard': 'Trudny'
+}
+DIFFICULTY_WEIGHTS = {
+    'rarity': 0.5,
+    'distinct': 0.3,
+    'length': 0.2
+}
+DIFFICULTY_HISTORY_PRIOR = 20
+
+COMPUTER_PLAYER = "Komputer"
+COMPUTER_MOVE_DELAY_MS = 700
\ No newline at end of file
@@ -1,133 +1,1007 @@
 import sqlite3
+import csv
+import gzip
+import json
+import os
+import queue
 import random
-from typing import List, Optional, Tuple
-from config import DATABASE_PATH
-from encryption import hash_password, verify_password
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from config import (DATABASE_PATH, DB_BUSY_TIMEOUT, DB_RETRY_ATTEMPTS, DB_RETRY_DELAY, DB_STATEMENT_CACHE,
+                    WORD_REPEAT_WINDOW, WORD_RECENT_USERS, IMPORT_BATCH_SIZE, SESSION_TTL, WRITE_BATCH_SIZE, WRITE_FLUSH_INTERVAL,
+                    WRITE_FLUSH_TIMEOUT, EXPORT_CHUNK_SIZE, HISTORY_PAGE_SIZE, LEADERBOARD_MIN_GAMES, DIFFICULTY_LEVELS)
+from encryption import (hash_password, verify_password, needs_rehash, submit_auth, generate_session_token,
+                        split_session_token, verify_session_verifier)
+from profiler import profiled
 
-def init_database():
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
+
+def _is_busy(error: Exception) -> bool:
+    message = str(error)
+    return isinstance(error, sqlite3.OperationalError) and ('locked' in message or 'busy' in message)
+
+
+class ConnectionManager:
+
+    def __init__(self, path: str, initializer=None, timeout: float = DB_BUSY_TIMEOUT, retries: int = DB_RETRY_ATTEMPTS,
+                 retry_delay: float = DB_RETRY_DELAY, cached_statements: int = DB_STATEMENT_CACHE):
+        self.path = path
+        self.initializer = initializer
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._init_lock = threading.RLock()
+        self._initializing = False
+        self._ready = initializer is None
+        self._connections = []
+    
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=self.cached_statements
+            )
+            conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+            if self.path != ':memory:':
+                self._retry(conn.execute, "PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._lock:
+                self._connections.append(conn)
         
+        if not self._ready:
+            with self._init_lock:
+                if not self._ready and not self._initializing:
+                    self._initializing = True
+                    try:
+                        self.initializer()
+                        self._ready = True
+                    finally:
+                        self._initializing = False
+        return conn
+    
+    def _retry(self, func, *args):
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            try:
+                return func(*args)
+            except sqlite3.OperationalError as e:
+                if attempt == self.retries or not _is_busy(e):
+                    raise
+                time.sleep(delay)
+                delay *= 2
+    
+    def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        return self._retry(self.connection().execute, sql, params)
+    
+    def executemany(self, sql: str, rows) -> sqlite3.Cursor:
+        return self._retry(self.connection().executemany, sql, rows)
+    
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+        
+        self._retry(conn.execute, "BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            self._retry(conn.execute, "COMMIT")
+        finally:
+            self._local.depth = 0
+    
+    def close_all(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def recent_words(recent: OrderedDict, username: Optional[str], repeat_window: int,
+                 max_users: int = WORD_RECENT_USERS) -> deque:
+    words = recent.get(username)
+    if words is None:
+        words = recent[username] = deque(maxlen=repeat_window)
+        if len(recent) > max_users:
+            recent.popitem(last=False)
+    else:
+        recent.move_to_end(username)
+    return words
+
+
+class WordStore:
+
+    def __init__(self, db: ConnectionManager, repeat_window: int = WORD_REPEAT_WINDOW):
+        self.db = db
+        self.repeat_window = repeat_window
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="word-store")
+        self.generation = 0
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self._recent = OrderedDict()
+            self.invalidate()
+    
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._words = {}
+            self._hints = {}
+            self._prefetched = {}
+            self._max_id = None
+            self._count = 0
+    
+    def refresh(self):
+        with self._lock:
+            count, max_id = self.db.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM words").fetchone()
+            if self._max_id is None:
+                self._max_id, self._count = max_id, count
+                return
+            
+            new_rows = []
+            if max_id > self._max_id:
+                new_rows = self.db.execute(
+                    "SELECT word, category, hint, difficulty FROM words WHERE id > ? AND id <= ? ORDER BY id",
+                    (self._max_id, max_id)
+                ).fetchall()
+            
+            if new_rows or self._count != count:
+                self.generation += 1
+            if self._count + len(new_rows) != count:
+                self._words.clear()
+                self._hints.clear()
+                self._prefetched.clear()
+            else:
+                for word, category, hint, difficulty in new_rows:
+                    for key in self._words:
+                        key_category, level = key
+                        if key_category not in (None, category):
+                            continue
+                        if level is not None and not DIFFICULTY_LEVELS[level][0] <= difficulty < DIFFICULTY_LEVELS[level][1]:
+                            continue
+                        self._words[key].append(word)
+                        self._hints[key].append(hint)
+            self._max_id, self._count = max_id, count
+    
+    def _load(self, category: Optional[str], difficulty: Optional[str] = None):
+        if self._max_id is None:
+            self.refresh()
+        sql = "SELECT word, hint FROM words WHERE id <= ?"
+        params = [self._max_id]
+        if category is not None:
+            sql += " AND category = ?"
+            params.append(category)
+        if difficulty is not None:
+            sql += " AND difficulty >= ? AND difficulty < ?"
+            params.extend(DIFFICULTY_LEVELS[difficulty])
+        
+        words, hints = [], []
+        for word, hint in self.db.execute(sql + " ORDER BY id", params):
+            words.append(word)
+            hints.append(hint)
+        self._words[category, difficulty] = words
+        self._hints[category, difficulty] = hints
+    
+    def _pick(self, category: Optional[str], username: Optional[str],
+              difficulty: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        key = (category, difficulty)
+        if key not in self._words:
+            self._load(category, difficulty)
+        if not self._words[key] and difficulty is not None:
+            return self._pick(category, username)
+        words = self._words[key]
+        if not words:
+            return None
+        
+        recent = recent_words(self._recent, username, self.repeat_window)
+        window = min(len(recent), len(words) - 1)
+        avoid = list(recent)[len(recent) - window:]
+        for _ in range(16):
+            index = random.randrange(len(words))
+            if words[index] not in avoid:
+                break
+        recent.append(words[index])
+        return words[index], self._hints[key][index]
+    
+    def random_word(self, category: str = None, username: str = None,
+                    difficulty: str = None) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            prefetched = self._prefetched.pop((username, category, difficulty), None)
+            if prefetched:
+                return prefetched
+            return self._pick(category, username, difficulty)
+    
+    def _prefetch(self, category: Optional[str], username: Optional[str], difficulty: Optional[str]):
+        self.refresh()
+        with self._lock:
+            key = (username, category, difficulty)
+            if key not in self._prefetched:
+                word_data = self._pick(category, username, difficulty)
+                if word_data:
+                    self._prefetched[key] = word_data
+    
+    def prefetch(self, category: str = None, username: str = None, difficulty: str = None):
+        return self._executor.submit(self._prefetch, category, username, difficulty)
+    
+    def preload(self, category: str = None, difficulty: str = None):
+        return self._executor.submit(self._preload, category, difficulty)
+    
+    def _preload(self, category: Optional[str], difficulty: Optional[str] = None):
+        self.refresh()
+        with self._lock:
+            if (category, difficulty) not in self._words:
+                self._load(category, difficulty)
+            if difficulty is not None and not self._words[category, difficulty] and (category, None) not in self._words:
+                self._load(category)
+    
+    def words(self, category: Optional[str]) -> List[str]:
+        self._preload(category)
+        with self._lock:
+            return list(self._words[category, None])
+
+
+class WriteBehindQueue:
+
+    _STOP = object()
+    
+    def __init__(self, writer: Callable[[List[Tuple]], None], batch_size: int = WRITE_BATCH_SIZE,
+                 flush_interval: float = WRITE_FLUSH_INTERVAL):
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._failed = []
+        self._error = None
+        self.batches = 0
+        self.written = 0
+        self.dropped = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+    
+    def put(self, result: Tuple):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+        self._queue.put(result)
+    
+    def depth(self) -> int:
+        return self._queue.qsize() + len(self._failed)
+    
+    def flush(self, timeout: float = WRITE_FLUSH_TIMEOUT):
+        if self._thread is not None:
+            done = threading.Event()
+            self._queue.put(done)
+            if not done.wait(timeout):
+                raise TimeoutError(f"Zapis wyników gier nie zakończył się w ciągu {timeout:.0f}s")
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+    
+    def close(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join()
+    
+    def stats(self) -> dict:
+        return {
+            'depth': self.depth(),
+            'batches': self.batches,
+            'written': self.written,
+            'dropped': self.dropped,
+            'last_flush_ms': self.last_flush_ms,
+            'max_flush_ms': self.max_flush_ms
+        }
+    
+    def _run(self):
+        while True:
+            batch = []
+            markers = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is self._STOP or isinstance(item, threading.Event):
+                    markers.append(item)
+                    break
+                batch.append(item)
+                timeout = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            
+            self._write(batch)
+            for marker in markers:
+                if marker is self._STOP:
+                    return
+                marker.set()
+    
+    def _write(self, batch: List[Tuple]):
+        batch = self._failed + batch
+        self._failed = []
+        if not batch:
+            return
+        
+        start = time.perf_counter()
+        try:
+            self.writer(batch)
+            written = len(batch)
+        except Exception as e:
+            if _is_busy(e):
+                self._error, self._failed = e, batch
+                return
+            written = self._write_rows(batch)
+        
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+        self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+        self.batches += 1
+        self.written += written
+    
+    def _write_rows(self, batch: List[Tuple]) -> int:
+        written = 0
+        for row in batch:
+            try:
+                self.writer([row])
+                written += 1
+            except Exception as e:
+                self._error = e
+                if _is_busy(e):
+                    self._failed.append(row)
+                else:
+                    self.dropped += 1
+        return written
+
+
+def _create_word_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_words_category ON words (category)")
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_words_word_category'")
+    if cursor.fetchone() is None:
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                games_played INTEGER DEFAULT 0,
-                games_won INTEGER DEFAULT 0
-            )
+            DELETE FROM words WHERE rowid NOT IN (SELECT MIN(rowid) FROM words GROUP BY word, category)
         """)
+        cursor.execute("CREATE UNIQUE INDEX idx_words_word_category ON words (word, category)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_words_category_difficulty ON words (category, difficulty)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_words_difficulty ON words (difficulty)")
+
+def _open_word_list(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+def read_word_list(path: str, fmt: str = None, category: str = None) -> Iterator[Tuple[str, str, Optional[str]]]:
+    if fmt is None:
+        extension = os.path.splitext(path[:-3] if path.endswith('.gz') else path)[1].lower()
+        fmt = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}.get(extension, 'txt')
+    
+    with _open_word_list(path) as file:
+        if fmt == 'csv':
+            reader = csv.reader(file)
+            for row in reader:
+                if not row or row[0].strip().lower() == 'word':
+                    continue
+                yield row[0], (row[1] if len(row) > 1 and row[1] else category), (row[2] if len(row) > 2 and row[2] else None)
+        elif fmt == 'jsonl':
+            for line in file:
+                if line.strip():
+                    item = json.loads(line)
+                    yield item.get('word', ''), item.get('category') or category, item.get('hint')
+        elif fmt == 'txt':
+            for line in file:
+                yield line, category, None
+        else:
+            raise ValueError(f"Nieobsługiwany format listy słów: {fmt}")
+
+def normalize_words(rows: Iterable[Tuple[str, str, Optional[str]]]) -> Iterator[Tuple[str, str, Optional[str]]]:
+    for word, category, hint in rows:
+        word = word.strip().upper()
+        if not word:
+            continue
+        if not category:
+            raise ValueError(f"Brak kategorii dla słowa {word}")
+        yield word, category.strip(), hint
+
+def game_result_stats(player1: str, player2: str, winner: str) -> List[Tuple[str, bool]]:
+    if winner == player1:
+        stats = [(player1, True)]
+        if player2:
+            stats.append((player2, False))
+    elif winner == player2:
+        stats = [(player2, True), (player1, False)]
+    else:
+        stats = [(player1, False)]
+        if player2:
+            stats.append((player2, False))
+    return stats
+
+_USER_HISTORY_SQL = """
+    SELECT {columns} FROM game_history WHERE player1 = :username AND id {op} :after
+    UNION ALL
+    SELECT {columns} FROM game_history WHERE player2 = :username AND player1 IS NOT :username AND id {op} :after
+    ORDER BY id {order}
+"""
+_HISTORY_PAGE_SQL = _USER_HISTORY_SQL.format(columns="id, word, game_mode, winner", op="<", order="DESC") + " LIMIT :limit"
+_HISTORY_EXPORT_SQL = _USER_HISTORY_SQL.format(
+    columns="id, player1, player2, word, winner, game_mode", op=">", order="ASC"
+)
+_HISTORY_COUNT_SQL = """
+    SELECT (SELECT COUNT(*) FROM game_history WHERE player1 = :username)
+         + (SELECT COUNT(*) FROM game_history WHERE player2 = :username AND player1 IS NOT :username)
+"""
+_LEADERBOARD_SQL = {
+    'wins': """
+        SELECT username, games_played, games_won, win_rate FROM leaderboard
+        WHERE game_mode = :game_mode AND games_played >= :min_games
+        ORDER BY games_won DESC LIMIT :limit
+    """,
+    'win_rate': """
+        SELECT username, games_played, games_won, win_rate FROM leaderboard
+        WHERE game_mode = :game_mode AND games_played >= :min_games
+        ORDER BY win_rate DESC LIMIT :limit
+    """
+}
+
+ALL_MODES = '*'
+DIFFICULTY_VERSION = 1
+
+
+class Database:
+
+    def __init__(self, path: str = DATABASE_PATH, repeat_window: int = WORD_REPEAT_WINDOW):
+        self.path = path
+        self._db = ConnectionManager(path, self.init_database)
+        self._words = WordStore(self._db, repeat_window)
+        self._writes = WriteBehindQueue(self._write_game_results)
+    
+    def transaction(self):
+        return self._db.transaction()
+    
+    def close(self):
+        self._writes.close()
+        self._db.close_all()
+    
+    def init_database(self):
+        with self._db.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    games_played INTEGER DEFAULT 0,
+                    games_won INTEGER DEFAULT 0
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS words (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    word TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    hint TEXT,
+                    difficulty REAL NOT NULL DEFAULT 0.5
+                )
+            """)
+            columns = [row[1] for row in cursor.execute("PRAGMA table_info(words)")]
+            migrate_difficulty = 'difficulty' not in columns
+            if migrate_difficulty:
+                cursor.execute("ALTER TABLE words ADD COLUMN difficulty REAL NOT NULL DEFAULT 0.5")
+            if cursor.execute("PRAGMA user_version").fetchone()[0] < DIFFICULTY_VERSION:
+                migrate_difficulty = True
+            
+            _create_word_indexes(cursor)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS game_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    player1 TEXT NOT NULL,
+                    player2 TEXT,
+                    word TEXT NOT NULL,
+                    winner TEXT,
+                    game_mode TEXT NOT NULL
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_game_history_player1 ON game_history (player1)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_game_history_player2 ON game_history (player2)")
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS leaderboard (
+                    username TEXT NOT NULL,
+                    game_mode TEXT NOT NULL,
+                    games_played INTEGER NOT NULL DEFAULT 0,
+                    games_won INTEGER NOT NULL DEFAULT 0,
+                    win_rate REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (username, game_mode)
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_leaderboard_wins ON leaderboard (game_mode, games_won DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_leaderboard_win_rate ON leaderboard (game_mode, win_rate DESC)")
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM leaderboard), EXISTS (SELECT 1 FROM game_history)")
+            if cursor.fetchone() == (0, 1):
+                self.rebuild_leaderboard()
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    selector TEXT PRIMARY KEY,
+                    verifier_hash TEXT NOT NULL,
+                    username TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)")
+            
+            cursor.execute("SELECT COUNT(*) FROM words")
+            if cursor.fetchone()[0] == 0:
+                words_data = [
+                    ("SŁOŃ", "Zwierzęta", "Największe zwierzę lądowe"),
+                    ("ŻYRAFA", "Zwierzęta", "Najwyższe zwierzę na świecie"),
+                    ("PINGWIN", "Zwierzęta", "Ptak który nie lata ale pływa"),
+                    ("POLSKA", "Kraje", "Nasz kraj"),
+                    ("FRANCJA", "Kraje", "Kraj wieży Eiffla"),
+                    ("CHINY", "Kraje", "Produkuje wszystko "),
+                    ("PIZZA", "Jedzenie", "Włoska potrawa z ciastem"),
+                    ("SUSHI", "Jedzenie", "Japońska potrawa z ryżem"),
+                    ("PIEROGI", "Jedzenie", "Tradycyjne polskie danie"),
+                    ("PIŁKA", "Sport", "Podstawowy sprzęt w wielu sportach"),
+                    ("TENIS", "Sport", "Gra z rakietą"),
+                    ("KOMPUTER", "Nauka", "Urządzenie elektroniczne"),
+                    ("INTERNET", "Nauka", "Globalna sieć"),
+                    ("ATOM", "Nauka", "Podstawowa jednostka materii")
+                ]
+                cursor.executemany("INSERT INTO words (word, category, hint) VALUES (?, ?, ?)", words_data)
+                migrate_difficulty = True
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS words (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT NOT NULL,
-                category TEXT NOT NULL,
-                hint TEXT
+        if migrate_difficulty:
+            self.recompute_difficulty()
+            with self._db.transaction() as conn:
+                conn.execute(f"PRAGMA user_version = {DIFFICULTY_VERSION}")
+    
+    @profiled
+    def import_words(self, rows: Iterable[Tuple[str, str, Optional[str]]], batch_size: int = IMPORT_BATCH_SIZE,
+                     progress: Callable[[int], None] = None) -> int:
+        rows = normalize_words(rows)
+        read = 0
+        with self._db.transaction() as conn:
+            cursor = conn.cursor()
+            start_count = cursor.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS import_words (word TEXT, category TEXT, hint TEXT)")
+            
+            try:
+                while True:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    cursor.executemany("INSERT INTO import_words (word, category, hint) VALUES (?, ?, ?)", batch)
+                    read += len(batch)
+                    if progress:
+                        progress(read)
+                
+                _create_word_indexes(cursor)
+                cursor.execute("""
+                    INSERT OR IGNORE INTO words (word, category, hint)
+                    SELECT word, category, hint FROM import_words ORDER BY word, category
+                """)
+            finally:
+                cursor.execute("DROP TABLE import_words")
+            end_count = cursor.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+        
+        if end_count > start_count:
+            self.recompute_difficulty()
+        return end_count - start_count
+    
+    def import_word_file(self, path: str, fmt: str = None, category: str = None, batch_size: int = IMPORT_BATCH_SIZE,
+                         progress: Callable[[int], None] = None) -> int:
+        return self.import_words(read_word_list(path, fmt, category), batch_size, progress)
+    
+    @profiled
+    def create_user(self, username: str, password: str) -> bool:
+        try:
+            password_hash_result = hash_password(password)
+            with self._db.transaction() as conn:
+                conn.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, password_hash_result))
+                return True
+        except sqlite3.IntegrityError:
+            return False
+    
+    @profiled
+    def authenticate_user(self, username: str, password: str) -> bool:
+        row = self._db.execute("SELECT password_hash FROM users WHERE username = ?", (username,)).fetchone()
+        if not row or not verify_password(password, row[0]):
+            return False
+        
+        if needs_rehash(row[0]):
+            with self._db.transaction() as conn:
+                conn.execute("UPDATE users SET password_hash = ? WHERE username = ?", (hash_password(password), username))
+        return True
+    
+    def create_user_async(self, username: str, password: str):
+        return submit_auth(self.create_user, username, password)
+    
+    def authenticate_user_async(self, username: str, password: str):
+        return submit_auth(self.authenticate_user, username, password)
+    
+    @profiled
+    def create_session(self, username: str, ttl: float = SESSION_TTL) -> str:
+        token, selector, verifier_hash = generate_session_token()
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO sessions (selector, verifier_hash, username, expires_at) VALUES (?, ?, ?, ?)",
+                (selector, verifier_hash, username, time.time() + ttl)
             )
-        """)
+        return token
+    
+    @profiled
+    def authenticate_session(self, token: str) -> Optional[str]:
+        selector, verifier = split_session_token(token)
+        row = self._db.execute(
+            "SELECT verifier_hash, username, expires_at FROM sessions WHERE selector = ?", (selector,)
+        ).fetchone()
+        if row and row[2] > time.time() and verify_session_verifier(verifier, row[0]):
+            return row[1]
+        return None
+    
+    def authenticate_session_async(self, token: str):
+        return self._words._executor.submit(self.authenticate_session, token)
+    
+    @profiled
+    def revoke_session(self, token: str):
+        selector, _ = split_session_token(token)
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM sessions WHERE selector = ?", (selector,))
+    
+    @profiled
+    def cleanup_expired_sessions(self) -> int:
+        with self._db.transaction() as conn:
+            return conn.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),)).rowcount
+    
+    @profiled
+    def get_user_stats(self, username: str) -> Tuple[int, int]:
+        row = self._db.execute("SELECT games_played, games_won FROM users WHERE username = ?", (username,)).fetchone()
+        return row if row else (0, 0)
+    
+    @profiled
+    def get_categories(self) -> List[str]:
+        rows = self._db.execute("SELECT DISTINCT category FROM words ORDER BY category").fetchall()
+        return [row[0] for row in rows]
+    
+    @profiled
+    def get_random_word(self, category: str = None, username: str = None, difficulty: str = None) -> Optional[Tuple[str, str]]:
+        if difficulty is not None and difficulty not in DIFFICULTY_LEVELS:
+            raise ValueError(f"Nieznany poziom trudności: {difficulty}")
+        return self._words.random_word(category, username, difficulty)
+    
+    def get_words(self, category: str = None) -> List[str]:
+        return self._words.words(category)
+    
+    def prefetch_word(self, category: str = None, username: str = None, difficulty: str = None):
+        return self._words.prefetch(category, username, difficulty)
+    
+    def preload_words(self, category: str = None, difficulty: str = None):
+        return self._words.preload(category, difficulty)
+    
+    def word_generation(self) -> int:
+        return self._words.generation
+    
+    @profiled
+    def recompute_difficulty(self) -> int:
+        import numpy as np
+        from difficulty import difficulty_scores
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS game_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player1 TEXT NOT NULL,
-                player2 TEXT,
-                word TEXT NOT NULL,
-                winner TEXT,
-                game_mode TEXT NOT NULL
+        rows = self._db.execute("SELECT id, word, difficulty FROM words ORDER BY id").fetchall()
+        if not rows:
+            return 0
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        current = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+        words = [row[1] for row in rows]
+        del rows
+        
+        games = np.zeros(len(ids))
+        losses = np.zeros(len(ids))
+        history = self._db.execute("""
+            SELECT w.id, COUNT(*), SUM(h.winner IS NULL)
+            FROM game_history h JOIN words w ON w.word = h.word
+            WHERE h.player2 IS NULL
+            GROUP BY w.id
+        """).fetchall()
+        if history:
+            history = np.array(history, dtype=np.int64)
+            positions = np.searchsorted(ids, history[:, 0])
+            games[positions] = history[:, 1]
+            losses[positions] = history[:, 2]
+        
+        scores = np.round(difficulty_scores(words, games, losses), 6)
+        changed = np.flatnonzero(scores != current)
+        if not len(changed):
+            return 0
+        
+        with self._db.transaction() as conn:
+            count, max_id = conn.execute("SELECT COUNT(*), MAX(id) FROM words").fetchone()
+            if (count, max_id) != (len(ids), int(ids[-1])):
+                return 0
+            
+            reindex = len(changed) * 10 > len(ids)
+            if reindex:
+                conn.execute("DROP INDEX IF EXISTS idx_words_category_difficulty")
+                conn.execute("DROP INDEX IF EXISTS idx_words_difficulty")
+            conn.executemany(
+                "UPDATE words SET difficulty = ? WHERE id = ?",
+                zip(scores[changed].tolist(), ids[changed].tolist())
             )
-        """)
+            if reindex:
+                _create_word_indexes(conn.cursor())
+        
+        self._words.invalidate()
+        return len(changed)
+    
+    def _warm_up(self) -> List[str]:
+        self.cleanup_expired_sessions()
+        categories = self.get_categories()
+        if categories:
+            self._words._preload(categories[0])
+        return categories
+    
+    def warm_up(self):
+        return self._words._executor.submit(self._warm_up)
+    
+    @profiled
+    def save_game_result(self, player1: str, player2: str, word: str, winner: str, game_mode: str):
+        self._write_game_results([(player1, player2, word, winner, game_mode)])
+    
+    @profiled
+    def _write_game_results(self, results: List[Tuple]):
+        totals = {}
+        mode_totals = {}
+        for player1, player2, word, winner, game_mode in results:
+            for username, won in game_result_stats(player1, player2, winner):
+                for counters, key in ((totals, username), (mode_totals, (username, game_mode)),
+                                      (mode_totals, (username, ALL_MODES))):
+                    played_won = counters.setdefault(key, [0, 0])
+                    played_won[0] += 1
+                    played_won[1] += won
+        
+        with self._db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO game_history (player1, player2, word, winner, game_mode) VALUES (?, ?, ?, ?, ?)",
+                results
+            )
+            conn.executemany(
+                "UPDATE users SET games_played = games_played + ?, games_won = games_won + ? WHERE username = ?",
+                [(played, won, username) for username, (played, won) in totals.items()]
+            )
+            conn.executemany(
+                """
+                INSERT INTO leaderboard (username, game_mode, games_played, games_won, win_rate)
+                SELECT :username, :game_mode, :played, :won, CAST(:won AS REAL) / :played
+                WHERE EXISTS (SELECT 1 FROM users WHERE username = :username)
+                ON CONFLICT (username, game_mode) DO UPDATE SET
+                    games_played = games_played + excluded.games_played,
+                    games_won = games_won + excluded.games_won,
+                    win_rate = CAST(games_won + excluded.games_won AS REAL) / (games_played + excluded.games_played)
+                """,
+                [{'username': username, 'game_mode': game_mode, 'played': played, 'won': won}
+                 for (username, game_mode), (played, won) in mode_totals.items()]
+            )
+    
+    @profiled
+    def record_game_result(self, player1: str, player2: str, word: str, winner: str, game_mode: str):
+        self._writes.put((player1, player2, word, winner, game_mode))
+    
+    @profiled
+    def flush_writes(self):
+        self._writes.flush()
+    
+    def get_write_queue_stats(self) -> dict:
+        return self._writes.stats()
+    
+    @profiled
+    def count_game_history(self, username: str = None) -> int:
+        if username:
+            return self._db.execute(_HISTORY_COUNT_SQL, {'username': username}).fetchone()[0]
+        return self._db.execute("SELECT COUNT(*) FROM game_history").fetchone()[0]
+    
+    def iter_game_history(self, username: str = None, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Tuple]]:
+        if username:
+            cursor = self._db.execute(_HISTORY_EXPORT_SQL, {'username': username, 'after': 0})
+        else:
+            cursor = self._db.execute("SELECT id, player1, player2, word, winner, game_mode FROM game_history ORDER BY id")
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+    
+    @profiled
+    def get_user_history(self, username: str, before_id: int = None, limit: int = HISTORY_PAGE_SIZE) -> List[Tuple]:
+        params = {'username': username, 'after': before_id if before_id is not None else sys.maxsize, 'limit': limit}
+        return self._db.execute(_HISTORY_PAGE_SQL, params).fetchall()
+    
+    @profiled
+    def get_leaderboard(self, game_mode: str = ALL_MODES, order_by: str = 'wins', limit: int = 10,
+                        min_games: int = LEADERBOARD_MIN_GAMES) -> List[Tuple]:
+        params = {'game_mode': game_mode, 'min_games': min_games, 'limit': limit}
+        return self._db.execute(_LEADERBOARD_SQL[order_by], params).fetchall()
+    
+    @profiled
+    def rebuild_leaderboard(self):
+        players = """
+            SELECT player1 AS username, game_mode, winner IS player1 AS won FROM game_history
+            UNION ALL
+            SELECT player2, game_mode, winner IS player2 FROM game_history WHERE player2 IS NOT NULL
+        """
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM leaderboard")
+            for mode_column in ("game_mode", f"'{ALL_MODES}'"):
+                conn.execute(f"""
+                    INSERT INTO leaderboard (username, game_mode, games_played, games_won, win_rate)
+                    SELECT username, {mode_column}, COUNT(*), SUM(won), CAST(SUM(won) AS REAL) / COUNT(*)
+                    FROM ({players})
+                    WHERE username IN (SELECT username FROM users)
+                    GROUP BY username, {mode_column}
+                """)
+    
+    def explain_query_plan(self, sql: str, params=()) -> List[str]:
+        return [row[3] for row in self._db.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    
+    def check_query_plans(self) -> List[str]:
+        queries = {
+            'get_user_history': (_HISTORY_PAGE_SQL, {'username': '', 'after': 0, 'limit': 1}),
+            'iter_game_history': (_HISTORY_EXPORT_SQL, {'username': '', 'after': 0}),
+            'count_game_history': (_HISTORY_COUNT_SQL, {'username': ''}),
+        }
+        for order_by, sql in _LEADERBOARD_SQL.items():
+            queries[f'get_leaderboard({order_by})'] = (sql, {'game_mode': ALL_MODES, 'min_games': 0, 'limit': 1})
         
-        cursor.execute("SELECT COUNT(*) FROM words")
-        if cursor.fetchone()[0] == 0:
-            words_data = [
-                ("SŁOŃ", "Zwierzęta", "Największe zwierzę lądowe"),
-                ("ŻYRAFA", "Zwierzęta", "Najwyższe zwierzę na świecie"),
-                ("PINGWIN", "Zwierzęta", "Ptak który nie lata ale pływa"),
-                ("POLSKA", "Kraje", "Nasz kraj"),
-                ("FRANCJA", "Kraje", "Kraj wieży Eiffla"),
-                ("CHINY", "Kraje", "Produkuje wszystko "),
-                ("PIZZA", "Jedzenie", "Włoska potrawa z ciastem"),
-                ("SUSHI", "Jedzenie", "Japońska potrawa z ryżem"),
-                ("PIEROGI", "Jedzenie", "Tradycyjne polskie danie"),
-                ("PIŁKA", "Sport", "Podstawowy sprzęt w wielu sportach"),
-                ("TENIS", "Sport", "Gra z rakietą"),
-                ("KOMPUTER", "Nauka", "Urządzenie elektroniczne"),
-                ("INTERNET", "Nauka", "Globalna sieć"),
-                ("ATOM", "Nauka", "Podstawowa jednostka materii")
-            ]
-            cursor.executemany("INSERT INTO words (word, category, hint) VALUES (?, ?, ?)", words_data)
-        
-        conn.commit()
+        problems = []
+        for name, (sql, params) in queries.items():
+            for step in self.explain_query_plan(sql, params):
+                if (step.startswith('SCAN ') and 'CONSTANT ROW' not in step) or 'TEMP B-TREE' in step:
+                    problems.append(f"{name}: {step}")
+        return problems
+
+
+_default = Database()
+
+def set_database_path(path: str):
+    global _default
+    _default.close()
+    _default = Database(path)
+
+def transaction():
+    return _default.transaction()
+
+def close_connections():
+    _default.close()
+
+def init_database():
+    _default.init_database()
+
+def import_words(rows: Iterable[Tuple[str, str, Optional[str]]], batch_size: int = IMPORT_BATCH_SIZE,
+                 progress: Callable[[int], None] = None) -> int:
+    return _default.import_words(rows, batch_size, progress)
+
+def import_word_file(path: str, fmt: str = None, category: str = None, batch_size: int = IMPORT_BATCH_SIZE,
+                     progress: Callable[[int], None] = None) -> int:
+    return _default.import_word_file(path, fmt, category, batch_size, progress)
 
 def create_user(username: str, password: str) -> bool:
-    try:
-        password_hash_result = hash_password(password)
-        with sqlite3.connect(DATABASE_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, password_hash_result))
-            conn.commit()
-            return True
-    except sqlite3.IntegrityError:
-        return False
+    return _default.create_user(username, password)
 
 def authenticate_user(username: str, password: str) -> bool:
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT password_hash FROM users WHERE username = ?", (username,))
-        row = cursor.fetchone()
-        return row and verify_password(password, row[0])
+    return _default.authenticate_user(username, password)
 
-def get_user_stats(username: str) -> Tuple[int, int]:
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT games_played, games_won FROM users WHERE username = ?", (username,))
-        row = cursor.fetchone()
-        return row if row else (0, 0)
+def create_user_async(username: str, password: str):
+    return _default.create_user_async(username, password)
+
+def authenticate_user_async(username: str, password: str):
+    return _default.authenticate_user_async(username, password)
+
+def create_session(username: str, ttl: float = SESSION_TTL) -> str:
+    return _default.create_session(username, ttl)
+
+def authenticate_session(token: str) -> Optional[str]:
+    return _default.authenticate_session(token)
+
+def authenticate_session_async(token: str):
+    return _default.authenticate_session_async(token)
 
-def update_user_stats(username: str, won: bool):
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE users SET games_played = games_played + 1, games_won = games_won + ? WHERE username = ?",
-            (1 if won else 0, username)
-        )
-        conn.commit()
+def revoke_session(token: str):
+    _default.revoke_session(token)
+
+def cleanup_expired_sessions() -> int:
+    return _default.cleanup_expired_sessions()
+
+def get_user_stats(username: str) -> Tuple[int, int]:
+    return _default.get_user_stats(username)
 
 def get_categories() -> List[str]:
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT category FROM words ORDER BY category")
-        return [row[0] for row in cursor.fetchall()]
-
-def get_random_word(category: str = None) -> Optional[Tuple[str, str]]:
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
-        if category:
-            cursor.execute("SELECT word, hint FROM words WHERE category = ?", (category,))
-        else:
-            cursor.execute("SELECT word, hint FROM words")
-        rows = cursor.fetchall()
-        if rows:
-            return random.choice(rows)
-        return None
+    return _default.get_categories()
+
+def get_random_word(category: str = None, username: str = None, difficulty: str = None) -> Optional[Tuple[str, str]]:
+    return _default.get_random_word(category, username, difficulty)
+
+def get_words(category: str = None) -> List[str]:
+    return _default.get_words(category)
+
+def prefetch_word(category: str = None, username: str = None, difficulty: str = None):
+    return _default.prefetch_word(category, username, difficulty)
+
+def preload_words(category: str = None, difficulty: str = None):
+    return _default.preload_words(category, difficulty)
+
+def word_generation() -> int:
+    return _default.word_generation()
+
+def recompute_difficulty() -> int:
+    return _default.recompute_difficulty()
+
+def warm_up():
+    return _default.warm_up()
 
 def save_game_result(player1: str, player2: str, word: str, winner: str, game_mode: str):
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO game_history (player1, player2, word, winner, game_mode) VALUES (?, ?, ?, ?, ?)",
-            (player1, player2, word, winner, game_mode)
-        )
-        conn.commit()
-
-def get_user_history(username: str) -> List[Tuple]:
-    with sqlite3.connect(DATABASE_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT word, game_mode, winner FROM game_history WHERE player1 = ? OR player2 = ? ORDER BY id DESC LIMIT 10",
-            (username, username)
-        )
-        return cursor.fetchall()
-
-init_database() 
\ No newline at end of file
+    _default.save_game_result(player1, player2, word, winner, game_mode)
+
+def record_game_result(player1: str, player2: str, word: str, winner: str, game_mode: str):
+    _default.record_game_result(player1, player2, word, winner, game_mode)
+
+def flush_writes():
+    _default.flush_writes()
+
+def get_write_queue_stats() -> dict:
+    return _default.get_write_queue_stats()
+
+def count_game_history(username: str = None) -> int:
+    return _default.count_game_history(username)
+
+def iter_game_history(username: str = None, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Tuple]]:
+    return _default.iter_game_history(username, chunk_size)
+
+def get_user_history(username: str, before_id: int = None, limit: int = HISTORY_PAGE_SIZE) -> List[Tuple]:
+    return _default.get_user_history(username, before_id, limit)
+
+def get_leaderboard(game_mode: str = ALL_MODES, order_by: str = 'wins', limit: int = 10,
+                    min_games: int = LEADERBOARD_MIN_GAMES) -> List[Tuple]:
+    return _default.get_leaderboard(game_mode, order_by, limit, min_games)
+
+def rebuild_leaderboard():
+    _default.rebuild_leaderboard()
+
+def explain_query_plan(sql: str, params=()) -> List[str]:
+    return _default.explain_query_plan(sql, params)
+
+def check_query_plans() -> List[str]:
+    return _default.check_query_plans()
\ No newline at end of file
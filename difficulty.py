@@ -0,0 +1,85 @@
+import argparse
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from config import DIFFICULTY_WEIGHTS, DIFFICULTY_HISTORY_PRIOR
+from hangman_engine import ALPHABET
+
+def _letter_table() -> np.ndarray:
+    table = np.full(max(map(ord, ALPHABET)) + 1, -1, dtype=np.int16)
+    for index, letter in enumerate(ALPHABET):
+        table[ord(letter)] = index
+    return table
+
+_LETTER_TABLE = _letter_table()
+
+def rank(values: np.ndarray) -> np.ndarray:
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    starts = np.cumsum(counts) - counts
+    return ((starts + counts / 2) / len(values))[inverse]
+
+def word_features(words: List[str]) -> Dict[str, np.ndarray]:
+    count = len(words)
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=count)
+    codepoints = np.frombuffer(''.join(words).encode('utf-32-le'), dtype=np.uint32)
+    owners = np.repeat(np.arange(count), lengths)
+    
+    letters = np.full(len(codepoints), -1, dtype=np.int16)
+    known = codepoints < len(_LETTER_TABLE)
+    letters[known] = _LETTER_TABLE[codepoints[known]]
+    valid = letters >= 0
+    owners, letters = owners[valid], letters[valid]
+    
+    frequency = np.bincount(letters, minlength=len(ALPHABET)).astype(np.float64)
+    frequency /= max(frequency.sum(), 1)
+    surprise = -np.log(np.maximum(frequency, 1e-12))
+    
+    present = np.zeros((count, len(ALPHABET)), dtype=bool)
+    present[owners, letters] = True
+    rows, columns = np.nonzero(present)
+    distinct = np.bincount(rows, minlength=count)
+    rarity = np.bincount(rows, weights=surprise[columns], minlength=count) / np.maximum(distinct, 1)
+    
+    return {
+        'length': np.bincount(owners, minlength=count),
+        'distinct': distinct,
+        'rarity': rarity,
+    }
+
+def difficulty_scores(words: List[str], games: np.ndarray = None, losses: np.ndarray = None,
+                      weights: Dict[str, float] = None, prior: float = DIFFICULTY_HISTORY_PRIOR) -> np.ndarray:
+    if not words:
+        return np.zeros(0)
+    weights = weights or DIFFICULTY_WEIGHTS
+    features = word_features(words)
+    
+    score = (weights['rarity'] * rank(features['rarity'])
+             + weights['distinct'] * rank(features['distinct'])
+             + weights['length'] * rank(features['length']))
+    score = rank(score)
+    
+    if games is not None and games.any():
+        trust = games / (games + prior)
+        loss_rate = np.divide(losses, games, out=np.zeros(len(words)), where=games > 0)
+        score = (1 - trust) * score + trust * loss_rate
+    return rank(score)
+
+def main():
+    parser = argparse.ArgumentParser(description="Przelicz poziomy trudności wszystkich słów")
+    parser.add_argument('--db', help="ścieżka do bazy danych (domyślnie DATABASE_PATH)")
+    args = parser.parse_args()
+    
+    import database
+    if args.db:
+        database.set_database_path(args.db)
+    
+    start = time.perf_counter()
+    updated = database.recompute_difficulty()
+    database.close_connections()
+    print(f"Zaktualizowano trudność {updated} słów w {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
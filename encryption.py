@@ -1,12 +1,61 @@
 import bcrypt
+import hashlib
+import hmac
+import os
+import secrets
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Tuple
+from config import BCRYPT_ROUNDS, AUTH_WORKERS, SESSION_KEY_PATH
 
-def hash_password(password: str) -> str:
+_executor = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="auth")
+_session_key = None
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
     password_bytes = password.encode('utf-8')
     hashed_bytes = hashed.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes) 
\ No newline at end of file
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+def get_rounds(hashed: str) -> int:
+    return int(hashed.split('$')[2])
+
+def needs_rehash(hashed: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    return get_rounds(hashed) < rounds
+
+def submit_auth(func, *args) -> Future:
+    return _executor.submit(func, *args)
+
+
+def get_session_key() -> bytes:
+    global _session_key
+    if _session_key is None:
+        try:
+            with open(SESSION_KEY_PATH, 'rb') as file:
+                _session_key = file.read()
+        except FileNotFoundError:
+            _session_key = secrets.token_bytes(32)
+            os.makedirs(os.path.dirname(SESSION_KEY_PATH), mode=0o700, exist_ok=True)
+            fd = os.open(SESSION_KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as file:
+                file.write(_session_key)
+    return _session_key
+
+def hash_session_verifier(verifier: str) -> str:
+    return hmac.new(get_session_key(), verifier.encode('utf-8'), hashlib.sha256).hexdigest()
+
+def generate_session_token() -> Tuple[str, str, str]:
+    selector = secrets.token_hex(8)
+    verifier = secrets.token_urlsafe(32)
+    return f"{selector}.{verifier}", selector, hash_session_verifier(verifier)
+
+def split_session_token(token: str) -> Tuple[str, str]:
+    selector, _, verifier = token.partition('.')
+    return selector, verifier
+
+def verify_session_verifier(verifier: str, verifier_hash: str) -> bool:
+    return hmac.compare_digest(hash_session_verifier(verifier), verifier_hash)
@@ -0,0 +1,355 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import EVENT_LOG_ENABLED, EVENT_LOG_DIR, EVENT_LOG_SEGMENT_SIZE
+from hangman_engine import ALPHABET, HangmanEngine
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+EVENT = struct.Struct('<QIIIBBBx')
+GAME_HEADER = struct.Struct('<QII')
+LETTER_INDEX = {letter: i for i, letter in enumerate(ALPHABET)}
+HINT_LETTER = 0xFF
+HIT = 1
+HINT_USED = 2
+GAME_OVER = 4
+
+_EVENTS_PREFIX = 'events-'
+_GAMES_PREFIX = 'games-'
+_SEGMENT_SUFFIX = '.bin'
+_LOCK_NAME = '.lock'
+
+
+def word_hash(word: str) -> int:
+    return zlib.crc32(word.encode('utf-8'))
+
+
+def events_path(directory: str, number: int) -> str:
+    return os.path.join(directory, f"{_EVENTS_PREFIX}{number:06d}{_SEGMENT_SUFFIX}")
+
+
+def games_path(directory: str, number: int) -> str:
+    return os.path.join(directory, f"{_GAMES_PREFIX}{number:06d}{_SEGMENT_SUFFIX}")
+
+
+def segment_numbers(directory: str = EVENT_LOG_DIR) -> List[int]:
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(
+        int(name[len(_EVENTS_PREFIX):-len(_SEGMENT_SUFFIX)]) for name in names
+        if name.startswith(_EVENTS_PREFIX) and name.endswith(_SEGMENT_SUFFIX)
+    )
+
+
+def new_game_id() -> int:
+    return uuid.uuid4().int >> 64
+
+
+class EventLog:
+
+    def __init__(self, directory: str = EVENT_LOG_DIR, segment_size: int = EVENT_LOG_SEGMENT_SIZE,
+                 enabled: bool = EVENT_LOG_ENABLED):
+        self.directory = directory
+        self.segment_size = max(EVENT.size, segment_size - segment_size % EVENT.size)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._lock_file = None
+        self._events = None
+        self._games = None
+        self._segment = 0
+    
+    def _open(self, number: int):
+        self._events = open(events_path(self.directory, number), 'ab', buffering=0)
+        size = os.fstat(self._events.fileno()).st_size
+        if size % EVENT.size:
+            self._events.truncate(size - size % EVENT.size)
+        self._games = open(games_path(self.directory, number), 'ab', buffering=0)
+        self._segment = number
+    
+    @contextmanager
+    def _locked_segment(self):
+        with self._lock:
+            if self._lock_file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._lock_file = open(os.path.join(self.directory, _LOCK_NAME), 'ab')
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                if self._events is None:
+                    numbers = segment_numbers(self.directory)
+                    self._open(numbers[-1] if numbers else 1)
+                if os.fstat(self._events.fileno()).st_size + EVENT.size > self.segment_size:
+                    number = max(segment_numbers(self.directory)[-1], self._segment + 1)
+                    self._close_files()
+                    self._open(number)
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+    
+    def _close_files(self):
+        if self._events is not None:
+            self._events.close()
+            self._games.close()
+            self._events = self._games = None
+    
+    def recorder(self, game: HangmanEngine) -> Optional["GameRecorder"]:
+        return GameRecorder(self, game) if self.enabled else None
+    
+    def start_game(self, hash_value: int, snapshot: bytes) -> int:
+        game_id = new_game_id()
+        with self._locked_segment():
+            self._games.write(GAME_HEADER.pack(game_id, hash_value, len(snapshot)) + snapshot)
+        return game_id
+    
+    def append(self, game_id: int, hash_value: int, offset_ms: int, think_ms: int, turn: int, letter: int,
+               flags: int):
+        record = EVENT.pack(game_id, hash_value, offset_ms, think_ms, turn, letter, flags)
+        with self._locked_segment():
+            self._events.write(record)
+    
+    def close(self):
+        with self._lock:
+            self._close_files()
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+    
+    def set_directory(self, directory: str):
+        self.close()
+        with self._lock:
+            self.directory = directory
+
+
+class GameRecorder:
+    __slots__ = ('log', 'game_id', 'word_hash', 'started', 'last', 'turn')
+    
+    def __init__(self, log: EventLog, game: HangmanEngine):
+        self.log = log
+        self.word_hash = word_hash(game.word)
+        self.game_id = log.start_game(self.word_hash, game.snapshot())
+        self.started = self.last = time.monotonic()
+        self.turn = 0
+    
+    def _append(self, letter: int, flags: int):
+        now = time.monotonic()
+        self.log.append(self.game_id, self.word_hash, int((now - self.started) * 1000),
+                        int((now - self.last) * 1000), self.turn, letter, flags)
+        self.last = now
+    
+    def guess(self, game: HangmanEngine, letter: str, hit: bool):
+        self.turn = min(self.turn + 1, 255)
+        flags = (HIT if hit else 0) | (HINT_USED if game.hint_used else 0) | (GAME_OVER if game.game_over else 0)
+        self._append(LETTER_INDEX[letter], flags)
+    
+    def hint(self):
+        self._append(HINT_LETTER, HINT_USED)
+
+
+event_log = EventLog()
+
+
+def _event_dtype():
+    import numpy as np
+    return np.dtype({
+        'names': ['game_id', 'word_hash', 'offset_ms', 'think_ms', 'turn', 'letter', 'flags'],
+        'formats': ['<u8', '<u4', '<u4', '<u4', 'u1', 'u1', 'u1'],
+        'offsets': [0, 8, 12, 16, 20, 21, 22],
+        'itemsize': EVENT.size,
+    })
+
+
+def open_segments(directory: str = EVENT_LOG_DIR):
+    import numpy as np
+    dtype = _event_dtype()
+    for number in segment_numbers(directory):
+        path = events_path(directory, number)
+        count = os.path.getsize(path) // EVENT.size
+        if count:
+            yield np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+
+def read_games(directory: str = EVENT_LOG_DIR) -> Iterator[Tuple[int, int, bytes]]:
+    for number in segment_numbers(directory):
+        try:
+            file = open(games_path(directory, number), 'rb')
+        except FileNotFoundError:
+            continue
+        with file:
+            if not os.fstat(file.fileno()).st_size:
+                continue
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                offset = 0
+                while offset + GAME_HEADER.size <= len(data):
+                    game_id, hash_value, length = GAME_HEADER.unpack_from(data, offset)
+                    offset += GAME_HEADER.size
+                    if offset + length > len(data):
+                        break
+                    yield game_id, hash_value, data[offset:offset + length]
+                    offset += length
+
+
+def summary(directory: str = EVENT_LOG_DIR) -> Dict[str, float]:
+    import numpy as np
+    totals = {'events': 0, 'games': 0, 'guesses': 0, 'hits': 0, 'hints': 0, 'think_ms': 0}
+    for events in open_segments(directory):
+        guess = events['letter'] != HINT_LETTER
+        totals['events'] += len(events)
+        totals['games'] += int(np.count_nonzero(guess & (events['turn'] == 1)))
+        totals['guesses'] += int(np.count_nonzero(guess))
+        totals['hits'] += int(np.count_nonzero(guess & ((events['flags'] & HIT) != 0)))
+        totals['hints'] += int(np.count_nonzero(~guess))
+        totals['think_ms'] += int(events['think_ms'].sum(where=guess, dtype=np.uint64))
+    
+    guesses = totals['guesses']
+    totals['hit_rate'] = totals['hits'] / guesses if guesses else 0.0
+    totals['avg_think_ms'] = totals.pop('think_ms') / guesses if guesses else 0.0
+    return totals
+
+
+def _reduce(keys: list, *values: list):
+    import numpy as np
+    keys = np.concatenate(keys)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return (unique,) + tuple(np.bincount(inverse, weights=np.concatenate(value), minlength=len(unique))
+                             for value in values)
+
+
+def hardest_letters(directory: str = EVENT_LOG_DIR, top: int = 10) -> List[Tuple[str, int, List[Tuple[str, float]]]]:
+    import numpy as np
+    letter_keys, turn_sums, hit_counts = [], [], []
+    word_keys, game_counts = [], []
+    for events in open_segments(directory):
+        hits = events[(events['flags'] & HIT) != 0]
+        keys = (hits['word_hash'].astype(np.uint64) << np.uint64(8)) | hits['letter']
+        unique, inverse = np.unique(keys, return_inverse=True)
+        letter_keys.append(unique)
+        turn_sums.append(np.bincount(inverse, weights=hits['turn'], minlength=len(unique)))
+        hit_counts.append(np.bincount(inverse, minlength=len(unique)))
+        
+        first = (events['turn'] == 1) & (events['letter'] != HINT_LETTER)
+        unique, counts = np.unique(events['word_hash'][first], return_counts=True)
+        word_keys.append(unique)
+        game_counts.append(counts)
+    if not letter_keys:
+        return []
+    
+    words, games = _reduce(word_keys, game_counts)
+    order = np.argsort(-games, kind='stable')[:top]
+    keys, turns, counts = _reduce(letter_keys, turn_sums, hit_counts)
+    
+    names = {}
+    wanted = set(words[order].tolist())
+    for _, hash_value, snapshot in read_games(directory):
+        if hash_value in wanted and hash_value not in names:
+            names[hash_value] = HangmanEngine.restore(snapshot).word
+    
+    results = []
+    for index in order.tolist():
+        hash_value = int(words[index])
+        start, end = np.searchsorted(keys, [hash_value << 8, (hash_value + 1) << 8])
+        letters = sorted(
+            ((ALPHABET[int(key) & 0xFF], turns[i] / counts[i]) for i, key in enumerate(keys[start:end], start)),
+            key=lambda item: -item[1]
+        )
+        results.append((names.get(hash_value, f"#{hash_value:08x}"), int(games[index]), letters))
+    return results
+
+
+def recent_games(directory: str = EVENT_LOG_DIR, limit: int = 10) -> List[Tuple[int, HangmanEngine]]:
+    latest = deque(read_games(directory), maxlen=limit)
+    return [(game_id, HangmanEngine.restore(snapshot)) for game_id, _, snapshot in latest]
+
+
+def load_game(game_id: int, directory: str = EVENT_LOG_DIR):
+    import numpy as np
+    for logged_id, _, snapshot in read_games(directory):
+        if logged_id == game_id:
+            game = HangmanEngine.restore(snapshot)
+            break
+    else:
+        raise ValueError(f"Nie znaleziono gry {game_id}")
+    
+    parts = [events[events['game_id'] == game_id] for events in open_segments(directory)]
+    return game, np.concatenate(parts) if parts else np.zeros(0, dtype=_event_dtype())
+
+
+def replay(game_id: int, directory: str = EVENT_LOG_DIR):
+    game, events = load_game(game_id, directory)
+    yield None, game
+    for event in events:
+        letter = int(event['letter'])
+        if letter == HINT_LETTER:
+            game.use_hint()
+        else:
+            game.guess_letter(ALPHABET[letter])
+        yield event, game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analiza dziennika ruchów graczy")
+    parser.add_argument('--dir', default=EVENT_LOG_DIR, help="katalog z segmentami dziennika")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help="podsumowanie wszystkich ruchów")
+    hardest = commands.add_parser('hardest', help="najtrudniejsze litery najczęściej granych słów")
+    hardest.add_argument('-n', '--top', type=int, default=10)
+    games = commands.add_parser('games', help="ostatnie zapisane gry")
+    games.add_argument('-n', '--limit', type=int, default=10)
+    replay_parser = commands.add_parser('replay', help="odtwórz grę ruch po ruchu")
+    replay_parser.add_argument('game_id', type=int)
+    replay_parser.add_argument('--realtime', action='store_true', help="zachowaj odstępy czasu między ruchami")
+    args = parser.parse_args()
+    
+    if args.command == 'stats':
+        start = time.perf_counter()
+        totals = summary(args.dir)
+        elapsed = time.perf_counter() - start
+        print(f"Zdarzenia: {totals['events']} (przeskanowane w {elapsed:.2f}s)")
+        print(f"Gry: {totals['games']}, ruchy: {totals['guesses']}, podpowiedzi: {totals['hints']}")
+        print(f"Trafienia: {totals['hit_rate'] * 100:.1f}%, średni czas ruchu: {totals['avg_think_ms'] / 1000:.2f}s")
+    elif args.command == 'hardest':
+        for word, count, letters in hardest_letters(args.dir, args.top):
+            ranking = ", ".join(f"{letter} ({turn:.1f})" for letter, turn in letters)
+            print(f"{word:<20} gry {count:>8}  litery od najtrudniejszej: {ranking}")
+    elif args.command == 'games':
+        for game_id, game in recent_games(args.dir, args.limit):
+            players = game.player1 + (f" vs {game.player2}" if game.player2 else "")
+            print(f"{game_id}  {players:<30} {game.game_mode:<8} {game.word}")
+    else:
+        try:
+            for event, game in replay(args.game_id, args.dir):
+                if event is None:
+                    print(f"{game.player1}{f' vs {game.player2}' if game.player2 else ''}: {game.display_word}")
+                    continue
+                if args.realtime:
+                    time.sleep(int(event['think_ms']) / 1000)
+                if event['letter'] == HINT_LETTER:
+                    move = "podpowiedź"
+                else:
+                    move = f"{ALPHABET[event['letter']]} {'trafienie' if event['flags'] & HIT else 'pudło'}"
+                print(f"{event['turn']:>3}. {move:<14} {game.display_word:<24} błędy {game.mistakes}/{game.max_mistakes}"
+                      f"  +{int(event['think_ms']) / 1000:.1f}s")
+            if game.game_over:
+                print(f"Wygrywa: {game.winner}" if game.winner else f"Przegrana, słowo: {game.word}")
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+import argparse
+import csv
+import gzip
+import json
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional
+from config import EXPORT_CHUNK_SIZE
+from storage import Storage, default_storage
+
+EXPORT_FORMATS = ('csv', 'csv.gz', 'jsonl', 'jsonl.gz')
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+
+def default_filename(username: Optional[str], fmt: str) -> str:
+    owner = username or "wszyscy"
+    return f"stats_{owner}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+
+def _open_output(path: str, fmt: str):
+    if fmt.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+def _write_csv_header(writer, username: Optional[str], storage: Storage):
+    if not username:
+        writer.writerow(['Id', 'Gracz 1', 'Gracz 2', 'Słowo', 'Zwycięzca', 'Tryb gry'])
+        return
+    
+    games_played, games_won = storage.get_user_stats(username)
+    win_rate = (games_won / games_played * 100) if games_played > 0 else 0
+    writer.writerow(['Użytkownik', 'Rozegrane gry', 'Wygrane gry', 'Współczynnik wygranych'])
+    writer.writerow([username, games_played, games_won, f"{win_rate:.1f}%"])
+    writer.writerow([])
+    writer.writerow(['Słowo', 'Tryb gry', 'Wynik'])
+
+def export_history(path: str, username: str = None, fmt: str = 'csv',
+                   progress: Callable[[int, int], None] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                   storage: Storage = None) -> int:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Nieobsługiwany format eksportu: {fmt}")
+    
+    storage = storage or default_storage
+    storage.flush()
+    total = storage.count_game_history(username)
+    exported = 0
+    if progress:
+        progress(exported, total)
+    
+    with _open_output(path, fmt) as file:
+        writer = None
+        if fmt.startswith('csv'):
+            writer = csv.writer(file)
+            _write_csv_header(writer, username, storage)
+        
+        for rows in storage.iter_game_history(username, chunk_size):
+            if writer is None:
+                file.write(''.join(
+                    json.dumps({'id': game_id, 'player1': player1, 'player2': player2, 'word': word,
+                                'winner': winner, 'game_mode': game_mode}, ensure_ascii=False) + '\n'
+                    for game_id, player1, player2, word, winner, game_mode in rows
+                ))
+            elif username:
+                writer.writerows(
+                    [word, game_mode, "Wygrana" if winner == username else "Przegrana"]
+                    for _, _, _, word, winner, game_mode in rows
+                )
+            else:
+                writer.writerows(rows)
+            
+            exported += len(rows)
+            if progress:
+                progress(exported, max(total, exported))
+    
+    return exported
+
+def start_export(path: str, username: str = None, fmt: str = 'csv',
+                 progress: Callable[[int, int], None] = None, storage: Storage = None) -> Future:
+    return _executor.submit(export_history, path, username, fmt, progress, EXPORT_CHUNK_SIZE, storage)
+
+def main():
+    parser = argparse.ArgumentParser(description="Eksport historii gier w wisielca")
+    parser.add_argument('-u', '--user', help="eksportuj tylko gry tego użytkownika (domyślnie wszystkie)")
+    parser.add_argument('-f', '--format', choices=EXPORT_FORMATS, default='csv.gz')
+    parser.add_argument('-o', '--output', help="plik wynikowy (domyślnie stats_<użytkownik>_<data>.<format>)")
+    args = parser.parse_args()
+    
+    path = args.output or default_filename(args.user, args.format)
+    start = time.perf_counter()
+    
+    def progress(rows, total):
+        print(f"\rWyeksportowano {rows}/{total} gier", end='', file=sys.stderr, flush=True)
+    
+    exported = export_history(path, args.user, args.format, progress)
+    print(f"\nZapisano {exported} gier do {path} w {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
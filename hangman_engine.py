@@ -0,0 +1,225 @@
+import struct
+import sys
+import time
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Tuple
+
+ALPHABET = "AĄBCĆDEĘFGHIJKLŁMNŃOÓPQRSŚTUVWXYZŹŻ"
+LETTER_BITS = {letter: 1 << i for i, letter in enumerate(ALPHABET)}
+
+SNAPSHOT_MAGIC = b'HGS1'
+_SNAPSHOT_HEADER = struct.Struct('<4sQBBBBBHd')
+_STRING_LENGTH = struct.Struct('<H')
+_NO_STRING = 0xFFFF
+_GAME_OVER = 1
+_HINT_USED = 2
+
+@lru_cache(maxsize=8192)
+def letter_positions(word: str) -> Dict[str, Tuple[int, ...]]:
+    positions = {}
+    for i, char in enumerate(word):
+        if char in LETTER_BITS:
+            positions.setdefault(char, []).append(i)
+    return {letter: tuple(indexes) for letter, indexes in positions.items()}
+
+@lru_cache(maxsize=8192)
+def _hidden_word(word: str) -> Tuple[str, int]:
+    hidden = ''.join('_' if char in LETTER_BITS else char for char in word)
+    return hidden, hidden.count('_') - word.count('_')
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+class HangmanEngine:
+    __slots__ = ('player1', 'player2', 'current_player', 'game_mode', 'category', 'word', 'hint',
+                 'letter_positions', 'guessed_mask', 'display_word', 'remaining', 'mistakes', 'max_mistakes',
+                 'game_over', 'winner', 'start_time', 'paused_at', 'hint_used', 'time_limit')
+    
+    def __init__(self, word: str, hint: str, player1: str, player2: str = None, game_mode: str = "classic",
+                 category: str = None):
+        self.player1 = _intern(player1)
+        self.player2 = _intern(player2)
+        self.current_player = self.player1
+        self.game_mode = _intern(game_mode)
+        self.category = _intern(category)
+        
+        self.word = word.upper()
+        self.hint = hint
+        self.letter_positions = letter_positions(self.word)
+        self.guessed_mask = 0
+        self.display_word, self.remaining = _hidden_word(self.word)
+        self.mistakes = 0
+        self.max_mistakes = 6
+        self.game_over = False
+        self.winner = None
+        self.hint_used = False
+        
+        self.paused_at = None
+        if game_mode == "timed":
+            self.time_limit = 120
+            self.start_time = time.monotonic()
+        else:
+            self.time_limit = None
+            self.start_time = None
+    
+    def _reveal(self):
+        hidden = {}
+        remaining = 0
+        for letter, indexes in self.letter_positions.items():
+            if not LETTER_BITS[letter] & self.guessed_mask:
+                hidden[ord(letter)] = '_'
+                remaining += len(indexes)
+        self.display_word = self.word.translate(hidden)
+        self.remaining = remaining
+    
+    @property
+    def guessed_letters(self) -> FrozenSet[str]:
+        return frozenset(letter for letter, bit in LETTER_BITS.items() if self.guessed_mask & bit)
+    
+    def is_guessed(self, letter: str) -> bool:
+        return bool(self.guessed_mask & LETTER_BITS.get(letter, 0))
+    
+    def get_display_word(self) -> str:
+        return self.display_word
+    
+    def guess_letter(self, letter: str) -> bool:
+        letter = letter.upper()
+        bit = LETTER_BITS.get(letter)
+        if bit is None:
+            raise ValueError(f"Nieprawidłowa litera: {letter}")
+        if self.guessed_mask & bit:
+            return False
+        
+        self.guessed_mask |= bit
+        
+        positions = self.letter_positions.get(letter)
+        if positions:
+            display = list(self.display_word)
+            for i in positions:
+                display[i] = letter
+            self.display_word = ''.join(display)
+            self.remaining -= len(positions)
+        else:
+            self.mistakes += 1
+            if self.player2:
+                self.current_player = self.player2 if self.current_player == self.player1 else self.player1
+        
+        if self.mistakes >= self.max_mistakes:
+            self.game_over = True
+            self.winner = self.current_player if self.player2 else None
+        elif self.is_word_guessed():
+            self.game_over = True
+            self.winner = self.current_player
+        
+        return positions is not None
+    
+    def is_word_guessed(self) -> bool:
+        return self.remaining == 0
+    
+    def get_elapsed(self) -> float:
+        if self.start_time is None:
+            return 0.0
+        return (self.paused_at if self.paused_at is not None else time.monotonic()) - self.start_time
+    
+    def get_time_left(self) -> Optional[float]:
+        if not self.time_limit:
+            return None
+        return max(0.0, self.time_limit - self.get_elapsed())
+    
+    def get_time_remaining(self) -> Optional[int]:
+        time_left = self.get_time_left()
+        return None if time_left is None else int(time_left)
+    
+    def get_ms_to_next_second(self) -> Optional[int]:
+        if not self.time_limit or self.game_over or self.paused_at is not None:
+            return None
+        remaining = self.get_time_left()
+        return int((remaining - int(remaining)) * 1000) + 1
+    
+    def is_time_up(self) -> bool:
+        return bool(self.time_limit) and self.get_time_left() == 0
+    
+    def time_out(self) -> bool:
+        if self.game_over or not self.time_limit:
+            return False
+        self.game_over = True
+        self.winner = None
+        self.paused_at = None
+        return True
+    
+    def pause(self):
+        if self.time_limit and self.paused_at is None and not self.game_over:
+            self.paused_at = time.monotonic()
+    
+    def resume(self):
+        if self.paused_at is not None:
+            self.start_time += time.monotonic() - self.paused_at
+            self.paused_at = None
+    
+    def use_hint(self) -> str:
+        if not self.hint_used:
+            self.hint_used = True
+            return self.hint
+        return None
+    
+    def snapshot(self) -> bytes:
+        players = (self.player1, self.player2)
+        flags = (_GAME_OVER if self.game_over else 0) | (_HINT_USED if self.hint_used else 0)
+        winner = players.index(self.winner) + 1 if self.winner is not None else 0
+        elapsed = self.get_elapsed()
+        parts = [_SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, self.guessed_mask, self.mistakes, self.max_mistakes, flags,
+            players.index(self.current_player), winner, self.time_limit or 0, elapsed
+        )]
+        for value in (self.word, self.hint, self.player1, self.player2, self.game_mode, self.category):
+            if value is None:
+                parts.append(_STRING_LENGTH.pack(_NO_STRING))
+            else:
+                encoded = value.encode('utf-8')
+                parts.append(_STRING_LENGTH.pack(len(encoded)))
+                parts.append(encoded)
+        return b''.join(parts)
+    
+    @classmethod
+    def restore(cls, data: bytes) -> "HangmanEngine":
+        try:
+            magic, mask, mistakes, max_mistakes, flags, current, winner, time_limit, elapsed = \
+                _SNAPSHOT_HEADER.unpack_from(data)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError("Nieznany format zapisu gry")
+            
+            offset = _SNAPSHOT_HEADER.size
+            strings = []
+            for _ in range(6):
+                length, = _STRING_LENGTH.unpack_from(data, offset)
+                offset += _STRING_LENGTH.size
+                if length == _NO_STRING:
+                    strings.append(None)
+                else:
+                    strings.append(data[offset:offset + length].decode('utf-8'))
+                    offset += length
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ValueError("Uszkodzony zapis gry") from e
+        
+        word, hint, player1, player2, game_mode, category = strings
+        game = cls.__new__(cls)
+        game.player1 = _intern(player1)
+        game.player2 = _intern(player2)
+        players = (game.player1, game.player2)
+        game.current_player = players[current]
+        game.game_mode = _intern(game_mode)
+        game.category = _intern(category)
+        game.word = word
+        game.hint = hint
+        game.letter_positions = letter_positions(word)
+        game.guessed_mask = mask
+        game._reveal()
+        game.mistakes = mistakes
+        game.max_mistakes = max_mistakes
+        game.game_over = bool(flags & _GAME_OVER)
+        game.winner = players[winner - 1] if winner else None
+        game.hint_used = bool(flags & _HINT_USED)
+        game.time_limit = time_limit or None
+        game.start_time = time.monotonic() - elapsed if game.time_limit else None
+        game.paused_at = None
+        return game
\ No newline at end of file
@@ -0,0 +1,32 @@
+import argparse
+import sys
+import time
+from database import import_word_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import listy słów do bazy gry w wisielca")
+    parser.add_argument('path', help="plik CSV (word,category,hint), JSONL lub tekstowy (jedno słowo w linii), opcjonalnie .gz")
+    parser.add_argument('-f', '--format', choices=['csv', 'jsonl', 'txt'], help="format pliku (domyślnie na podstawie rozszerzenia)")
+    parser.add_argument('-c', '--category', help="kategoria dla wierszy bez kategorii")
+    parser.add_argument('-b', '--batch-size', type=int, default=None)
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    
+    def progress(rows):
+        elapsed = time.perf_counter() - start
+        print(f"\rWczytano {rows} słów ({rows / elapsed:,.0f}/s)", end='', file=sys.stderr, flush=True)
+    
+    kwargs = {'batch_size': args.batch_size} if args.batch_size else {}
+    try:
+        imported = import_word_file(args.path, args.format, args.category, progress=progress, **kwargs)
+    except ValueError as e:
+        print(f"\n{e}", file=sys.stderr)
+        sys.exit(1)
+    
+    print(f"\nZaimportowano {imported} nowych słów w {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
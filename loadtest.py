@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from config import SERVER_HOST, SERVER_PORT, SERVER_MAX_LINE
+from protocol import encode_message, decode_message
+from simulator import LETTER_FREQUENCY
+
+
+class LoadStats:
+
+    def __init__(self):
+        self.connected = 0
+        self.games = 0
+        self.guesses = 0
+        self.errors = 0
+        self.latencies = []
+        self.elapsed = 0.0
+    
+    def percentile(self, value: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * value))]
+
+
+async def run_bot(index: int, host: str, port: int, mode: str, deadline: float, ramp: float, think: float,
+                  stats: LoadStats):
+    await asyncio.sleep(ramp * index)
+    reader, writer = await asyncio.open_connection(host, port, limit=SERVER_MAX_LINE)
+    name = f"bot{index}"
+    stats.connected += 1
+    
+    async def receive() -> dict:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Serwer zamknął połączenie")
+        return decode_message(line)
+    
+    try:
+        writer.write(encode_message({'type': 'hello', 'username': name}))
+        await receive()
+        
+        while time.perf_counter() < deadline:
+            writer.write(encode_message({'type': 'play', 'mode': mode}))
+            guessed = set()
+            sent = None
+            while True:
+                message = await receive()
+                kind = message['type']
+                if kind == 'over':
+                    stats.games += 1
+                    break
+                if kind == 'error':
+                    stats.errors += 1
+                    continue
+                if kind == 'state':
+                    guessed.add(message['letter'])
+                    if message['by'] == name and sent is not None:
+                        stats.latencies.append(time.perf_counter() - sent)
+                        stats.guesses += 1
+                        sent = None
+                    if message['game_over']:
+                        continue
+                elif kind != 'start':
+                    continue
+                
+                if message['turn'] == name:
+                    if think:
+                        await asyncio.sleep(think)
+                    letter = next(letter for letter in LETTER_FREQUENCY if letter not in guessed)
+                    sent = time.perf_counter()
+                    writer.write(encode_message({'type': 'guess', 'letter': letter}))
+    finally:
+        writer.close()
+
+
+async def load_test(host: str, port: int, clients: int, duration: float, mode: str, ramp: float,
+                    think: float) -> LoadStats:
+    stats = LoadStats()
+    start = time.perf_counter()
+    deadline = start + ramp + duration
+    tasks = [
+        asyncio.create_task(run_bot(i, host, port, mode, deadline, ramp / clients, think, stats))
+        for i in range(clients)
+    ]
+    done, pending = await asyncio.wait(tasks, timeout=ramp + duration + 10)
+    for task in pending:
+        task.cancel()
+    for task in done:
+        if task.exception():
+            stats.errors += 1
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def spawn_server(port: int, db_path: str) -> subprocess.Popen:
+    root = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(root, 'server.py'), '--port', str(port), '--db', db_path, '--no-auth',
+         '--events', os.path.join(os.path.dirname(db_path), 'events')],
+        stdout=subprocess.PIPE, text=True, env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    )
+    if not process.stdout.readline():
+        raise RuntimeError("Nie udało się uruchomić serwera")
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test obciążeniowy serwera gry sieciowej")
+    parser.add_argument('-c', '--clients', type=int, default=2000, help="liczba symulowanych klientów")
+    parser.add_argument('-d', '--duration', type=float, default=20.0, help="czas trwania w sekundach")
+    parser.add_argument('-m', '--mode', choices=['classic', 'timed'], default='classic')
+    parser.add_argument('--ramp', type=float, default=2.0, help="czas nawiązywania połączeń w sekundach")
+    parser.add_argument('--think', type=float, default=0.5, help="czas namysłu przed ruchem w sekundach")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('-p', '--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--external', action='store_true', help="użyj już działającego serwera")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None if args.external else spawn_server(args.port, os.path.join(tmp, 'loadtest.db'))
+        try:
+            stats = asyncio.run(load_test(args.host, args.port, args.clients, args.duration, args.mode, args.ramp,
+                                        args.think))
+        finally:
+            if server:
+                server.send_signal(signal.SIGINT)
+                server.wait()
+    
+    print(f"Klienci: {stats.connected}/{args.clients}, równoczesne sesje: ~{stats.connected // 2}")
+    print(f"Gry: {stats.games // 2} ({stats.games / 2 / stats.elapsed:,.0f}/s), "
+          f"ruchy: {stats.guesses} ({stats.guesses / stats.elapsed:,.0f}/s), błędy: {stats.errors}")
+    print("Opóźnienie ruchu: " + ", ".join(
+        f"p{int(p * 100)} {stats.percentile(p) * 1000:.1f} ms" for p in (0.5, 0.95, 0.99)
+    ) + f", max {max(stats.latencies, default=0) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
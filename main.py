@@ -1,46 +1,232 @@
+import math
 import pygame
 import sys
+import time
+from typing import List, Tuple
 from config import *
-from screens import LoginScreen, MenuScreen, GameScreen
+from components import ProfilerOverlay
+from screens import LoginScreen, MenuScreen, GameScreen, NetworkGameScreen
+from storage import Storage, default_storage
+from timers import TimerScheduler
+from event_log import event_log
+from profiler import profiler, profiled
 
-class HangmanGameApp:
+class LoopStats:
     def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.reset()
+    
+    def reset(self):
+        self.iterations = 0
+        self.frames = 0
+        self.idle_waits = 0
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+    
+    def cpu_usage(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return (time.process_time() - self.cpu_started) / elapsed * 100 if elapsed > 0 else 0.0
+
+class HangmanGameApp:
+    def __init__(self, dirty_rendering: bool = DIRTY_RECT_RENDERING, adaptive_frame_rate: bool = ADAPTIVE_FRAME_RATE,
+                 storage: Storage = None, display_size: Tuple[int, int] = DISPLAY_SIZE,
+                 resizable: bool = RESIZABLE_WINDOW, smooth_scaling: bool = SMOOTH_SCALING):
+        pygame.display.init()
+        pygame.font.init()
+        self.resizable = resizable
+        self.smooth_scaling = smooth_scaling
+        self.canvas = None
+        self.set_display_size(display_size or (WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Gra w Wisielca")
         self.clock = pygame.time.Clock()
         self.running = True
+        self.dirty_rendering = dirty_rendering
+        self.adaptive_frame_rate = adaptive_frame_rate
+        self.stats = LoopStats()
+        self.profile_overlay = ProfilerOverlay(10, WINDOW_HEIGHT - 10)
+        self.overlay_refreshed = -PROFILE_OVERLAY_REFRESH_MS
+        self.overlay_key = pygame.key.key_code(PROFILE_OVERLAY_KEY)
+        self.dump_key = pygame.key.key_code(PROFILE_DUMP_KEY)
         
+        self.storage = storage or default_storage
+        self.timers = TimerScheduler()
         self.current_screen = "login"
         self.current_user = None
+        self.session_token = None
+        self.remember_session = False
         self.screens = {
             "login": LoginScreen(self),
             "menu": MenuScreen(self),
-            "game": GameScreen(self)
+            "game": GameScreen(self),
+            "online": NetworkGameScreen(self)
         }
+        self.screens["login"].restore_session()
+    
+    def set_display_size(self, size: Tuple[int, int]):
+        self.display = pygame.display.set_mode(size, pygame.RESIZABLE if self.resizable else 0)
+        width, height = self.display.get_size()
+        if (width, height) == (WINDOW_WIDTH, WINDOW_HEIGHT):
+            self.screen = self.display
+            self.scale = 1.0
+            self.viewport = self.display.get_rect()
+            return
+        
+        if self.canvas is None:
+            self.canvas = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        self.screen = self.canvas
+        self.scale = min(width / WINDOW_WIDTH, height / WINDOW_HEIGHT)
+        self.viewport = pygame.Rect(0, 0, round(WINDOW_WIDTH * self.scale), round(WINDOW_HEIGHT * self.scale))
+        self.viewport.center = (width // 2, height // 2)
+        self.display.fill(BLACK)
+    
+    def to_display(self, rect: pygame.Rect) -> pygame.Rect:
+        left = self.viewport.x + round(rect.left * self.scale)
+        top = self.viewport.y + round(rect.top * self.scale)
+        right = self.viewport.x + round(rect.right * self.scale)
+        bottom = self.viewport.y + round(rect.bottom * self.scale)
+        return pygame.Rect(left, top, right - left, bottom - top)
+    
+    def to_logical(self, pos) -> Tuple[int, int]:
+        if self.screen is self.display:
+            return pos
+        return (math.floor((pos[0] - self.viewport.x) / self.scale),
+                math.floor((pos[1] - self.viewport.y) / self.scale))
+    
+    def present(self, rects: List[pygame.Rect] = None):
+        if self.screen is self.display:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+        
+        scale = pygame.transform.smoothscale if self.smooth_scaling else pygame.transform.scale
+        if rects is None:
+            scale(self.screen, self.viewport.size, self.display.subsurface(self.viewport))
+            pygame.display.flip()
+            return
+        
+        updated = []
+        canvas_rect = self.screen.get_rect()
+        for rect in rects:
+            target = self.to_display(rect)
+            if not target:
+                continue
+            source = rect.inflate(2, 2).clip(canvas_rect)
+            scaled = self.to_display(source)
+            patch = scale(self.screen.subsurface(source), scaled.size)
+            self.display.blit(patch, target, target.move(-scaled.x, -scaled.y))
+            updated.append(target)
+        pygame.display.update(updated)
     
     def set_screen(self, screen_name, **kwargs):
         self.current_screen = screen_name
+        self.screens[screen_name].dirty.invalidate()
         if hasattr(self.screens[screen_name], 'reset'):
             self.screens[screen_name].reset(**kwargs)
+        self.screens[screen_name].events.hover(self.to_logical(pygame.mouse.get_pos()))
+    
+    @profiled
+    def render_frame(self):
+        screen = self.screens[self.current_screen]
+        rects = screen.dirty.pop(self.screen.get_rect())
+        
+        if not self.dirty_rendering:
+            self.screen.fill(COLORS['BACKGROUND'])
+            screen.draw(self.screen)
+            self.profile_overlay.draw(self.screen)
+            self.present()
+            return True
+        
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self.screen.fill(COLORS['BACKGROUND'], rect)
+            screen.draw(self.screen)
+            self.profile_overlay.draw(self.screen)
+        self.screen.set_clip(None)
+        if rects:
+            self.present(rects)
+        return bool(rects)
+    
+    def _next_events(self):
+        timeout = self.screens[self.current_screen].idle_timeout() if self.adaptive_frame_rate else None
+        if timeout is None:
+            return pygame.event.get()
+        deadline = self.timers.next_timeout_ms()
+        if deadline is not None:
+            timeout = min(timeout, deadline)
+        if self.profile_overlay.visible:
+            timeout = min(timeout, PROFILE_OVERLAY_REFRESH_MS)
+        
+        self.stats.idle_waits += 1
+        event = pygame.event.wait(max(1, timeout))
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+    
+    def toggle_profile_overlay(self):
+        self.profile_overlay.visible = not self.profile_overlay.visible
+        profiler.enabled = self.profile_overlay.visible or PROFILING
+        self.overlay_refreshed = -PROFILE_OVERLAY_REFRESH_MS
+        self.screens[self.current_screen].dirty.invalidate()
+    
+    def dump_trace(self):
+        try:
+            events = profiler.dump_trace(PROFILE_TRACE_PATH)
+            self.profile_overlay.status = f"Zapisano {events} zdarzeń do {PROFILE_TRACE_PATH}"
+        except OSError as e:
+            self.profile_overlay.status = f"Błąd zapisu śladu: {e}"
+        self.overlay_refreshed = -PROFILE_OVERLAY_REFRESH_MS
+    
+    def _refresh_profile_overlay(self):
+        now = pygame.time.get_ticks()
+        if now - self.overlay_refreshed < PROFILE_OVERLAY_REFRESH_MS:
+            return
+        
+        self.overlay_refreshed = now
+        previous = self.profile_overlay.rect
+        self.profile_overlay.refresh(profiler.summary())
+        self.screens[self.current_screen].dirty.add(previous.union(self.profile_overlay.rect))
+    
+    def step(self):
+        events = self._next_events()
+        dt = self.clock.tick(FPS)
+        frame_start = time.perf_counter_ns() if profiler.enabled else 0
+        
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.screens[self.current_screen].dirty.invalidate()
+            elif event.type == pygame.VIDEORESIZE:
+                self.set_display_size(event.size)
+                self.screens[self.current_screen].dirty.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == self.overlay_key:
+                self.toggle_profile_overlay()
+            elif event.type == pygame.KEYDOWN and event.key == self.dump_key:
+                self.dump_trace()
+            else:
+                if hasattr(event, 'pos') and self.screen is not self.display:
+                    event = pygame.event.Event(event.type, event.dict, pos=self.to_logical(event.pos))
+                self.screens[self.current_screen].handle_event(event)
+        
+        self.timers.run_due()
+        self.screens[self.current_screen].update(dt)
+        if self.profile_overlay.visible:
+            self._refresh_profile_overlay()
+        if self.render_frame():
+            self.stats.frames += 1
+        self.stats.iterations += 1
+        if frame_start:
+            profiler.record("frame", frame_start, time.perf_counter_ns())
     
     def run(self):
         while self.running:
-            dt = self.clock.tick(FPS)
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                else:
-                    self.screens[self.current_screen].handle_event(event)
-            
-            self.screens[self.current_screen].update(dt)
-            
-            self.screen.fill(COLORS['BACKGROUND'])
-            self.screens[self.current_screen].draw(self.screen)
-            
-            pygame.display.flip()
+            self.step()
         
+        if self.session_token and not self.remember_session:
+            self.storage.revoke_session(self.session_token)
+        self.storage.close()
+        event_log.close()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,113 @@
+import socket
+import threading
+import time
+from typing import Callable, FrozenSet, Optional
+
+from config import SERVER_HOST, SERVER_PORT, SERVER_CONNECT_TIMEOUT
+from hangman_engine import LETTER_BITS
+from protocol import encode_message, decode_message
+
+
+class NetworkClient:
+
+    def __init__(self, on_message: Callable[['NetworkClient', dict], None], host: str = SERVER_HOST,
+                 port: int = SERVER_PORT, timeout: float = SERVER_CONNECT_TIMEOUT):
+        self.on_message = on_message
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.sock = None
+        self.closed = False
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def connect(self):
+        self.sock = socket.create_connection((self.host, self.port), self.timeout)
+        self.sock.settimeout(None)
+        self._thread = threading.Thread(target=self._run, name="network-client", daemon=True)
+        self._thread.start()
+    
+    def send(self, message: dict):
+        with self._lock:
+            self.sock.sendall(encode_message(message))
+    
+    def close(self):
+        self.closed = True
+        if self.sock:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.sock.close()
+    
+    def _run(self):
+        try:
+            with self.sock.makefile('rb') as stream:
+                for line in stream:
+                    try:
+                        message = decode_message(line)
+                    except ValueError:
+                        continue
+                    self.on_message(self, message)
+        except (OSError, ValueError):
+            pass
+        if not self.closed:
+            self.on_message(self, {'type': 'disconnected'})
+
+
+class RemoteGame:
+    __slots__ = ('player1', 'player2', 'current_player', 'game_mode', 'category', 'word', 'guessed_mask',
+                 'display_word', 'mistakes', 'max_mistakes', 'game_over', 'winner', 'hint_used', 'time_limit',
+                 'deadline')
+    
+    def __init__(self, start: dict):
+        self.player1, self.player2 = start['players']
+        self.current_player = start['turn']
+        self.game_mode = start['mode']
+        self.category = start['category']
+        self.word = None
+        self.guessed_mask = 0
+        for letter in start.get('guessed', ''):
+            self.guessed_mask |= LETTER_BITS[letter]
+        self.display_word = start['display']
+        self.mistakes = start.get('mistakes', 0)
+        self.max_mistakes = start['max_mistakes']
+        self.game_over = False
+        self.winner = None
+        self.hint_used = not start['has_hint']
+        self.time_limit = start['time_limit']
+        self.deadline = time.monotonic() + self.time_limit - start.get('elapsed', 0) if self.time_limit else None
+    
+    @property
+    def guessed_letters(self) -> FrozenSet[str]:
+        return frozenset(letter for letter, bit in LETTER_BITS.items() if self.guessed_mask & bit)
+    
+    def get_display_word(self) -> str:
+        return self.display_word
+    
+    def get_time_left(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+    
+    def get_time_remaining(self) -> Optional[int]:
+        time_left = self.get_time_left()
+        return None if time_left is None else int(time_left)
+    
+    def get_ms_to_next_second(self) -> Optional[int]:
+        if self.deadline is None or self.game_over:
+            return None
+        remaining = self.get_time_left()
+        return int((remaining - int(remaining)) * 1000) + 1
+    
+    def apply(self, message: dict):
+        self.guessed_mask |= LETTER_BITS[message['letter']]
+        self.display_word = message['display']
+        self.mistakes = message['mistakes']
+        self.current_player = message['turn']
+        self.game_over = message['game_over']
+    
+    def finish(self, message: dict):
+        self.game_over = True
+        self.winner = message['winner']
+        self.word = message['word']
\ No newline at end of file
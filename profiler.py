@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Dict, List, Tuple
+
+from config import PROFILING, PROFILE_WINDOW, PROFILE_TRACE_EVENTS
+
+class Histogram:
+
+    def __init__(self, window: int = PROFILE_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+    
+    def add(self, duration_ns: int):
+        self.samples.append(duration_ns)
+        self.count += 1
+    
+    def percentiles(self, *points: float) -> List[float]:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return [0.0] * len(points)
+        return [ordered[min(len(ordered) - 1, int(len(ordered) * point))] / 1_000_000 for point in points]
+
+class Profiler:
+
+    def __init__(self, enabled: bool = PROFILING, window: int = PROFILE_WINDOW,
+                 trace_events: int = PROFILE_TRACE_EVENTS):
+        self.enabled = enabled
+        self.window = window
+        self.histograms: Dict[str, Histogram] = {}
+        self.trace = deque(maxlen=trace_events)
+        self.origin = time.perf_counter_ns()
+    
+    def record(self, name: str, start_ns: int, end_ns: int):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms.setdefault(name, Histogram(self.window))
+        histogram.add(end_ns - start_ns)
+        self.trace.append((name, start_ns, end_ns, threading.get_ident()))
+    
+    def reset(self):
+        self.histograms.clear()
+        self.trace.clear()
+        self.origin = time.perf_counter_ns()
+    
+    def summary(self) -> List[Tuple[str, int, float, float, float]]:
+        rows = []
+        for name, histogram in list(self.histograms.items()):
+            p50, p95, p99 = histogram.percentiles(0.5, 0.95, 0.99)
+            rows.append((name, histogram.count, p50, p95, p99))
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows
+    
+    def dump_trace(self, path: str) -> int:
+        pid = os.getpid()
+        events = [
+            {
+                'name': name,
+                'cat': name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': (start_ns - self.origin) / 1000,
+                'dur': (end_ns - start_ns) / 1000,
+                'pid': pid,
+                'tid': tid,
+            }
+            for name, start_ns, end_ns, tid in list(self.trace)
+        ]
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+        return len(events)
+
+profiler = Profiler()
+
+def profiled(func):
+    name = func.__qualname__ if '.' in func.__qualname__ else f"{func.__module__}.{func.__qualname__}"
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not profiler.enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.record(name, start, time.perf_counter_ns())
+    
+    return wrapper
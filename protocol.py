@@ -0,0 +1,13 @@
+import json
+from config import SERVER_MAX_LINE
+
+def encode_message(message: dict) -> bytes:
+    return json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+def decode_message(line: bytes) -> dict:
+    if len(line) > SERVER_MAX_LINE:
+        raise ValueError("Wiadomość jest za długa")
+    message = json.loads(line.decode('utf-8'))
+    if not isinstance(message, dict) or not isinstance(message.get('type'), str):
+        raise ValueError("Nieprawidłowa wiadomość")
+    return message
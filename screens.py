@@ -1,36 +1,64 @@
 import pygame
-import csv
-from datetime import datetime
-from components import Button, InputField, HangmanDrawing, AlphabetGrid
-from database import create_user, authenticate_user, get_user_stats, get_categories, get_user_history
+from components import Button, InputField, HangmanDrawing, AlphabetGrid, DirtyRegions, EventDispatcher, text_cache
 from hangman_game import HangmanGame
+from network import NetworkClient, RemoteGame
+from session import load_token, save_token, clear_token
+from export import default_filename, start_export
+from profiler import profiled
+from solver import load_index
 from config import *
 
+AUTH_DONE_EVENT = pygame.event.custom_type()
+
+NETWORK_EVENT = pygame.event.custom_type()
+
+WORD_INDEX_EVENT = pygame.event.custom_type()
+
+def _post_auth_done(_):
+    pygame.event.post(pygame.event.Event(AUTH_DONE_EVENT))
+
+def _post_word_index_ready(_):
+    pygame.event.post(pygame.event.Event(WORD_INDEX_EVENT))
+
+def _post_network_message(client, message):
+    pygame.event.post(pygame.event.Event(NETWORK_EVENT, client=client, message=message))
+
 class LoginScreen:
     def __init__(self, game_app):
         self.game_app = game_app
         self.mode = "login"
         self.message = ""
+        self.pending = None
+        self.pending_username = None
+        self.restoring = None
+        self.remember = REMEMBER_ME_DEFAULT
         
         self.username_field = InputField(400, 300, 200, 40, "Nazwa użytkownika")
         self.password_field = InputField(400, 350, 200, 40, "Hasło")
         
         self.action_btn = Button(400, 420, 200, 40, "Zaloguj", self._handle_action)
         self.switch_btn = Button(400, 480, 200, 30, "Przełącz na rejestrację", self._switch_mode)
+        self.remember_btn = Button(400, 515, 200, 25, self._remember_text(), self._toggle_remember, COLORS['SECONDARY'])
+        self.dirty = DirtyRegions(self.username_field, self.password_field, self.action_btn, self.switch_btn, self.remember_btn)
+        self.events = EventDispatcher()
+        self.events.add(self.username_field, self.password_field, self.action_btn, self.switch_btn)
+        self.events.add(self.remember_btn, when=lambda: self.mode == "login")
     
+    @profiled
     def handle_event(self, event):
-        self.username_field.handle_event(event)
-        self.password_field.handle_event(event)
-        self.action_btn.handle_event(event)
-        self.switch_btn.handle_event(event)
+        self.events.dispatch(event)
     
+    @profiled
     def update(self, dt):
-        mouse_pos = pygame.mouse.get_pos()
-        self.action_btn.update(mouse_pos)
-        self.switch_btn.update(mouse_pos)
+        if self.pending and self.pending.done():
+            self._finish_action()
+    
+    def idle_timeout(self):
+        return IDLE_TIMEOUT_MS
     
+    @profiled
     def draw(self, screen):
-        title = FONTS['TITLE'].render("Gra w Wisielca", True, COLORS['TEXT'])
+        title = text_cache.render(FONTS['TITLE'], "Gra w Wisielca", True, COLORS['TEXT'])
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 200))
         screen.blit(title, title_rect)
         
@@ -38,38 +66,106 @@ class LoginScreen:
         self.password_field.draw(screen)
         self.action_btn.draw(screen)
         self.switch_btn.draw(screen)
+        if self.mode == "login":
+            self.remember_btn.draw(screen)
         
         if self.message:
-            msg_surface = FONTS['DEFAULT'].render(self.message, True, COLORS['TEXT'])
-            msg_rect = msg_surface.get_rect(center=(WINDOW_WIDTH // 2, 550))
+            msg_surface = text_cache.render(FONTS['DEFAULT'], self.message, True, COLORS['TEXT'])
+            msg_rect = msg_surface.get_rect(center=(WINDOW_WIDTH // 2, 560))
             screen.blit(msg_surface, msg_rect)
     
     def _handle_action(self):
+        if self.pending:
+            return
+        
         username = self.username_field.text.strip()
         password = self.password_field.text
         
+        self.dirty.invalidate()
         if not username or not password:
             self.message = "Wypełnij wszystkie pola!"
             return
         
         if self.mode == "login":
-            if authenticate_user(username, password):
-                self.game_app.current_user = username
-                self.game_app.set_screen("menu")
-            else:
-                self.message = "Nieprawidłowe dane logowania!"
+            self.pending = self.game_app.storage.login_async(username, password)
+            self.message = "Logowanie..."
         else:
             if len(password) < 4:
                 self.message = "Hasło musi mieć co najmniej 4 znaki!"
                 return
             
-            if create_user(username, password):
-                self.message = "Konto utworzone! Możesz się zalogować."
+            self.pending = self.game_app.storage.create_user_async(username, password)
+            self.message = "Tworzenie konta..."
+        
+        self.pending_username = username
+        self.pending.add_done_callback(_post_auth_done)
+    
+    def _finish_action(self):
+        pending, self.pending = self.pending, None
+        token, self.restoring = self.restoring, None
+        self.dirty.invalidate()
+        
+        try:
+            result = pending.result()
+        except Exception:
+            self.message = "Błąd bazy danych, spróbuj ponownie!"
+            return
+        
+        if token:
+            self.message = ""
+            if result:
+                self._log_in(result, token, save=False)
+            else:
+                clear_token()
+            return
+        
+        if self.mode == "login":
+            if result:
+                self._log_in(self.pending_username, result, self.remember)
+            else:
+                self.message = "Nieprawidłowe dane logowania!"
+        else:
+            if result:
                 self._switch_mode()
+                self.message = "Konto utworzone! Możesz się zalogować."
             else:
                 self.message = "Użytkownik już istnieje!"
     
+    def _log_in(self, username: str, token: str, remember: bool = True, save: bool = True):
+        if remember and save:
+            save_token(token)
+        self.message = ""
+        self.password_field.text = ""
+        self.game_app.current_user = username
+        self.game_app.session_token = token
+        self.game_app.remember_session = remember
+        self.game_app.set_screen("menu")
+    
+    def restore_session(self):
+        token = load_token()
+        if not token:
+            return
+        
+        self.restoring = token
+        self.message = "Przywracanie sesji..."
+        self.pending = self.game_app.storage.authenticate_session_async(token)
+        self.pending.add_done_callback(_post_auth_done)
+    
+    def _remember_text(self) -> str:
+        return "Zapamiętaj mnie: tak" if self.remember else "Zapamiętaj mnie: nie"
+    
+    def _toggle_remember(self):
+        if self.mode != "login":
+            return
+        self.dirty.invalidate()
+        self.remember = not self.remember
+        self.remember_btn.text = self._remember_text()
+    
     def _switch_mode(self):
+        if self.pending:
+            return
+        
+        self.dirty.invalidate()
         self.mode = "register" if self.mode == "login" else "login"
         self.action_btn.text = "Rejestruj" if self.mode == "register" else "Zaloguj"
         self.switch_btn.text = "Przełącz na logowanie" if self.mode == "register" else "Przełącz na rejestrację"
@@ -78,36 +174,66 @@ class LoginScreen:
         self.message = ""
 
 class MenuScreen:
+    MESSAGE_REGION = pygame.Rect(0, 600, WINDOW_WIDTH, 30)
+    
     def __init__(self, game_app):
         self.game_app = game_app
+        self.message = ""
+        self.export = None
+        self.export_filename = None
+        self.export_progress = (0, 0)
         
-        self.single_btn = Button(400, 250, 200, 50, "Gra 1 gracz", self._single_game)
-        self.two_btn = Button(400, 320, 200, 50, "Gra 2 graczy", self._two_game)
-        self.stats_btn = Button(400, 390, 200, 50, "Statystyki", self._stats)
-        self.logout_btn = Button(400, 460, 200, 50, "Wyloguj", self._logout)
+        self.single_btn = Button(400, 210, 200, 50, "Gra 1 gracz", self._single_game)
+        self.two_btn = Button(400, 275, 200, 50, "Gra 2 graczy", self._two_game)
+        self.computer_btn = Button(400, 340, 200, 50, "Z komputerem", self._computer_game)
+        self.online_btn = Button(400, 405, 200, 50, "Gra sieciowa", self._online_game)
+        self.stats_btn = Button(400, 470, 200, 50, "Statystyki", self._stats)
+        self.logout_btn = Button(400, 535, 200, 50, "Wyloguj", self._logout)
+        self.dirty = DirtyRegions(self.single_btn, self.two_btn, self.computer_btn, self.online_btn, self.stats_btn,
+                                  self.logout_btn)
+        self.events = EventDispatcher()
+        self.events.add(self.single_btn, self.two_btn, self.computer_btn, self.online_btn, self.stats_btn,
+                        self.logout_btn)
     
+    @profiled
     def handle_event(self, event):
-        self.single_btn.handle_event(event)
-        self.two_btn.handle_event(event)
-        self.stats_btn.handle_event(event)
-        self.logout_btn.handle_event(event)
+        self.events.dispatch(event)
     
+    @profiled
     def update(self, dt):
-        mouse_pos = pygame.mouse.get_pos()
-        self.single_btn.update(mouse_pos)
-        self.two_btn.update(mouse_pos)
-        self.stats_btn.update(mouse_pos)
-        self.logout_btn.update(mouse_pos)
+        if self.export:
+            if self.export.done():
+                self._finish_export()
+            else:
+                rows, total = self.export_progress
+                percent = rows * 100 // total if total else 0
+                self._set_message(f"Eksport statystyk: {percent}% ({rows}/{total})")
     
+    def idle_timeout(self):
+        return EXPORT_POLL_MS if self.export else IDLE_TIMEOUT_MS
+    
+    @profiled
     def draw(self, screen):
-        welcome = FONTS['LARGE'].render(f"Witaj, {self.game_app.current_user}!", True, COLORS['TEXT'])
+        welcome = text_cache.render(FONTS['LARGE'], f"Witaj, {self.game_app.current_user}!", True, COLORS['TEXT'])
         welcome_rect = welcome.get_rect(center=(WINDOW_WIDTH // 2, 150))
         screen.blit(welcome, welcome_rect)
         
         self.single_btn.draw(screen)
         self.two_btn.draw(screen)
+        self.computer_btn.draw(screen)
+        self.online_btn.draw(screen)
         self.stats_btn.draw(screen)
         self.logout_btn.draw(screen)
+        
+        if self.message:
+            msg_surface = text_cache.render(FONTS['DEFAULT'], self.message, True, COLORS['TEXT'])
+            msg_rect = msg_surface.get_rect(center=self.MESSAGE_REGION.center)
+            screen.blit(msg_surface, msg_rect)
+    
+    def _set_message(self, message: str):
+        if message != self.message:
+            self.message = message
+            self.dirty.add(self.MESSAGE_REGION)
     
     def _single_game(self):
         self.game_app.set_screen("game", players=1)
@@ -115,91 +241,197 @@ class MenuScreen:
     def _two_game(self):
         self.game_app.set_screen("game", players=2)
     
+    def _computer_game(self):
+        self.game_app.set_screen("game", players=2, computer=True)
+    
+    def _online_game(self):
+        self.game_app.set_screen("online")
+    
     def _stats(self):
-        games_played, games_won = get_user_stats(self.game_app.current_user)
-        win_rate = (games_won / games_played * 100) if games_played > 0 else 0
-        
-        filename = f"stats_{self.game_app.current_user}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        with open(filename, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(['Użytkownik', 'Rozegrane gry', 'Wygrane gry', 'Współczynnik wygranych'])
-            writer.writerow([self.game_app.current_user, games_played, games_won, f"{win_rate:.1f}%"])
-            writer.writerow([])
-            writer.writerow(['Słowo', 'Tryb gry', 'Wynik'])
-            
-            history = get_user_history(self.game_app.current_user)
-            for word, mode, winner in history:
-                result = "Wygrana" if winner == self.game_app.current_user else "Przegrana"
-                writer.writerow([word, mode, result])
+        if self.export:
+            return
+        
+        self.export_filename = default_filename(self.game_app.current_user, EXPORT_FORMAT)
+        self.export_progress = (0, 0)
+        self.export = start_export(self.export_filename, self.game_app.current_user, EXPORT_FORMAT,
+                                   self._on_export_progress, self.game_app.storage)
+        self._set_message("Eksport statystyk...")
+    
+    def _on_export_progress(self, rows: int, total: int):
+        self.export_progress = (rows, total)
+    
+    def _finish_export(self):
+        export, self.export = self.export, None
+        try:
+            rows = export.result()
+        except Exception as e:
+            self._set_message(f"Błąd eksportu: {e}")
+            return
+        self._set_message(f"Zapisano {rows} gier do {self.export_filename}")
     
     def _logout(self):
+        if self.game_app.session_token:
+            self.game_app.storage.revoke_session(self.game_app.session_token)
+            clear_token()
+            self.game_app.session_token = None
+        self.message = ""
         self.game_app.current_user = None
         self.game_app.set_screen("login")
 
 class GameScreen:
+    WORD_REGION = pygame.Rect(400, 200, WINDOW_WIDTH - 400, 40)
+    INFO_REGION = pygame.Rect(400, 250, WINDOW_WIDTH - 400, 30)
+    DIFFICULTIES = (None,) + tuple(DIFFICULTY_LEVELS)
+    MODES = tuple(mode.lower() for mode in GAME_MODES)
+    
     def __init__(self, game_app):
         self.game_app = game_app
         self.game = None
         self.hangman_drawing = HangmanDrawing(100, 100)
-        self.alphabet_grid = AlphabetGrid(400, 450)
+        self.alphabet_grid = AlphabetGrid(400, 450, self._guess_letter)
         self.message = ""
         self.players = 1
         
         self.hint_btn = Button(50, 50, 100, 40, "Podpowiedź", self._use_hint)
+        self.pause_btn = Button(160, 50, 100, 40, "Pauza", self._toggle_pause)
         self.menu_btn = Button(850, 50, 100, 40, "Menu", self._back_to_menu)
-        
-        categories = get_categories()
-        self.category = categories[0] if categories else "Zwierzęta"
         self.mode = "classic"
+        self.mode_btn = Button(50, 520, 250, 40, self._mode_text(), self._change_mode)
+        self.difficulty = None
+        self.difficulty_btn = Button(50, 620, 250, 40, self._difficulty_text(), self._change_difficulty)
+        self.assist = False
+        self.assist_btn = Button(50, 570, 250, 40, self._assist_text(), self._toggle_assist)
+        self.dirty = DirtyRegions(self.hint_btn, self.pause_btn, self.menu_btn, self.mode_btn, self.difficulty_btn,
+                                  self.assist_btn, self.alphabet_grid)
+        self.events = EventDispatcher()
+        self.events.add(self.menu_btn, self.mode_btn, self.difficulty_btn, self.assist_btn)
+        self.events.add(self.hint_btn, when=self._can_use_hint)
+        self.events.add(self.pause_btn, when=self._pausable)
+        self.events.add(self.alphabet_grid, when=self._can_guess)
+        self.time_left = None
+        self.timeout = None
+        
+        self.computer = False
+        self.computer_wait = 0
+        self.word_index = None
+        self.suggestion = None
+        
+        self.category = None
+        self._warm_up = game_app.storage.warm_up()
     
     def reset(self, **kwargs):
         self.players = kwargs.get('players', 1)
+        self.computer = kwargs.get('computer', False)
+        self.computer_wait = 0
+        self.suggestion = None
+        self._cancel_timeout()
         self.game = None
+        self.time_left = None
+        self.dirty.invalidate()
         self.message = ""
         self.alphabet_grid.selected_letters.clear()
         self._start_game()
     
     def _start_game(self):
-        player2 = f"{self.game_app.current_user}_2" if self.players == 2 else None
+        if self.category is None:
+            try:
+                categories = self._warm_up.result()
+            except Exception:
+                self._warm_up = self.game_app.storage.warm_up()
+                self.message = "Błąd bazy danych, spróbuj ponownie!"
+                return
+            self.category = categories[0] if categories else "Zwierzęta"
+        if self.computer:
+            player2 = COMPUTER_PLAYER
+        else:
+            player2 = f"{self.game_app.current_user}_2" if self.players == 2 else None
         
         try:
             self.game = HangmanGame(
                 self.game_app.current_user,
                 player2,
                 self.mode,
-                self.category
+                self.category,
+                self.difficulty,
+                self.game_app.storage
             )
         except ValueError as e:
             self.message = str(e)
+            return
+        except Exception:
+            self.message = "Błąd bazy danych, spróbuj ponownie!"
+            return
+        
+        self.pause_btn.text = "Pauza"
+        if self.game.time_limit:
+            self.timeout = self.game_app.timers.schedule(self.game.get_time_left(), self._on_timeout)
+        self.game_app.storage.prefetch_word(self.category, self.game_app.current_user, self.difficulty)
+        if self.computer or self.assist:
+            self._load_word_index()
     
+    def _load_word_index(self):
+        self.word_index = load_index(self.category, self.game_app.storage)
+        self.word_index.add_done_callback(_post_word_index_ready)
+    
+    @profiled
     def handle_event(self, event):
-        if self.game and not self.game.game_over:
-            self.alphabet_grid.handle_event(event, self._guess_letter)
-            self.hint_btn.handle_event(event)
-        self.menu_btn.handle_event(event)
+        self.events.dispatch(event)
     
+    @profiled
     def update(self, dt):
-        mouse_pos = pygame.mouse.get_pos()
-        self.hint_btn.update(mouse_pos)
-        self.menu_btn.update(mouse_pos)
+        if self._paused():
+            return
+        if self.game and not self.game.game_over and self.word_index and self.word_index.done():
+            if self._computer_turn():
+                self.computer_wait += dt
+                if self.computer_wait >= COMPUTER_MOVE_DELAY_MS:
+                    self.computer_wait = 0
+                    self.game.computer_turn(self.word_index.result())
+                    self._after_guess()
+            elif self.assist and self.suggestion is None:
+                self.suggestion = self.word_index.result().suggest(self.game.display_word, self.game.guessed_mask)
+                self.dirty.add(self.INFO_REGION)
+        
+        if self.game and self.game.time_limit and not self.game.game_over:
+            time_left = self.game.get_time_remaining()
+            if time_left != self.time_left:
+                self.time_left = time_left
+                self.dirty.add(self.INFO_REGION)
+    
+    def idle_timeout(self):
+        if self.game:
+            timeout = self.game.get_ms_to_next_second()
+            if self._computer_turn():
+                return min(timeout or IDLE_TIMEOUT_MS, max(1, COMPUTER_MOVE_DELAY_MS - self.computer_wait))
+            if timeout is not None:
+                return timeout
+        return IDLE_TIMEOUT_MS
     
+    @profiled
     def draw(self, screen):
         if not self.game:
+            self.menu_btn.draw(screen)
+            self.mode_btn.draw(screen)
+            self.difficulty_btn.draw(screen)
+            self._draw_message(screen)
             return
         
         word_display = " ".join(self.game.get_display_word())
-        word_surface = FONTS['LARGE'].render(word_display, True, COLORS['TEXT'])
+        word_surface = text_cache.render(FONTS['LARGE'], word_display, True, COLORS['TEXT'])
         screen.blit(word_surface, (400, 200))
         
-        info_text = f"Błędy: {self.game.mistakes}/{self.game.max_mistakes} | Tryb: {self.mode}"
+        info_text = (f"Błędy: {self.game.mistakes}/{self.game.max_mistakes}"
+                     f" | Tryb: {GAME_MODES[self.game.game_mode.upper()]}")
+        if self.difficulty:
+            info_text += f" | Poziom: {DIFFICULTY_NAMES[self.difficulty]}"
         if self.players == 2:
             info_text += f" | Gracz: {self.game.current_player}"
-        if self.game.game_mode == "timed":
-            time_left = self.game.get_time_remaining()
-            if time_left is not None:
-                info_text += f" | Czas: {time_left}s"
+        if self.assist and self.suggestion and not self.game.game_over:
+            info_text += f" | Sugestia: {self.suggestion}"
+        if self.game.time_limit:
+            info_text += f" | Czas: {self.game.get_time_remaining()}s"
         
-        info_surface = FONTS['DEFAULT'].render(info_text, True, COLORS['TEXT'])
+        info_surface = text_cache.render(FONTS['DEFAULT'], info_text, True, COLORS['TEXT'])
         screen.blit(info_surface, (400, 250))
         
         self.hangman_drawing.draw(screen, self.game.mistakes)
@@ -208,7 +440,12 @@ class GameScreen:
         
         if not self.game.hint_used:
             self.hint_btn.draw(screen)
+        if self._pausable():
+            self.pause_btn.draw(screen)
         self.menu_btn.draw(screen)
+        self.mode_btn.draw(screen)
+        self.difficulty_btn.draw(screen)
+        self.assist_btn.draw(screen)
         
         if self.game.game_over:
             if self.game.winner:
@@ -216,26 +453,248 @@ class GameScreen:
             else:
                 end_text = f"Przegrana! Słowo to: {self.game.word}"
             
-            end_surface = FONTS['LARGE'].render(end_text, True, COLORS['TEXT'])
+            end_surface = text_cache.render(FONTS['LARGE'], end_text, True, COLORS['TEXT'])
             end_rect = end_surface.get_rect(center=(WINDOW_WIDTH // 2, 350))
             screen.blit(end_surface, end_rect)
         
+        self._draw_message(screen)
+    
+    def _draw_message(self, screen):
         if self.message:
-            msg_surface = FONTS['DEFAULT'].render(self.message, True, COLORS['TEXT'])
+            msg_surface = text_cache.render(FONTS['DEFAULT'], self.message, True, COLORS['TEXT'])
             screen.blit(msg_surface, (400, 580))
     
     def _guess_letter(self, letter):
-        if self.game and not self.game.game_over:
+        if self.game and not self.game.game_over and not self._paused():
             self.game.guess_letter(letter)
-            
-            if self.game.game_over:
-                self.game.save_result()
+            self._after_guess()
+    
+    def _after_guess(self):
+        self.suggestion = None
+        self.dirty.add(self.WORD_REGION)
+        self.dirty.add(self.INFO_REGION)
+        self.dirty.add(self.hangman_drawing.rect)
+        
+        if self.game.game_over:
+            self.dirty.invalidate()
+            self._cancel_timeout()
+            self.game.save_result()
+    
+    def _on_timeout(self):
+        self.timeout = None
+        if self.game and self.game.time_out():
+            self.message = "Koniec czasu!"
+            self.dirty.invalidate()
+            self.game.save_result()
+    
+    def _cancel_timeout(self):
+        if self.timeout:
+            self.timeout.cancel()
+            self.timeout = None
+    
+    def _can_guess(self) -> bool:
+        return bool(self.game and not self.game.game_over and not self._paused() and not self._computer_turn())
+    
+    def _can_use_hint(self) -> bool:
+        return bool(self.game and not self.game.game_over and not self._paused())
+    
+    def _pausable(self) -> bool:
+        return bool(self.game and self.game.time_limit and not self.game.game_over)
+    
+    def _paused(self) -> bool:
+        return bool(self.game and self.game.paused_at is not None)
+    
+    def _toggle_pause(self):
+        if not self._pausable():
+            return
+        if self._paused():
+            self.game.resume()
+            if self.timeout:
+                self.timeout.resume()
+            self.pause_btn.text = "Pauza"
+            self.message = ""
+        else:
+            self.game.pause()
+            if self.timeout:
+                self.timeout.pause()
+            self.pause_btn.text = "Wznów"
+            self.message = "Gra wstrzymana"
+        self.dirty.invalidate()
+    
+    def _computer_turn(self) -> bool:
+        return bool(self.computer and self.game and not self.game.game_over
+                    and self.game.current_player == COMPUTER_PLAYER)
     
     def _use_hint(self):
         if self.game:
             hint = self.game.use_hint()
             if hint:
+                self.dirty.invalidate()
                 self.message = f"Podpowiedź: {hint}"
     
+    def _mode_text(self) -> str:
+        return f"Tryb: {GAME_MODES[self.mode.upper()]}"
+    
+    def _difficulty_text(self) -> str:
+        return f"Poziom: {DIFFICULTY_NAMES.get(self.difficulty, 'Dowolny')}"
+    
+    def _assist_text(self) -> str:
+        return "Asystent: wł." if self.assist else "Asystent: wył."
+    
+    def _toggle_assist(self):
+        self.assist = not self.assist
+        self.assist_btn.text = self._assist_text()
+        self.suggestion = None
+        if self.assist and self.word_index is None:
+            self._load_word_index()
+        self.dirty.invalidate()
+    
+    def _difficulty_locked(self) -> bool:
+        return bool(self.game and not self.game.game_over and self.game.guessed_mask)
+    
+    def _change_difficulty(self):
+        self.dirty.invalidate()
+        if self._difficulty_locked():
+            self.message = "Zmień poziom po zakończeniu gry"
+            return
+        index = self.DIFFICULTIES.index(self.difficulty)
+        self.difficulty = self.DIFFICULTIES[(index + 1) % len(self.DIFFICULTIES)]
+        self.difficulty_btn.text = self._difficulty_text()
+        self.reset(players=self.players, computer=self.computer)
+    
+    def _change_mode(self):
+        self.dirty.invalidate()
+        if self._difficulty_locked():
+            self.message = "Zmień tryb po zakończeniu gry"
+            return
+        self.mode = self.MODES[(self.MODES.index(self.mode) + 1) % len(self.MODES)]
+        self.mode_btn.text = self._mode_text()
+        self.reset(players=self.players, computer=self.computer)
+    
+    def _back_to_menu(self):
+        self._cancel_timeout()
+        self.game_app.set_screen("menu") 
+
+class NetworkGameScreen(GameScreen):
+
+    def __init__(self, game_app):
+        super().__init__(game_app)
+        self.players = 2
+        self.client = None
+    
+    def reset(self, **kwargs):
+        self._disconnect()
+        self.game = None
+        self.time_left = None
+        self.suggestion = None
+        self.dirty.invalidate()
+        self.alphabet_grid.selected_letters.clear()
+        self.message = "Łączenie z serwerem..."
+        
+        self.client = NetworkClient(_post_network_message)
+        try:
+            self.client.connect()
+            self.client.send({'type': 'hello', 'token': self.game_app.session_token})
+            self.client.send({
+                'type': 'play',
+                'mode': self.mode,
+                'category': self.category,
+                'difficulty': self.difficulty
+            })
+        except OSError:
+            self.client = None
+            self.message = "Nie można połączyć się z serwerem!"
+    
+    @profiled
+    def handle_event(self, event):
+        if event.type == NETWORK_EVENT:
+            if event.client is self.client:
+                self._on_message(event.message)
+            return
+        self.events.dispatch(event)
+    
+    @profiled
+    def draw(self, screen):
+        if self.game:
+            super().draw(screen)
+            return
+        
+        self.menu_btn.draw(screen)
+        self.mode_btn.draw(screen)
+        self.difficulty_btn.draw(screen)
+        if self.message:
+            msg_surface = text_cache.render(FONTS['LARGE'], self.message, True, COLORS['TEXT'])
+            screen.blit(msg_surface, msg_surface.get_rect(center=(WINDOW_WIDTH // 2, 300)))
+    
+    def _on_message(self, message):
+        kind = message['type']
+        if kind == 'waiting':
+            self.message = "Oczekiwanie na przeciwnika..."
+            self.dirty.invalidate()
+        elif kind == 'start':
+            self.game = RemoteGame(message)
+            self.alphabet_grid.selected_letters = set(self.game.guessed_letters)
+            self.message = ""
+            self.dirty.invalidate()
+        elif kind == 'state' and self.game:
+            self.game.apply(message)
+            self.alphabet_grid.select(message['letter'])
+            self.suggestion = None
+            self.dirty.add(self.WORD_REGION)
+            self.dirty.add(self.INFO_REGION)
+            self.dirty.add(self.hangman_drawing.rect)
+        elif kind == 'hint' and self.game:
+            self.game.hint_used = True
+            self.message = f"Podpowiedź: {message['hint']}"
+            self.dirty.invalidate()
+        elif kind == 'over' and self.game:
+            self.game.finish(message)
+            if message['reason'] == 'left':
+                self.message = "Przeciwnik opuścił grę"
+            elif message['reason'] == 'timeout':
+                self.message = "Koniec czasu!"
+            self.dirty.invalidate()
+        elif kind == 'error':
+            self.message = message['message']
+            self.dirty.invalidate()
+        elif kind == 'disconnected':
+            self.client = None
+            self.message = "Utracono połączenie z serwerem!"
+            self.dirty.invalidate()
+    
+    def _send(self, message):
+        if not self.client:
+            return
+        try:
+            self.client.send(message)
+        except OSError:
+            self._on_message({'type': 'disconnected'})
+    
+    def _guess_letter(self, letter):
+        if self.game and not self.game.game_over:
+            self._send({'type': 'guess', 'letter': letter})
+    
+    def _use_hint(self):
+        if self.game and not self.game.hint_used:
+            self._send({'type': 'hint'})
+    
+    def _difficulty_locked(self) -> bool:
+        return bool(self.game and not self.game.game_over)
+    
+    def _can_guess(self) -> bool:
+        return bool(self.game and not self.game.game_over and self.game.current_player == self.game_app.current_user)
+    
+    def _pausable(self) -> bool:
+        return False
+    
+    def _paused(self) -> bool:
+        return False
+    
+    def _disconnect(self):
+        if self.client:
+            self.client.close()
+            self.client = None
+    
     def _back_to_menu(self):
-        self.game_app.set_screen("menu") 
\ No newline at end of file
+        self._disconnect()
+        super()._back_to_menu()
\ No newline at end of file
@@ -0,0 +1,421 @@
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import signal
+import struct
+import sys
+from collections import deque
+from typing import List, Optional, Tuple
+
+from config import (SERVER_HOST, SERVER_PORT, SERVER_BACKLOG, SERVER_MAX_LINE, SERVER_WRITE_HIGH_WATER,
+                    SERVER_CHECKPOINT_INTERVAL, DIFFICULTY_LEVELS)
+from event_log import event_log
+from hangman_engine import ALPHABET
+from hangman_game import HangmanGame
+from protocol import encode_message, decode_message
+from storage import Storage, SQLiteStorage, default_storage
+
+SERVER_GAME_MODES = ("classic", "timed")
+_RECORD_LENGTH = struct.Struct('<I')
+
+
+def _error(message: str) -> dict:
+    return {'type': 'error', 'message': message}
+
+def write_checkpoint(path: str, snapshots: List[bytes]):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        for snapshot in snapshots:
+            file.write(_RECORD_LENGTH.pack(len(snapshot)))
+            file.write(snapshot)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+def read_checkpoint(path: str) -> List[bytes]:
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return []
+    
+    snapshots = []
+    offset = 0
+    while offset + _RECORD_LENGTH.size <= len(data):
+        length, = _RECORD_LENGTH.unpack_from(data, offset)
+        offset += _RECORD_LENGTH.size
+        snapshots.append(data[offset:offset + length])
+        offset += length
+    return snapshots
+
+
+class Player:
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.username = None
+        self.session = None
+        self.queue_key = None
+        self.task = asyncio.current_task()
+    
+    def send(self, message: dict):
+        if not self.writer.is_closing():
+            self.writer.write(encode_message(message))
+
+
+class GameSession:
+
+    def __init__(self, session_id: int, game: HangmanGame, players: Tuple[Player, Player]):
+        self.id = session_id
+        self.game = game
+        self.players = players
+        self.timer = None
+    
+    def opponent(self, player: Player) -> Player:
+        return self.players[1] if self.players[0] is player else self.players[0]
+    
+    def broadcast(self, message: dict):
+        data = encode_message(message)
+        for player in self.players:
+            if not player.writer.is_closing():
+                player.writer.write(data)
+
+
+class HangmanServer:
+
+    def __init__(self, host: str = SERVER_HOST, port: int = SERVER_PORT, authenticate: bool = True,
+                 checkpoint_path: str = None, storage: Storage = None):
+        self.host = host
+        self.port = port
+        self.authenticate = authenticate
+        self.checkpoint_path = checkpoint_path
+        self.storage = storage or default_storage
+        self.server = None
+        self.clients = set()
+        self.waiting = {}
+        self.sessions = {}
+        self.suspended = {}
+        self._checkpoints = None
+        self.stats = {'connections': 0, 'games_started': 0, 'games_finished': 0, 'guesses': 0}
+        self._ids = itertools.count(1)
+        self._handlers = {
+            'play': self._play,
+            'guess': self._guess,
+            'hint': self._hint,
+            'leave': self._leave,
+        }
+    
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, lambda: self.storage.preload_words().result())
+        if self.checkpoint_path:
+            for snapshot in await loop.run_in_executor(None, read_checkpoint, self.checkpoint_path):
+                try:
+                    game = HangmanGame.restore(snapshot, self.storage)
+                except ValueError:
+                    continue
+                if not game.game_over:
+                    game.pause()
+                    self.suspended[game.player1] = self.suspended[game.player2] = game
+            self._checkpoints = asyncio.create_task(self._checkpoint_loop())
+        
+        self.server = await asyncio.start_server(
+            self._serve_client, self.host, self.port, limit=SERVER_MAX_LINE, backlog=SERVER_BACKLOG
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+    
+    async def checkpoint(self):
+        games = {id(game): game for game in self.suspended.values()}
+        games.update((id(session.game), session.game) for session in self.sessions.values())
+        snapshots = [game.snapshot() for game in games.values()]
+        await asyncio.get_running_loop().run_in_executor(None, write_checkpoint, self.checkpoint_path, snapshots)
+    
+    async def _checkpoint_loop(self):
+        while True:
+            await asyncio.sleep(SERVER_CHECKPOINT_INTERVAL)
+            await self.checkpoint()
+    
+    async def close(self):
+        self.server.close()
+        if self._checkpoints:
+            self._checkpoints.cancel()
+            await self.checkpoint()
+            for session in list(self.sessions.values()):
+                self._suspend(session)
+        clients = list(self.clients)
+        for player in clients:
+            player.writer.close()
+        await asyncio.gather(*(player.task for player in clients), return_exceptions=True)
+        await self.server.wait_closed()
+    
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        player = Player(writer)
+        self.clients.add(player)
+        self.stats['connections'] += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    player.send(_error("Wiadomość jest za długa"))
+                    break
+                if not line:
+                    break
+                
+                try:
+                    message = decode_message(line)
+                except ValueError:
+                    player.send(_error("Nieprawidłowa wiadomość"))
+                    continue
+                
+                if player.username is None:
+                    if message['type'] == 'hello':
+                        await self._hello(player, message)
+                    else:
+                        player.send(_error("Najpierw wyślij wiadomość hello"))
+                else:
+                    handler = self._handlers.get(message['type'])
+                    if handler:
+                        result = handler(player, message)
+                        if asyncio.iscoroutine(result):
+                            await result
+                    else:
+                        player.send(_error("Nieznany typ wiadomości"))
+                
+                if writer.transport.get_write_buffer_size() > SERVER_WRITE_HIGH_WATER:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(player)
+            self._leave(player, None)
+            writer.close()
+    
+    async def _hello(self, player: Player, message: dict):
+        username = None
+        if self.authenticate:
+            token = message.get('token')
+            if isinstance(token, str):
+                loop = asyncio.get_running_loop()
+                username = await loop.run_in_executor(None, self.storage.authenticate_session, token)
+        else:
+            name = message.get('username')
+            if isinstance(name, str) and name.strip():
+                username = name.strip()
+        
+        if not username:
+            player.send(_error("Nieprawidłowa sesja"))
+            return
+        player.username = username
+        player.send({'type': 'welcome', 'username': username})
+    
+    async def _play(self, player: Player, message: dict):
+        if player.session or player.queue_key:
+            player.send(_error("Już oczekujesz na grę"))
+            return
+        
+        mode = message.get('mode', 'classic')
+        category = message.get('category')
+        difficulty = message.get('difficulty')
+        if (mode not in SERVER_GAME_MODES or not (category is None or isinstance(category, str))
+                or not (difficulty is None or (isinstance(difficulty, str) and difficulty in DIFFICULTY_LEVELS))):
+            player.send(_error("Nieprawidłowe ustawienia gry"))
+            return
+        await asyncio.wrap_future(self.storage.preload_words(category, difficulty))
+        
+        resumed = self.suspended.get(player.username)
+        if resumed and not message.get('resume', True):
+            self.suspended.pop(resumed.player1, None)
+            self.suspended.pop(resumed.player2, None)
+            resumed = None
+        key = ('resume', resumed.player1, resumed.player2) if resumed else (mode, category, difficulty)
+        
+        queue = self.waiting.get(key)
+        opponent = self._match(queue, player.username) if queue else None
+        if opponent is None:
+            self.waiting.setdefault(key, deque()).append(player)
+            player.queue_key = key
+            player.send({'type': 'waiting'})
+            return
+        
+        if not queue:
+            del self.waiting[key]
+        opponent.queue_key = None
+        
+        if resumed:
+            self.suspended.pop(resumed.player1, None)
+            self.suspended.pop(resumed.player2, None)
+            if opponent.username == resumed.player1:
+                self._start(opponent, player, resumed)
+            else:
+                self._start(player, opponent, resumed)
+            return
+        
+        try:
+            game = HangmanGame(opponent.username, player.username, mode, category, difficulty, self.storage)
+        except ValueError as e:
+            opponent.send(_error(str(e)))
+            player.send(_error(str(e)))
+            return
+        self._start(opponent, player, game)
+    
+    def _match(self, queue: deque, username: str) -> Optional[Player]:
+        for index, waiting in enumerate(queue):
+            if waiting.username != username:
+                del queue[index]
+                return waiting
+        return None
+    
+    def _start(self, first: Player, second: Player, game: HangmanGame):
+        session = GameSession(next(self._ids), game, (first, second))
+        self.sessions[session.id] = session
+        first.session = second.session = session
+        game.resume()
+        if game.time_limit:
+            session.timer = asyncio.get_running_loop().call_later(game.get_time_left(), self._expire, session)
+        self.stats['games_started'] += 1
+        
+        session.broadcast({
+            'type': 'start',
+            'game': session.id,
+            'players': [game.player1, game.player2],
+            'mode': game.game_mode,
+            'category': game.category,
+            'display': game.display_word,
+            'guessed': ''.join(letter for letter in ALPHABET if game.is_guessed(letter)),
+            'mistakes': game.mistakes,
+            'max_mistakes': game.max_mistakes,
+            'turn': game.current_player,
+            'time_limit': game.time_limit,
+            'elapsed': game.get_elapsed(),
+            'has_hint': not game.hint_used and bool(game.hint),
+        })
+    
+    def _guess(self, player: Player, message: dict):
+        session = player.session
+        if session is None:
+            player.send(_error("Nie uczestniczysz w grze"))
+            return
+        
+        game = session.game
+        if game.is_time_up():
+            self._expire(session)
+            return
+        if game.current_player != player.username:
+            player.send(_error("Teraz tura przeciwnika"))
+            return
+        
+        letter = message.get('letter')
+        if not isinstance(letter, str) or len(letter) != 1 or letter.upper() not in ALPHABET:
+            player.send(_error("Nieprawidłowa litera"))
+            return
+        letter = letter.upper()
+        if game.is_guessed(letter):
+            player.send(_error("Ta litera już była"))
+            return
+        
+        hit = game.guess_letter(letter)
+        self.stats['guesses'] += 1
+        session.broadcast({
+            'type': 'state',
+            'by': player.username,
+            'letter': letter,
+            'hit': hit,
+            'display': game.display_word,
+            'mistakes': game.mistakes,
+            'turn': game.current_player,
+            'game_over': game.game_over,
+        })
+        if game.game_over:
+            self._finish(session)
+    
+    def _hint(self, player: Player, message: dict):
+        session = player.session
+        if session is None:
+            player.send(_error("Nie uczestniczysz w grze"))
+            return
+        
+        hint = session.game.use_hint()
+        if not hint:
+            player.send(_error("Podpowiedź jest niedostępna"))
+            return
+        session.broadcast({'type': 'hint', 'by': player.username, 'hint': hint})
+    
+    def _leave(self, player: Player, message: Optional[dict]):
+        if player.queue_key:
+            queue = self.waiting.get(player.queue_key)
+            if queue is not None:
+                queue.remove(player)
+                if not queue:
+                    del self.waiting[player.queue_key]
+            player.queue_key = None
+        
+        session = player.session
+        if session:
+            session.game.game_over = True
+            session.game.winner = session.opponent(player).username
+            self._finish(session, 'left')
+    
+    def _expire(self, session: GameSession):
+        if session.id in self.sessions and session.game.time_out():
+            self._finish(session, 'timeout')
+    
+    def _suspend(self, session: GameSession):
+        if session.timer:
+            session.timer.cancel()
+        session.game.pause()
+        del self.sessions[session.id]
+        for player in session.players:
+            player.session = None
+    
+    def _finish(self, session: GameSession, reason: str = None):
+        self._suspend(session)
+        game = session.game
+        game.save_result()
+        self.stats['games_finished'] += 1
+        session.broadcast({'type': 'over', 'winner': game.winner, 'word': game.word, 'reason': reason})
+
+
+async def serve(host: str, port: int, authenticate: bool = True, checkpoint_path: str = None,
+                storage: Storage = None):
+    server = HangmanServer(host, port, authenticate, checkpoint_path, storage)
+    await server.start()
+    print(f"Serwer nasłuchuje na {server.host}:{server.port}", flush=True)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signum, stop.set)
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        server.storage.close()
+        event_log.close()
+        print("Statystyki: " + ", ".join(f"{name} {value}" for name, value in server.stats.items()), file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serwer gry sieciowej w wisielca")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('-p', '--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--db', help="ścieżka do bazy danych (domyślnie DATABASE_PATH)")
+    parser.add_argument('--no-auth', action='store_true',
+                        help="przyjmuj nazwy graczy bez tokenu sesji (testy obciążeniowe)")
+    parser.add_argument('--checkpoint', help="plik z zapisem trwających gier, wznawianych po restarcie")
+    parser.add_argument('--events', help="katalog dziennika ruchów (domyślnie EVENT_LOG_DIR)")
+    args = parser.parse_args()
+    
+    storage = SQLiteStorage(args.db)
+    if args.events:
+        event_log.set_directory(args.events)
+    try:
+        asyncio.run(serve(args.host, args.port, not args.no_auth, args.checkpoint, storage))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
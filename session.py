@@ -0,0 +1,22 @@
+import os
+from typing import Optional
+from config import SESSION_TOKEN_PATH
+
+def load_token() -> Optional[str]:
+    try:
+        with open(SESSION_TOKEN_PATH, 'r', encoding='utf-8') as file:
+            return file.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def save_token(token: str):
+    os.makedirs(os.path.dirname(SESSION_TOKEN_PATH), mode=0o700, exist_ok=True)
+    fd = os.open(SESSION_TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        file.write(token)
+
+def clear_token():
+    try:
+        os.remove(SESSION_TOKEN_PATH)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from config import MAX_MISTAKES
+from hangman_engine import ALPHABET, HangmanEngine
+from solver import WordIndex
+
+LETTER_FREQUENCY = "AIOEZNRWSCTKYDPMUJLŁBGĘHĄÓŻŚĆFŃŹVQX"
+
+_words = None
+_index = None
+
+
+def random_strategy(game: HangmanEngine, rng: random.Random) -> Optional[str]:
+    letters = [letter for letter in ALPHABET if not game.is_guessed(letter)]
+    return rng.choice(letters) if letters else None
+
+
+def frequency_strategy(game: HangmanEngine, rng: random.Random) -> Optional[str]:
+    for letter in LETTER_FREQUENCY:
+        if not game.is_guessed(letter):
+            return letter
+    return None
+
+
+def solver_strategy(game: HangmanEngine, rng: random.Random) -> Optional[str]:
+    global _index
+    if _index is None:
+        _index = WordIndex(word for word, _ in _words)
+    return _index.suggest(game.display_word, game.guessed_mask)
+
+
+STRATEGIES = {
+    'random': random_strategy,
+    'frequency': frequency_strategy,
+    'solver': solver_strategy,
+}
+
+
+def play_game(word: str, category: str, strategy, rng: random.Random) -> Tuple[bool, int]:
+    game = HangmanEngine(word, None, "sim", category=category)
+    while not game.game_over:
+        letter = strategy(game, rng)
+        if letter is None:
+            break
+        game.guess_letter(letter)
+    return game.is_word_guessed(), game.mistakes
+
+
+class SimulationResult:
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.mistakes = [0] * (MAX_MISTAKES + 1)
+        self.per_word = {}
+    
+    def record(self, index: int, won: bool, mistakes: int):
+        self.games += 1
+        self.wins += won
+        self.mistakes[min(mistakes, MAX_MISTAKES)] += 1
+        stats = self.per_word.get(index)
+        if stats is None:
+            stats = self.per_word[index] = [0, 0, 0]
+        stats[0] += 1
+        stats[1] += won
+        stats[2] += mistakes
+    
+    def merge(self, other: "SimulationResult"):
+        self.games += other.games
+        self.wins += other.wins
+        self.mistakes = [a + b for a, b in zip(self.mistakes, other.mistakes)]
+        for index, (games, wins, mistakes) in other.per_word.items():
+            stats = self.per_word.get(index)
+            if stats is None:
+                self.per_word[index] = [games, wins, mistakes]
+            else:
+                stats[0] += games
+                stats[1] += wins
+                stats[2] += mistakes
+    
+    def per_category(self, words: List[Tuple[str, str]]) -> Dict[str, List[int]]:
+        categories = {}
+        for index, (games, wins, mistakes) in self.per_word.items():
+            stats = categories.setdefault(words[index][1], [0, 0, 0])
+            stats[0] += games
+            stats[1] += wins
+            stats[2] += mistakes
+        return categories
+    
+    def to_dict(self, words: List[Tuple[str, str]]) -> dict:
+        def rows(items):
+            return {
+                key: {'games': games, 'win_rate': wins / games, 'avg_mistakes': mistakes / games}
+                for key, (games, wins, mistakes) in items
+            }
+        
+        return {
+            'games': self.games,
+            'win_rate': self.wins / self.games if self.games else 0.0,
+            'mistakes': self.mistakes,
+            'categories': rows(self.per_category(words).items()),
+            'words': rows((f"{words[i][0]} ({words[i][1]})", stats) for i, stats in self.per_word.items()),
+        }
+
+
+def _init_worker(words: List[Tuple[str, str]]):
+    global _words, _index
+    _words = words
+    _index = None
+
+
+def simulate_chunk(strategy_name: str, games: int, seed: int) -> SimulationResult:
+    rng = random.Random(seed)
+    strategy = STRATEGIES[strategy_name]
+    words = _words
+    result = SimulationResult()
+    for _ in range(games):
+        index = rng.randrange(len(words))
+        word, category = words[index]
+        won, mistakes = play_game(word, category, strategy, rng)
+        result.record(index, won, mistakes)
+    return result
+
+
+def simulate(words: List[Tuple[str, str]], games: int, strategy: str = 'frequency', processes: int = None,
+             chunk_size: int = 10000, seed: int = None, progress=None) -> SimulationResult:
+    seeds = random.Random(seed)
+    chunks = [min(chunk_size, games - start) for start in range(0, games, chunk_size)]
+    result = SimulationResult()
+    
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(words,)) as executor:
+        futures = [executor.submit(simulate_chunk, strategy, size, seeds.getrandbits(64)) for size in chunks]
+        for future in as_completed(futures):
+            result.merge(future.result())
+            if progress:
+                progress(result)
+    return result
+
+
+def load_words(db_path: str = None, words_path: str = None, category: str = None) -> List[Tuple[str, str]]:
+    if words_path:
+        from database import read_word_list
+        rows = read_word_list(words_path, category=category)
+        return [(word.strip().upper(), row_category) for word, row_category, _ in rows if word.strip() and row_category]
+    
+    with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as conn:
+        if category:
+            rows = conn.execute("SELECT word, category FROM words WHERE category = ?", (category,)).fetchall()
+        else:
+            rows = conn.execute("SELECT word, category FROM words").fetchall()
+    return [(word.upper(), row_category) for word, row_category in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulator gier w wisielca bez interfejsu")
+    parser.add_argument('-g', '--games', type=int, default=1_000_000)
+    parser.add_argument('-s', '--strategy', choices=list(STRATEGIES), default='frequency')
+    parser.add_argument('-p', '--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--db', help="ścieżka do bazy danych (domyślnie DATABASE_PATH)")
+    parser.add_argument('--words', help="plik z listą słów zamiast bazy danych")
+    parser.add_argument('-c', '--category')
+    parser.add_argument('-o', '--output', help="zapisz pełne wyniki jako JSON")
+    args = parser.parse_args()
+    
+    db_path = args.db
+    if not db_path and not args.words:
+        from config import DATABASE_PATH
+        db_path = DATABASE_PATH
+    words = load_words(db_path, args.words, args.category)
+    if not words:
+        print("Brak słów do symulacji", file=sys.stderr)
+        sys.exit(1)
+    
+    start = time.perf_counter()
+    
+    def progress(result):
+        elapsed = time.perf_counter() - start
+        print(f"\rGry: {result.games}/{args.games} ({result.games / elapsed:,.0f}/s), "
+              f"wygrane: {result.wins / result.games * 100:.1f}%", end='', file=sys.stderr, flush=True)
+    
+    result = simulate(words, args.games, args.strategy, args.processes, args.chunk_size, args.seed, progress)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+    
+    summary = result.to_dict(words)
+    print(f"Gry: {result.games} w {elapsed:.1f}s ({result.games / elapsed:,.0f}/s), procesy: {args.processes}")
+    print(f"Współczynnik wygranych: {summary['win_rate'] * 100:.1f}%")
+    print("Rozkład błędów: " + ", ".join(f"{i}: {count}" for i, count in enumerate(result.mistakes)))
+    print("Kategorie:")
+    for category, stats in sorted(summary['categories'].items(), key=lambda item: item[1]['win_rate']):
+        print(f"  {category:<20} gry {stats['games']:>9}  wygrane {stats['win_rate'] * 100:5.1f}%  "
+              f"śr. błędy {stats['avg_mistakes']:.2f}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(summary, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from hangman_engine import ALPHABET, LETTER_BITS
+
+HIDDEN = '_'
+
+
+def _bitset(mask) -> int:
+    import numpy as np
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+class _Bucket:
+    __slots__ = ('words', 'all', 'positions', 'counts', 'contains')
+    
+    def __init__(self, words: List[str]):
+        import numpy as np
+        
+        length = len(words[0])
+        self.words = words
+        self.all = (1 << len(words)) - 1
+        codes = np.frombuffer(''.join(words).encode('utf-32-le'), dtype=np.uint32).reshape(len(words), length)
+        
+        self.positions: List[Dict[str, int]] = []
+        for position in range(length):
+            column = codes[:, position]
+            self.positions.append({chr(code): _bitset(column == code) for code in np.unique(column).tolist()})
+        
+        self.counts: Dict[str, Dict[int, int]] = {}
+        self.contains: Dict[str, int] = {}
+        for letter in ALPHABET:
+            per_word = (codes == ord(letter)).sum(axis=1)
+            if not per_word.any():
+                continue
+            counts = {count: _bitset(per_word == count) for count in np.unique(per_word).tolist()}
+            self.counts[letter] = counts
+            self.contains[letter] = self.all & ~counts.get(0, 0)
+
+
+class WordIndex:
+
+    def __init__(self, words: Iterable[str]):
+        by_length: Dict[int, List[str]] = {}
+        for word in dict.fromkeys(word.upper() for word in words):
+            if word:
+                by_length.setdefault(len(word), []).append(word)
+        self.buckets = {length: _Bucket(bucket) for length, bucket in by_length.items()}
+        self.size = sum(len(bucket.words) for bucket in self.buckets.values())
+        
+        totals = {letter: 0 for letter in ALPHABET}
+        for bucket in self.buckets.values():
+            for letter, contains in bucket.contains.items():
+                totals[letter] += contains.bit_count()
+        self.frequency_order = sorted(ALPHABET, key=lambda letter: -totals[letter])
+    
+    def _filter(self, pattern: str, guessed_mask: int) -> Tuple[Optional[_Bucket], int]:
+        bucket = self.buckets.get(len(pattern))
+        if bucket is None:
+            return None, 0
+        
+        result = bucket.all
+        revealed = {}
+        for position, char in enumerate(pattern):
+            if char != HIDDEN:
+                result &= bucket.positions[position].get(char, 0)
+                revealed[char] = revealed.get(char, 0) + 1
+        
+        for letter, bit in LETTER_BITS.items():
+            if guessed_mask & bit:
+                counts = bucket.counts.get(letter)
+                if counts is not None:
+                    result &= counts.get(revealed.get(letter, 0), 0)
+                elif letter in revealed:
+                    return bucket, 0
+        return bucket, result
+    
+    def candidates(self, pattern: str, guessed_mask: int = 0) -> List[str]:
+        bucket, result = self._filter(pattern, guessed_mask)
+        words = []
+        while result:
+            low = result & -result
+            words.append(bucket.words[low.bit_length() - 1])
+            result ^= low
+        return words
+    
+    def count(self, pattern: str, guessed_mask: int = 0) -> int:
+        return self._filter(pattern, guessed_mask)[1].bit_count()
+    
+    def suggest(self, pattern: str, guessed_mask: int = 0) -> Optional[str]:
+        bucket, result = self._filter(pattern, guessed_mask)
+        if result:
+            best, best_count = None, 0
+            for letter, contains in bucket.contains.items():
+                if not guessed_mask & LETTER_BITS[letter]:
+                    count = (result & contains).bit_count()
+                    if count > best_count:
+                        best, best_count = letter, count
+            if best:
+                return best
+        
+        for letter in self.frequency_order:
+            if not guessed_mask & LETTER_BITS[letter]:
+                return letter
+        return None
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='solver')
+_indexes: Dict[Tuple[object, Optional[str]], Tuple[int, Future]] = {}
+_lock = threading.Lock()
+
+
+def _build_index(category: Optional[str], storage) -> WordIndex:
+    return WordIndex(storage.get_words(category))
+
+
+def load_index(category: str = None, storage=None) -> Future:
+    if storage is None:
+        from storage import default_storage as storage
+    generation = storage.word_generation()
+    with _lock:
+        cached = _indexes.get((storage, category))
+        if cached is None or cached[0] != generation:
+            for key in [key for key, (built, _) in _indexes.items() if key[0] is storage and built != generation]:
+                del _indexes[key]
+            cached = _indexes[storage, category] = (generation, _executor.submit(_build_index, category, storage))
+        return cached[1]
\ No newline at end of file
@@ -0,0 +1,376 @@
+import bisect
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import database
+from config import (DATABASE_PATH, SESSION_TTL, EXPORT_CHUNK_SIZE, HISTORY_PAGE_SIZE, LEADERBOARD_MIN_GAMES,
+                    WORD_REPEAT_WINDOW, DIFFICULTY_LEVELS)
+from database import ALL_MODES, game_result_stats, normalize_words, recent_words
+from encryption import (hash_password, verify_password, needs_rehash, submit_auth, generate_session_token,
+                        split_session_token, verify_session_verifier)
+
+
+def _completed(value=None) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class Storage(ABC):
+
+    @abstractmethod
+    def create_user(self, username: str, password: str) -> bool:
+        ...
+    
+    @abstractmethod
+    def authenticate_user(self, username: str, password: str) -> bool:
+        ...
+    
+    def create_user_async(self, username: str, password: str) -> Future:
+        return submit_auth(self.create_user, username, password)
+    
+    def authenticate_user_async(self, username: str, password: str) -> Future:
+        return submit_auth(self.authenticate_user, username, password)
+    
+    def _login(self, username: str, password: str) -> Optional[str]:
+        if not self.authenticate_user(username, password):
+            return None
+        return self.create_session(username)
+    
+    def login_async(self, username: str, password: str) -> Future:
+        return submit_auth(self._login, username, password)
+    
+    @abstractmethod
+    def create_session(self, username: str, ttl: float = SESSION_TTL) -> str:
+        ...
+    
+    @abstractmethod
+    def authenticate_session(self, token: str) -> Optional[str]:
+        ...
+    
+    def authenticate_session_async(self, token: str) -> Future:
+        return _completed(self.authenticate_session(token))
+    
+    @abstractmethod
+    def revoke_session(self, token: str):
+        ...
+    
+    @abstractmethod
+    def get_user_stats(self, username: str) -> Tuple[int, int]:
+        ...
+    
+    @abstractmethod
+    def add_words(self, rows: Iterable[Tuple[str, str, Optional[str]]]) -> int:
+        ...
+    
+    @abstractmethod
+    def get_categories(self) -> List[str]:
+        ...
+    
+    @abstractmethod
+    def get_words(self, category: str = None) -> List[str]:
+        ...
+    
+    @abstractmethod
+    def get_random_word(self, category: str = None, username: str = None,
+                        difficulty: str = None) -> Optional[Tuple[str, str]]:
+        ...
+    
+    def prefetch_word(self, category: str = None, username: str = None, difficulty: str = None) -> Future:
+        return _completed()
+    
+    def preload_words(self, category: str = None, difficulty: str = None) -> Future:
+        return _completed()
+    
+    def word_generation(self) -> int:
+        return 0
+    
+    def warm_up(self) -> Future:
+        return _completed(self.get_categories())
+    
+    @abstractmethod
+    def record_game_result(self, player1: str, player2: str, word: str, winner: str, game_mode: str):
+        ...
+    
+    @abstractmethod
+    def count_game_history(self, username: str = None) -> int:
+        ...
+    
+    @abstractmethod
+    def iter_game_history(self, username: str = None, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Tuple]]:
+        ...
+    
+    @abstractmethod
+    def get_user_history(self, username: str, before_id: int = None, limit: int = HISTORY_PAGE_SIZE) -> List[Tuple]:
+        ...
+    
+    @abstractmethod
+    def get_leaderboard(self, game_mode: str = ALL_MODES, order_by: str = 'wins', limit: int = 10,
+                        min_games: int = LEADERBOARD_MIN_GAMES) -> List[Tuple]:
+        ...
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+class SQLiteStorage(Storage):
+
+    def __init__(self, path: str = None):
+        self.db = database.Database(path or DATABASE_PATH)
+    
+    def create_user(self, username: str, password: str) -> bool:
+        return self.db.create_user(username, password)
+    
+    def authenticate_user(self, username: str, password: str) -> bool:
+        return self.db.authenticate_user(username, password)
+    
+    def create_session(self, username: str, ttl: float = SESSION_TTL) -> str:
+        return self.db.create_session(username, ttl)
+    
+    def authenticate_session(self, token: str) -> Optional[str]:
+        return self.db.authenticate_session(token)
+    
+    def authenticate_session_async(self, token: str) -> Future:
+        return self.db.authenticate_session_async(token)
+    
+    def revoke_session(self, token: str):
+        self.db.revoke_session(token)
+    
+    def get_user_stats(self, username: str) -> Tuple[int, int]:
+        return self.db.get_user_stats(username)
+    
+    def add_words(self, rows: Iterable[Tuple[str, str, Optional[str]]]) -> int:
+        return self.db.import_words(rows)
+    
+    def get_categories(self) -> List[str]:
+        return self.db.get_categories()
+    
+    def get_words(self, category: str = None) -> List[str]:
+        return self.db.get_words(category)
+    
+    def get_random_word(self, category: str = None, username: str = None,
+                        difficulty: str = None) -> Optional[Tuple[str, str]]:
+        return self.db.get_random_word(category, username, difficulty)
+    
+    def prefetch_word(self, category: str = None, username: str = None, difficulty: str = None) -> Future:
+        return self.db.prefetch_word(category, username, difficulty)
+    
+    def preload_words(self, category: str = None, difficulty: str = None) -> Future:
+        return self.db.preload_words(category, difficulty)
+    
+    def word_generation(self) -> int:
+        return self.db.word_generation()
+    
+    def warm_up(self) -> Future:
+        return self.db.warm_up()
+    
+    def record_game_result(self, player1: str, player2: str, word: str, winner: str, game_mode: str):
+        self.db.record_game_result(player1, player2, word, winner, game_mode)
+    
+    def count_game_history(self, username: str = None) -> int:
+        return self.db.count_game_history(username)
+    
+    def iter_game_history(self, username: str = None, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Tuple]]:
+        return self.db.iter_game_history(username, chunk_size)
+    
+    def get_user_history(self, username: str, before_id: int = None, limit: int = HISTORY_PAGE_SIZE) -> List[Tuple]:
+        return self.db.get_user_history(username, before_id, limit)
+    
+    def get_leaderboard(self, game_mode: str = ALL_MODES, order_by: str = 'wins', limit: int = 10,
+                        min_games: int = LEADERBOARD_MIN_GAMES) -> List[Tuple]:
+        return self.db.get_leaderboard(game_mode, order_by, limit, min_games)
+    
+    def flush(self):
+        self.db.flush_writes()
+    
+    def close(self):
+        self.db.close()
+
+
+class MemoryStorage(Storage):
+
+    def __init__(self, words: Iterable[Tuple[str, str, Optional[str]]] = (), repeat_window: int = WORD_REPEAT_WINDOW):
+        self.repeat_window = repeat_window
+        self._lock = threading.RLock()
+        self._users: Dict[str, List] = {}
+        self._sessions: Dict[str, Tuple[str, str, float]] = {}
+        self._words: List[str] = []
+        self._categories: List[str] = []
+        self._hints: List[Optional[str]] = []
+        self._word_keys = set()
+        self._difficulty = None
+        self._generation = 0
+        self._pools: Dict[Tuple[Optional[str], Optional[str]], List[int]] = {}
+        self._recent: OrderedDict = OrderedDict()
+        self._history: List[Tuple] = []
+        self._user_games: Dict[str, List[int]] = {}
+        self._leaderboard: Dict[Tuple[str, str], List[int]] = {}
+        self._rankings: Dict[str, Dict[str, List[Tuple]]] = {}
+        if words:
+            self.add_words(words)
+    
+    def create_user(self, username: str, password: str) -> bool:
+        password_hash = hash_password(password)
+        with self._lock:
+            if username in self._users:
+                return False
+            self._users[username] = [password_hash, 0, 0]
+            return True
+    
+    def authenticate_user(self, username: str, password: str) -> bool:
+        user = self._users.get(username)
+        if not user or not verify_password(password, user[0]):
+            return False
+        if needs_rehash(user[0]):
+            user[0] = hash_password(password)
+        return True
+    
+    def create_session(self, username: str, ttl: float = SESSION_TTL) -> str:
+        token, selector, verifier_hash = generate_session_token()
+        self._sessions[selector] = (verifier_hash, username, time.time() + ttl)
+        return token
+    
+    def authenticate_session(self, token: str) -> Optional[str]:
+        selector, verifier = split_session_token(token)
+        session = self._sessions.get(selector)
+        if session and session[2] > time.time() and verify_session_verifier(verifier, session[0]):
+            return session[1]
+        return None
+    
+    def revoke_session(self, token: str):
+        selector, _ = split_session_token(token)
+        self._sessions.pop(selector, None)
+    
+    def get_user_stats(self, username: str) -> Tuple[int, int]:
+        user = self._users.get(username)
+        return (user[1], user[2]) if user else (0, 0)
+    
+    def add_words(self, rows: Iterable[Tuple[str, str, Optional[str]]]) -> int:
+        added = 0
+        with self._lock:
+            for word, category, hint in normalize_words(rows):
+                if (word, category) in self._word_keys:
+                    continue
+                self._word_keys.add((word, category))
+                self._words.append(word)
+                self._categories.append(category)
+                self._hints.append(hint)
+                added += 1
+            if added:
+                self._difficulty = None
+                self._pools.clear()
+                self._generation += 1
+        return added
+    
+    def get_categories(self) -> List[str]:
+        with self._lock:
+            return sorted(set(self._categories))
+    
+    def _pool(self, category: Optional[str], difficulty: Optional[str]) -> List[int]:
+        pool = self._pools.get((category, difficulty))
+        if pool is None:
+            indexes = range(len(self._words))
+            if category is not None:
+                indexes = [i for i in indexes if self._categories[i] == category]
+            if difficulty is not None:
+                if self._difficulty is None:
+                    from difficulty import difficulty_scores
+                    self._difficulty = difficulty_scores(self._words).tolist()
+                low, high = DIFFICULTY_LEVELS[difficulty]
+                indexes = [i for i in indexes if low <= self._difficulty[i] < high]
+            pool = self._pools[category, difficulty] = list(indexes)
+        return pool
+    
+    def word_generation(self) -> int:
+        return self._generation
+    
+    def get_words(self, category: str = None) -> List[str]:
+        with self._lock:
+            return [self._words[i] for i in self._pool(category, None)]
+    
+    def get_random_word(self, category: str = None, username: str = None,
+                        difficulty: str = None) -> Optional[Tuple[str, str]]:
+        if difficulty is not None and difficulty not in DIFFICULTY_LEVELS:
+            raise ValueError(f"Nieznany poziom trudności: {difficulty}")
+        with self._lock:
+            pool = self._pool(category, difficulty)
+            if not pool and difficulty is not None:
+                pool = self._pool(category, None)
+            if not pool:
+                return None
+            
+            recent = recent_words(self._recent, username, self.repeat_window)
+            window = min(len(recent), len(pool) - 1)
+            avoid = list(recent)[len(recent) - window:]
+            for _ in range(16):
+                index = pool[random.randrange(len(pool))]
+                if self._words[index] not in avoid:
+                    break
+            recent.append(self._words[index])
+            return self._words[index], self._hints[index]
+    
+    def record_game_result(self, player1: str, player2: str, word: str, winner: str, game_mode: str):
+        with self._lock:
+            game_id = len(self._history) + 1
+            self._history.append((game_id, player1, player2, word, winner, game_mode))
+            for username in dict.fromkeys(filter(None, (player1, player2))):
+                self._user_games.setdefault(username, []).append(game_id)
+            
+            for username, won in game_result_stats(player1, player2, winner):
+                user = self._users.get(username)
+                if user is None:
+                    continue
+                user[1] += 1
+                user[2] += won
+                for mode in (game_mode, ALL_MODES):
+                    played_won = self._leaderboard.setdefault((username, mode), [0, 0])
+                    played_won[0] += 1
+                    played_won[1] += won
+                    self._rankings.pop(mode, None)
+    
+    def count_game_history(self, username: str = None) -> int:
+        if username:
+            return len(self._user_games.get(username, ()))
+        return len(self._history)
+    
+    def iter_game_history(self, username: str = None, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Tuple]]:
+        with self._lock:
+            if username:
+                rows = [self._history[game_id - 1] for game_id in self._user_games.get(username, ())]
+            else:
+                rows = list(self._history)
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+    
+    def get_user_history(self, username: str, before_id: int = None, limit: int = HISTORY_PAGE_SIZE) -> List[Tuple]:
+        with self._lock:
+            game_ids = self._user_games.get(username, [])
+            end = len(game_ids) if before_id is None else bisect.bisect_left(game_ids, before_id)
+            page = []
+            for game_id in reversed(game_ids[max(0, end - limit):end]):
+                _, _, _, word, winner, game_mode = self._history[game_id - 1]
+                page.append((game_id, word, game_mode, winner))
+            return page
+    
+    def get_leaderboard(self, game_mode: str = ALL_MODES, order_by: str = 'wins', limit: int = 10,
+                        min_games: int = LEADERBOARD_MIN_GAMES) -> List[Tuple]:
+        column = {'wins': 2, 'win_rate': 3}[order_by]
+        with self._lock:
+            rankings = self._rankings.setdefault(game_mode, {})
+            ranking = rankings.get(order_by)
+            if ranking is None:
+                rows = [(username, played, won, won / played)
+                        for (username, mode), (played, won) in self._leaderboard.items() if mode == game_mode]
+                ranking = rankings[order_by] = sorted(rows, key=lambda row: row[column], reverse=True)
+        return list(islice((row for row in ranking if row[1] >= min_games), limit))
+
+default_storage = SQLiteStorage()
\ No newline at end of file
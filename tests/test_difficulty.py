@@ -0,0 +1,18 @@
+from config import DIFFICULTY_LEVELS
+from difficulty import difficulty_scores
+
+SEED_WORDS = ["SŁOŃ", "ŻYRAFA", "PINGWIN", "POLSKA", "FRANCJA", "CHINY", "PIZZA", "SUSHI", "PIEROGI", "PIŁKA",
+              "TENIS", "KOMPUTER", "INTERNET", "ATOM"]
+
+
+def test_longer_words_with_more_letters_are_harder():
+    scores = dict(zip(SEED_WORDS, difficulty_scores(SEED_WORDS)))
+    assert scores["KOMPUTER"] > scores["ATOM"]
+    assert scores["KOMPUTER"] >= DIFFICULTY_LEVELS['hard'][0]
+    assert scores["ATOM"] < DIFFICULTY_LEVELS['easy'][1]
+
+
+def test_scores_are_percentile_ranks():
+    scores = difficulty_scores(SEED_WORDS)
+    assert len(scores) == len(SEED_WORDS)
+    assert ((scores >= 0) & (scores < 1)).all()
@@ -0,0 +1,14 @@
+import pytest
+
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'test.db'))
+    yield db
+    db.close()
+
+
+def test_hot_queries_use_indexes(db):
+    assert db.check_query_plans() == []
@@ -0,0 +1,27 @@
+import sqlite3
+
+import pytest
+
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'test.db'))
+    db.create_user('gracz', 'haslo')
+    yield db
+    db.close()
+
+
+def test_bad_row_does_not_block_later_results(db):
+    db.record_game_result('gracz', None, 'ATOM', 'gracz', 'classic')
+    db.record_game_result(None, None, 'ATOM', None, 'classic')
+    db.record_game_result('gracz', None, 'KOT', None, 'classic')
+    with pytest.raises(sqlite3.IntegrityError):
+        db.flush_writes()
+    
+    db.record_game_result('gracz', None, 'PIES', 'gracz', 'classic')
+    db.flush_writes()
+    stats = db.get_write_queue_stats()
+    assert (stats['written'], stats['dropped'], stats['depth']) == (3, 1, 0)
+    assert db.get_user_stats('gracz') == (3, 2)
\ No newline at end of file
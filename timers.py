@@ -0,0 +1,106 @@
+import heapq
+import itertools
+import time
+from typing import Callable, List, Optional
+
+
+class Timer:
+    __slots__ = ('scheduler', 'entry', 'remaining', 'callback', 'args')
+    
+    def __init__(self, scheduler: "TimerScheduler", callback: Callable, args: tuple):
+        self.scheduler = scheduler
+        self.entry = None
+        self.remaining = None
+        self.callback = callback
+        self.args = args
+    
+    @property
+    def active(self) -> bool:
+        return self.entry is not None
+    
+    @property
+    def paused(self) -> bool:
+        return self.remaining is not None
+    
+    @property
+    def deadline(self) -> Optional[float]:
+        return self.entry[0] if self.entry else None
+    
+    def cancel(self):
+        self.remaining = None
+        if self.entry is not None:
+            self.entry = None
+            self.scheduler._cancelled += 1
+    
+    def pause(self):
+        if self.entry is not None:
+            remaining = max(0.0, self.entry[0] - self.scheduler.clock())
+            self.cancel()
+            self.remaining = remaining
+    
+    def resume(self):
+        if self.remaining is not None:
+            self.scheduler._push(self, self.scheduler.clock() + self.remaining)
+            self.remaining = None
+
+
+class TimerScheduler:
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._heap: List[tuple] = []
+        self._ids = itertools.count()
+        self._cancelled = 0
+    
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+    
+    def _push(self, timer: Timer, deadline: float):
+        timer.entry = (deadline, next(self._ids), timer)
+        heapq.heappush(self._heap, timer.entry)
+    
+    def schedule(self, delay: float, callback: Callable, *args) -> Timer:
+        timer = Timer(self, callback, args)
+        self._push(timer, self.clock() + max(0.0, delay))
+        return timer
+    
+    def _discard_cancelled(self):
+        heap = self._heap
+        while heap and heap[0][2].entry is not heap[0]:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        if self._cancelled > 64 and self._cancelled > len(heap) // 2:
+            self._heap = [entry for entry in heap if entry[2].entry is entry]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+    
+    def next_deadline(self) -> Optional[float]:
+        self._discard_cancelled()
+        return self._heap[0][0] if self._heap else None
+    
+    def next_timeout_ms(self) -> Optional[int]:
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        return max(0, int((deadline - self.clock()) * 1000) + 1)
+    
+    def run_due(self, now: float = None) -> int:
+        now = self.clock() if now is None else now
+        fired = 0
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            timer = entry[2]
+            if timer.entry is not entry:
+                self._cancelled -= 1
+                continue
+            timer.entry = None
+            timer.callback(*timer.args)
+            fired += 1
+        self._discard_cancelled()
+        return fired
+    
+    def clear(self):
+        for entry in self._heap:
+            entry[2].entry = None
+        self._heap.clear()
+        self._cancelled = 0
\ No newline at end of file